@@ -0,0 +1,24 @@
+import pytest
+
+from gdk.aws_clients.ClientFactory import ClientFactory
+from gdk.aws_clients.ComponentVersionResolver import ComponentVersionResolver
+from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile
+
+
+@pytest.fixture(autouse=True)
+def clear_aws_clients():
+    # Clients, component versions and parsed recipes are cached per process, so they must not leak from one test into
+    # another.
+    ClientFactory.clear()
+    ComponentVersionResolver.clear()
+    CaseInsensitiveRecipeFile.clear_cache()
+    yield
+    ClientFactory.clear()
+    ComponentVersionResolver.clear()
+    CaseInsensitiveRecipeFile.clear_cache()
+
+
+@pytest.fixture(autouse=True)
+def gdk_user_dir(mocker, tmp_path_factory):
+    # Keeps the user level caches of the tests out of the real ~/.gdk directory.
+    mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=tmp_path_factory.mktemp("gdk-user-dir"))
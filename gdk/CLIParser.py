@@ -178,10 +178,11 @@ class CLIParser:
         )
 
 
-def main():
+def main(check_version=True):
     try:
-        # Check the version of the cli before command parsing.
-        utils.cli_version_check()
+        # Check the version of the cli before command parsing. The gdk daemon checks it once when it starts instead.
+        if check_version:
+            utils.cli_version_check()
         args_namespace = cli_parser.parse_args()
         parse_args_actions.run_command(args_namespace)
     except Exception as e:
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+from gdk.aws_clients.ClientFactory import ClientFactory
+
+
+class AccountCache:
+    """
+    On-disk cache of the account number of the credentials in use and of the artifacts buckets already validated for them
+    in a region.
+
+    Entries are keyed by the access key ID of the credentials and the region, so switching profiles or rotating keys
+    starts a new entry. Each answer expires after a TTL, and the whole entry is dropped whenever a command using it fails.
+    Nothing is cached when the credentials cannot be resolved.
+    """
+
+    def __init__(self, region: str, cache_dir: Optional[Path] = None):
+        """
+        Parameters
+        ----------
+            region(str): Region the cached answers apply to.
+            cache_dir(Path): Directory in which the entries are cached. Defaults to the accounts directory under ~/.gdk.
+        """
+        self.region = region
+        self.cache_dir = cache_dir or utils.get_gdk_user_dir().joinpath(consts.account_cache_dir_name)
+        self._entry_file = self._get_entry_file()
+        self._lock = threading.Lock()
+
+    def get_account_number(self) -> Optional[str]:
+        """
+        Returns the cached account number, or None if it is not cached or has expired.
+        """
+        entry = self._read_entry()
+        account = entry.get("account", {})
+        if account.get("number") and self._is_fresh(account.get("cached_at")):
+            return account["number"]
+        return None
+
+    def save_account_number(self, account_number: str) -> None:
+        self._update_entry(lambda entry: entry.update(account={"number": account_number, "cached_at": time.time()}))
+
+    def is_bucket_validated(self, bucket: str) -> bool:
+        """
+        Returns whether the bucket was validated as an artifacts bucket of the account in the region within the TTL.
+        """
+        return self._is_fresh(self._read_entry().get("buckets", {}).get(bucket))
+
+    def save_validated_bucket(self, bucket: str) -> None:
+        self._update_entry(lambda entry: entry.setdefault("buckets", {}).update({bucket: time.time()}))
+
+    def invalidate(self) -> None:
+        """
+        Drops all the cached answers for the credentials and region.
+        """
+        if self._entry_file is None:
+            return
+        with self._lock:
+            if self._entry_file.exists():
+                logging.debug("Invalidating the cached account details in '%s'.", self._entry_file)
+                self._entry_file.unlink()
+
+    def _get_entry_file(self) -> Optional[Path]:
+        try:
+            credentials = ClientFactory.get_session().get_credentials()
+            access_key = credentials.access_key if credentials else None
+        except Exception as e:
+            logging.debug("Not caching account details as the credentials could not be resolved. Error details: %s", e)
+            return None
+        if not access_key:
+            return None
+        key = hashlib.sha256(f"{access_key}:{self.region}".encode("utf-8")).hexdigest()
+        return self.cache_dir.joinpath(key + ".json")
+
+    def _is_fresh(self, cached_at) -> bool:
+        return isinstance(cached_at, (int, float)) and time.time() - cached_at < consts.ACCOUNT_CACHE_TTL_SECONDS
+
+    def _read_entry(self) -> dict:
+        if self._entry_file is None or not self._entry_file.exists():
+            return {}
+        try:
+            with open(self._entry_file, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry if isinstance(entry, dict) else {}
+        except (OSError, ValueError) as e:
+            logging.debug("Ignoring the unreadable account cache '%s'. Error details: %s", self._entry_file, e)
+            return {}
+
+    def _update_entry(self, update) -> None:
+        if self._entry_file is None:
+            return
+        with self._lock:
+            entry = self._read_entry()
+            update(entry)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first so that concurrent gdk processes never read a partial entry.
+            temp_file = self._entry_file.with_name(f"{self._entry_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_file, self._entry_file)
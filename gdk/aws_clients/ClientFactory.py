@@ -0,0 +1,80 @@
+import threading
+
+import boto3
+from botocore.config import Config
+
+import gdk.common.consts as consts
+
+
+class ClientFactory:
+    """
+    Process wide factory of boto3 clients.
+
+    All clients are created from boto3's default session, so credentials and endpoint data are resolved once per process.
+    Clients are cached per service and region, so every command shares one pooled, keep-alive client for each endpoint
+    instead of paying for new connections each time a client wrapper is created.
+    """
+
+    _clients = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, service_name, region=None, max_attempts=None):
+        """
+        Returns the cached client of the service in the region, creating it on first use.
+
+        Parameters
+        ----------
+            service_name(string): Name of the AWS service, e.g. 's3'.
+            region(string): Region of the client. Uses the default region of the session when None.
+            max_attempts(int): Total attempts botocore makes per request. Defaults to AWS_CLIENT_MAX_ATTEMPTS, with
+                               adaptive retries. Callers that retry on their own pass 1.
+
+        Returns
+        -------
+            client(botocore.client.BaseClient): Client of the service in the region.
+        """
+        key = (service_name, region, max_attempts)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = boto3.client(service_name, region_name=region, config=cls._get_client_config(max_attempts))
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    def get_session(cls):
+        """
+        Returns the session shared by all clients of the process.
+        """
+        with cls._lock:
+            if boto3.DEFAULT_SESSION is None:
+                boto3.setup_default_session()
+            return boto3.DEFAULT_SESSION
+
+    @classmethod
+    def get_partition(cls, region):
+        """
+        Returns the AWS partition of the region, e.g. 'aws' or 'aws-cn'.
+        """
+        return cls.get_session().get_partition_for_region(region_name=region)
+
+    @classmethod
+    def clear(cls):
+        """
+        Drops all cached clients so that the next request creates new ones.
+        """
+        with cls._lock:
+            cls._clients.clear()
+
+    @classmethod
+    def _get_client_config(cls, max_attempts=None):
+        if max_attempts is None:
+            retries = {"mode": "adaptive", "max_attempts": consts.AWS_CLIENT_MAX_ATTEMPTS}
+        else:
+            retries = {"mode": "standard", "total_max_attempts": max_attempts}
+        return Config(
+            max_pool_connections=consts.AWS_CLIENT_MAX_POOL_CONNECTIONS,
+            retries=retries,
+            tcp_keepalive=True,
+        )
@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from botocore.exceptions import ClientError
+
+from gdk.aws_clients.ClientFactory import ClientFactory
+
+
+class ComponentVersionResolver:
+    """
+    Resolves the latest published versions of private components.
+
+    The first component resolved in an account and region is looked up on its own with `list_component_versions`, which
+    costs one call however many components the account has. Once a second component is resolved in the same account and
+    region, the latest versions of all the private components there are listed with one paginated `list_components` call
+    and cached for the rest of the run. Listing the components needs the `greengrass:ListComponents` permission, so the
+    components are looked up one by one when it is denied.
+    """
+
+    _latest_versions = {}
+    _component_versions = {}
+    _resolved_components = {}
+    _denied_scopes = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_latest_version(cls, component_arn) -> Optional[str]:
+        """
+        Returns the latest published version of the component, or None if no version of it is published.
+
+        Parameters
+        ----------
+            component_arn(string): ARN of the component without a version,
+                                   arn:<partition>:greengrass:<region>:<account>:components:<name>.
+        """
+        scope = component_arn.split(":components:")[0]
+        region = scope.split(":")[3]
+        with cls._lock:
+            latest_versions = cls._latest_versions.get(scope)
+            if latest_versions is not None:
+                return latest_versions.get(component_arn)
+            if component_arn in cls._component_versions:
+                return cls._component_versions[component_arn]
+            resolved_components = cls._resolved_components.setdefault(scope, set())
+            resolved_components.add(component_arn)
+            list_components = len(resolved_components) > 1 and scope not in cls._denied_scopes
+
+        # Listed outside the lock so that resolving versions in other regions is not blocked meanwhile.
+        if list_components:
+            try:
+                latest_versions = cls._list_latest_versions(region)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "AccessDeniedException":
+                    raise
+                logging.debug(
+                    "Not allowed to list the components in the region '%s'. Looking up the components one by one.", region
+                )
+                with cls._lock:
+                    cls._denied_scopes.add(scope)
+            else:
+                with cls._lock:
+                    latest_versions = cls._latest_versions.setdefault(scope, latest_versions)
+                return latest_versions.get(component_arn)
+
+        latest_version = cls._get_latest_component_version(region, component_arn)
+        with cls._lock:
+            return cls._component_versions.setdefault(component_arn, latest_version)
+
+    @classmethod
+    def clear(cls):
+        """
+        Drops all cached versions so that the next request lists the components again.
+        """
+        with cls._lock:
+            cls._latest_versions.clear()
+            cls._component_versions.clear()
+            cls._resolved_components.clear()
+            cls._denied_scopes.clear()
+
+    @classmethod
+    def _get_latest_component_version(cls, region, component_arn) -> Optional[str]:
+        # The versions are listed from the latest one down.
+        response = ClientFactory.get_client("greengrassv2", region).list_component_versions(arn=component_arn)
+        component_versions = response["componentVersions"]
+        if not component_versions:
+            return None
+        return component_versions[0]["componentVersion"]
+
+    @classmethod
+    def _list_latest_versions(cls, region) -> Dict[str, str]:
+        logging.debug("Listing the latest versions of the private components in the region '%s'.", region)
+        paginator = ClientFactory.get_client("greengrassv2", region).get_paginator("list_components")
+        latest_versions = {}
+        for page in paginator.paginate(scope="PRIVATE"):
+            for component in page.get("components", []):
+                latest_version = (component.get("latestVersion") or {}).get("componentVersion")
+                if latest_version:
+                    latest_versions[component["arn"]] = latest_version
+        return latest_versions
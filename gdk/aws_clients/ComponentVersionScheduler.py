@@ -0,0 +1,156 @@
+import logging
+import random
+import threading
+import time
+
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+import gdk.common.consts as consts
+from gdk.aws_clients.ClientFactory import ClientFactory
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket that paces requests to a steady rate while allowing short bursts.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        """
+        Parameters
+        ----------
+            rate(float): Tokens added to the bucket per second.
+            capacity(int): Maximum number of tokens the bucket holds, i.e. the largest burst of requests.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token from the bucket, waiting until one is available.
+
+        Returns the number of seconds waited.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # The token is reserved right away, so concurrent callers queue up behind each other instead of all waking up
+            # together when the next token is added.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+
+class ComponentVersionScheduler:
+    """
+    Creates component versions concurrently without exceeding the Greengrass control plane request limits.
+
+    Requests to each region are paced by a token bucket of their own, at most a fixed number of requests are in flight at
+    once, and throttled requests are retried with jittered exponential backoff. So are the requests that fail with the
+    transient errors that botocore's standard retry mode retries, like server errors and dropped connections. The
+    scheduler counts the calls made, the retries and the throttling errors, so that publishing many versions can be tuned
+    from its stats.
+    """
+
+    THROTTLING_ERROR_CODES = ("ThrottlingException", "TooManyRequestsException", "RequestLimitExceeded")
+    TRANSIENT_ERROR_CODES = ("RequestTimeout", "RequestTimeoutException", "PriorRequestNotComplete", "InternalServerException")
+    TRANSIENT_STATUS_CODES = (500, 502, 503, 504)
+
+    def __init__(
+        self,
+        rate=consts.CREATE_COMPONENT_VERSION_RATE_PER_SECOND,
+        burst=consts.CREATE_COMPONENT_VERSION_BURST,
+        max_concurrency=consts.CREATE_COMPONENT_VERSION_MAX_CONCURRENCY,
+        max_attempts=consts.CREATE_COMPONENT_VERSION_MAX_ATTEMPTS,
+        sleep=time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_attempts = max_attempts
+        self._sleep = sleep
+        self._concurrency = threading.BoundedSemaphore(max_concurrency)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.throttles = 0
+
+    def create_component_version(self, region, recipe) -> dict:
+        """
+        Creates a private component version from its recipe in the region.
+
+        Parameters
+        ----------
+            region(string): Region to create the component version in.
+            recipe(string): Recipe of the component version.
+
+        Raises the error of the last attempt if the request still fails with a throttling or transient error after all
+        attempts, and any other error right away.
+        """
+        # botocore's own retries are turned off for this client so that every retry is paced and counted here only once.
+        client = ClientFactory.get_client("greengrassv2", region, max_attempts=1)
+        bucket = self._get_bucket(region)
+        for attempt in range(1, self.max_attempts + 1):
+            bucket.acquire()
+            with self._concurrency:
+                self._count("calls")
+                try:
+                    return client.create_component_version(inlineRecipe=recipe)
+                except (ClientError, ConnectionError, HTTPClientError) as e:
+                    if self._is_throttling_error(e):
+                        self._count("throttles")
+                    elif not self._is_transient_error(e):
+                        raise
+                    if attempt == self.max_attempts:
+                        raise
+                    error = e
+            delay = self._get_backoff_delay(attempt)
+            logging.debug(
+                "Creating the component version in the region '%s' failed: %s. Retrying in %.2f seconds.",
+                region,
+                error,
+                delay,
+            )
+            self._count("retries")
+            self._sleep(delay)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "retries": self.retries, "throttles": self.throttles}
+
+    def _get_bucket(self, region) -> TokenBucket:
+        with self._lock:
+            if region not in self._buckets:
+                self._buckets[region] = TokenBucket(self.rate, self.burst, sleep=self._sleep)
+            return self._buckets[region]
+
+    def _is_throttling_error(self, error) -> bool:
+        return isinstance(error, ClientError) and error.response.get("Error", {}).get("Code") in self.THROTTLING_ERROR_CODES
+
+    def _is_transient_error(self, error) -> bool:
+        # Connections that fail, drop or time out before the response arrives are always worth another attempt.
+        if not isinstance(error, ClientError):
+            return True
+        return (
+            error.response.get("Error", {}).get("Code") in self.TRANSIENT_ERROR_CODES
+            or error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") in self.TRANSIENT_STATUS_CODES
+        )
+
+    def _get_backoff_delay(self, attempt) -> float:
+        # Full jitter spreads out the retries of requests that were throttled together.
+        cap = min(
+            consts.CREATE_COMPONENT_VERSION_MAX_DELAY_SECONDS,
+            consts.CREATE_COMPONENT_VERSION_BASE_DELAY_SECONDS * 2 ** (attempt - 1),
+        )
+        return random.uniform(0, cap)
+
+    def _count(self, stat) -> None:
+        with self._lock:
+            setattr(self, stat, getattr(self, stat) + 1)
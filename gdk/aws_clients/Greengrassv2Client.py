@@ -1,5 +1,6 @@
 import logging
-import boto3
+from gdk.aws_clients.ClientFactory import ClientFactory
+from gdk.aws_clients.ComponentVersionResolver import ComponentVersionResolver
 
 
 class Greengrassv2Client:
@@ -7,21 +8,22 @@ class Greengrassv2Client:
     Greengrasv2 client utils wrapper
     """
 
-    def __init__(self, _region):
-        self.client = boto3.client("greengrassv2", region_name=_region)
+    def __init__(self, _region, scheduler=None):
+        self.region = _region
+        self.client = ClientFactory.get_client("greengrassv2", _region)
+        self.scheduler = scheduler
 
     def get_highest_cloud_component_version(self, component_arn) -> str:
         """
-        Gets highest version of the component from the sorted order of its versions from an account in a region.
+        Gets highest version of the component from an account in a region. The versions are cached for the rest of the run,
+        and listed for all the private components at once when several components are resolved, see
+        ComponentVersionResolver.
 
         Returns highest version of the component if it exists already. Else returns None.
         """
 
         try:
-            component_versions = self.get_component_version(component_arn)
-            if not component_versions:
-                return None
-            return component_versions[0]["componentVersion"]
+            return ComponentVersionResolver.get_latest_version(component_arn)
         except Exception:
             logging.error("Error while getting the component versions using arn: %s.", component_arn)
             raise
@@ -36,13 +38,17 @@ class Greengrassv2Client:
 
     def create_gg_component(self, file_path) -> None:
         """
-        Creates a GreengrassV2 private component version using its recipe.
+        Creates a GreengrassV2 private component version using its recipe. The request is paced and retried on throttling
+        by the scheduler of the client, if it has one.
 
         Raises an exception if the recipe is invalid or the request is not successful.
         """
         with open(file_path, "r", encoding="utf-8") as f:
             try:
-                self.client.create_component_version(inlineRecipe=f.read())
+                if self.scheduler:
+                    self.scheduler.create_component_version(self.region, f.read())
+                else:
+                    self.client.create_component_version(inlineRecipe=f.read())
             except Exception:
                 logging.error("Failed to create a private version of the component using the recipe at '%s'.", file_path)
                 raise
@@ -1,7 +1,7 @@
 import logging
-import boto3
 from botocore.exceptions import ClientError
 import gdk.common.utils as utils
+from gdk.aws_clients.ClientFactory import ClientFactory
 
 
 class S3Client:
@@ -9,9 +9,11 @@ class S3Client:
     S3 client wrapper
     """
 
-    def __init__(self, _region):
-        self.s3_client = boto3.client("s3", region_name=_region)
+    def __init__(self, _region, account_cache=None):
+        self.s3_client = ClientFactory.get_client("s3", _region)
         self._region = _region
+        self._account_cache = account_cache
+        self._bucket_checks = {}
 
     def create_bucket(self, bucket):
         """
@@ -29,7 +31,7 @@ class S3Client:
             None
         """
         region = self._region
-        if self.valid_bucket_for_artifacts_exists(bucket, region):
+        if self._bucket_exists(bucket, region):
             logging.info("Not creating an artifacts bucket as it already exists.")
             return
 
@@ -44,6 +46,24 @@ class S3Client:
             raise
         logging.info("Successfully created the artifacts bucket '%s' in region '%s'", bucket, region)
 
+    def prefetch_bucket_check(self, bucket, executor) -> None:
+        """
+        Starts checking whether the bucket exists in the background, so that the request overlaps other work of the
+        command. The result is used by the next `create_bucket` call for the same bucket.
+
+        Parameters
+        ----------
+            bucket(string): Name of the bucket to check.
+            executor(concurrent.futures.Executor): Executor that runs the check.
+        """
+        self._bucket_checks[bucket] = executor.submit(self.valid_bucket_for_artifacts_exists, bucket, self._region)
+
+    def _bucket_exists(self, bucket, region) -> bool:
+        bucket_check = self._bucket_checks.pop(bucket, None)
+        if bucket_check is None:
+            return self.valid_bucket_for_artifacts_exists(bucket, region)
+        return bucket_check.result()
+
     def upload_artifact(self, artifact_path, bucket, s3_key_path, extra_args):
         """
         Uploads all the artifacts from component artifacts build folder to s3 bucket.
@@ -62,11 +82,37 @@ class S3Client:
             logging.error("Failed to upload artifacts to s3 during")
             raise
 
+    def copy_artifact(self, source_uri, bucket, s3_key_path, extra_args):
+        """
+        Copies an artifact that is already in S3 to the bucket without transferring its content through the client. Large
+        objects are copied in parts.
+
+        Raises an exception when the request is not successful.
+
+        Parameters
+        ----------
+            source_uri(string): S3 URI of the artifact to copy.
+            bucket(string): Name of the bucket to copy the artifact to.
+            s3_key_path(string): Key of the copied artifact in the bucket.
+            extra_args(dict): Extra arguments of the copy, such as the file upload arguments of the publish options.
+        """
+        source_bucket, source_key = source_uri.replace(utils.s3_prefix, "").split("/", 1)
+        copy_args = dict(extra_args)
+        if "Metadata" in copy_args:
+            # Without the directive, S3 keeps the metadata of the source object and ignores the given one.
+            copy_args.setdefault("MetadataDirective", "REPLACE")
+        self.s3_client.copy({"Bucket": source_bucket, "Key": source_key}, bucket, s3_key_path, ExtraArgs=copy_args)
+
     def valid_bucket_for_artifacts_exists(self, bucket, region) -> bool:
+        if self._account_cache is not None and self._account_cache.is_bucket_validated(bucket):
+            logging.debug("Using the cached validation of the bucket '%s' in the region '%s'.", bucket, region)
+            return True
         location_constraint = None if region == "us-east-1" else region
         try:
             response = self.s3_client.get_bucket_location(Bucket=bucket)
             if response["LocationConstraint"] == location_constraint:
+                if self._account_cache is not None:
+                    self._account_cache.save_validated_bucket(bucket)
                 return True
             raise Exception(
                 f"Bucket '{bucket}' already exists and is owned by you in another region '{response['LocationConstraint']}'."
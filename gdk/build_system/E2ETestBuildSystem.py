@@ -9,6 +9,8 @@ class E2ETestBuildSystem:
     Delegates build tasks to the appropriate build system
     """
 
+    supported_types = ["maven", "gradle", "gradlew"]
+
     @classmethod
     def get(self, system_type: str) -> GDKBuildSystem:
         system = system_type.strip().lower()
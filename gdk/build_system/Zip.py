@@ -2,6 +2,8 @@ import glob
 import os
 import shutil
 import logging
+import stat
+import zipfile
 from pathlib import Path
 
 import gdk.common.utils as utils
@@ -18,8 +20,18 @@ class Zip(GDKBuildSystem):
     (supported_component_builds.json has the build folder info).
     This build folder is zipped completely as a component zip artifact.
     Raises an exception if there's an error in the process of zippings.
+
+    The archive is reproducible unless the `reproducible` build option is false: entries are sorted, their timestamps and
+    permissions are normalized and they are compressed at a fixed level, so unchanged sources produce a byte-identical
+    artifact with the same digest.
+
+    Files matching one of the glob patterns of the `store` build option, like "**/*.onnx", are stored without compression.
+    The compression ratio of the files matching each pattern is logged, so the patterns can be tuned.
     """
 
+    # Build options that only change how the archive is written, so setting them does not replace the default excludes.
+    ARCHIVE_OPTIONS = ("reproducible", "store")
+
     @property
     def build_command(self):
         return []
@@ -60,27 +72,159 @@ class Zip(GDKBuildSystem):
                 ignore=ignore_with_glob_support,
             )
 
-            # Get build file name without extension. This will be used as name of the archive.
-            archive_file = utils.get_current_directory().name
-            zip_name_setting = project_config.build_options.get("zip_name", None)
-            if zip_name_setting is not None:
-                if len(zip_name_setting):
-                    archive_file = zip_name_setting
-                else:
-                    archive_file = project_config.component_name
-            logging.debug(
-                "Creating an archive named '{}.zip' in '{}' folder with the files in '{}' folder.".format(
-                    archive_file, zip_build.name, artifacts_zip_build.name
-                )
-            )
-            archive_file_name = Path(zip_build).joinpath(archive_file).resolve()
-            shutil.make_archive(archive_file_name, "zip", root_dir=artifacts_zip_build)
-            logging.debug("Archive complete.")
+            self._archive(project_config, zip_build, artifacts_zip_build)
 
         except Exception:
             logging.error("Failed to zip the component in default build mode.")
             raise
 
+    def update(self, project_config: ComponentBuildConfiguration, changed_paths) -> None:
+        """
+        Updates a previous zip build with the changed project files and recreates the archive, instead of copying the whole
+        project again. Builds the component from scratch if there is no previous build.
+
+        Parameters
+        ----------
+            changed_paths(set): Changed paths relative to the project directory, in posix format.
+        """
+        root_directory_path = utils.get_current_directory()
+        zip_build = root_directory_path.joinpath(*self.build_folder).resolve()
+        artifacts_zip_build = Path(zip_build).joinpath(root_directory_path.name).resolve()
+        if not artifacts_zip_build.is_dir():
+            self.build(project_config=project_config)
+            return
+
+        is_ignored = self.get_ignore_matcher(project_config)
+        for path in sorted(changed_paths):
+            if is_ignored(path):
+                continue
+            logging.debug("Updating '%s' in the '%s' folder.", path, artifacts_zip_build.name)
+            self._update_path(root_directory_path.joinpath(path), artifacts_zip_build.joinpath(path))
+        self._archive(project_config, zip_build, artifacts_zip_build)
+
+    def _update_path(self, source: Path, target: Path) -> None:
+        if target.is_dir() and not source.is_dir():
+            shutil.rmtree(target)
+        elif target.exists() and not source.is_file():
+            target.unlink()
+        # The files in a new folder are reported as changed paths of their own.
+        if source.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+        elif source.is_file():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+
+    def _archive(self, project_config: ComponentBuildConfiguration, zip_build: Path, artifacts_zip_build: Path) -> None:
+        # Get build file name without extension. This will be used as name of the archive.
+        archive_file = utils.get_current_directory().name
+        zip_name_setting = project_config.build_options.get("zip_name", None)
+        if zip_name_setting is not None:
+            if len(zip_name_setting):
+                archive_file = zip_name_setting
+            else:
+                archive_file = project_config.component_name
+        logging.debug(
+            "Creating an archive named '{}.zip' in '{}' folder with the files in '{}' folder.".format(
+                archive_file, zip_build.name, artifacts_zip_build.name
+            )
+        )
+        archive_file_name = Path(zip_build).joinpath(archive_file).resolve()
+        self.create_archive(archive_file_name, artifacts_zip_build, project_config.build_options)
+        logging.debug("Archive complete.")
+
+    def create_archive(self, archive_file_name: Path, root_dir: Path, build_options: dict) -> Path:
+        """
+        Creates the zip archive '<archive_file_name>.zip' with all the files and folders in the root directory.
+
+        ZIP64 records are written whenever the archive needs them, so files and archives larger than 4 GB and archives with
+        more than 65535 entries are supported. Files are streamed into the archive in chunks, so the memory used does not
+        grow with their size.
+        """
+        reproducible = build_options.get("reproducible", True)
+        store_rules = [(pattern, utils.compile_glob(pattern)) for pattern in build_options.get("store", [])]
+        compression_stats = {}
+        archive_path = Path(f"{archive_file_name}.zip")
+        root_dir = Path(root_dir)
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+            for path in self._get_archive_entries(root_dir, reproducible):
+                arcname = path.relative_to(root_dir).as_posix()
+                store_pattern = next((pattern for pattern, regex in store_rules if regex.match(arcname)), None)
+                info = self._write_archive_entry(archive, path, arcname, reproducible, store_pattern is not None)
+                if not info.is_dir():
+                    stats = compression_stats.setdefault(store_pattern, [0, 0, 0])
+                    stats[0] += 1
+                    stats[1] += info.file_size
+                    stats[2] += info.compress_size
+        if store_rules:
+            self._log_compression_stats(store_rules, compression_stats)
+        return archive_path
+
+    def _log_compression_stats(self, store_rules: list, compression_stats: dict) -> None:
+        for pattern in [pattern for pattern, _ in store_rules] + [None]:
+            files, file_size, compress_size = compression_stats.get(pattern, [0, 0, 0])
+            ratio = compress_size / file_size if file_size else 1.0
+            logging.info(
+                "Zip compression of %s: %d files, %d bytes archived in %d bytes (%.1f%% of the original size).",
+                f"the files stored by the pattern '{pattern}'" if pattern else "the other files (deflated)",
+                files,
+                file_size,
+                compress_size,
+                ratio * 100,
+            )
+
+    def _get_archive_entries(self, root_dir: Path, reproducible: bool) -> list:
+        entries = []
+        for dir_path, dir_names, file_names in os.walk(root_dir):
+            entries.extend(Path(dir_path).joinpath(name) for name in dir_names)
+            entries.extend(Path(dir_path).joinpath(name) for name in file_names)
+        if reproducible:
+            # The archive must not depend on the order in which the file system lists the directories.
+            entries.sort(key=lambda path: path.relative_to(root_dir).as_posix())
+        return entries
+
+    def _get_archive_entry_info(self, path: Path, arcname: str, reproducible: bool) -> zipfile.ZipInfo:
+        if not reproducible:
+            return zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+
+        path_stat = path.stat()
+        if stat.S_ISDIR(path_stat.st_mode):
+            info = zipfile.ZipInfo(f"{arcname}/", date_time=consts.ZIP_REPRODUCIBLE_DATE_TIME)
+            info.external_attr = (stat.S_IFDIR | 0o755) << 16 | 0x10
+            return info
+        # Only the executable bit of the file is kept, so the permissions do not depend on the umask of the build host.
+        mode = 0o755 if path_stat.st_mode & stat.S_IXUSR else 0o644
+        info = zipfile.ZipInfo(arcname, date_time=consts.ZIP_REPRODUCIBLE_DATE_TIME)
+        info.external_attr = (stat.S_IFREG | mode) << 16
+        info.file_size = path_stat.st_size
+        return info
+
+    def _write_archive_entry(
+        self, archive: zipfile.ZipFile, path: Path, arcname: str, reproducible: bool, store: bool
+    ) -> zipfile.ZipInfo:
+        info = self._get_archive_entry_info(path, arcname, reproducible)
+        if info.is_dir():
+            archive.writestr(info, b"")
+            return info
+
+        if store:
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+            self._set_compress_level(info, consts.ZIP_COMPRESS_LEVEL)
+        # Large files always get ZIP64 sizes, so that they can still be archived if they grow while they are being read.
+        force_zip64 = info.file_size >= consts.ZIP64_FORCE_THRESHOLD_BYTES
+        with open(path, "rb") as source, archive.open(info, "w", force_zip64=force_zip64) as target:
+            shutil.copyfileobj(source, target, consts.ZIP_COPY_CHUNK_SIZE_BYTES)
+        return info
+
+    def _set_compress_level(self, info: zipfile.ZipInfo, compress_level: int) -> None:
+        # ZipFile.open(info, "w") compresses with the level of the entry rather than the level of the archive. The level
+        # of an entry is only public from Python 3.13 on.
+        if hasattr(zipfile.ZipInfo, "compress_level"):
+            info.compress_level = compress_level
+        else:
+            info._compresslevel = compress_level
+
     def get_ignored_file_patterns(self, project_config: ComponentBuildConfiguration) -> list:
         """
         Creates a list of files or directory patterns to ignore while copying a directory.
@@ -107,7 +251,7 @@ class Zip(GDKBuildSystem):
             project_config.recipe_file.name,
         ]
 
-        if not options:
+        if not [option for option in options if option not in self.ARCHIVE_OPTIONS]:
             ignore_list.extend(
                 [
                     "**/test*",
@@ -120,6 +264,19 @@ class Zip(GDKBuildSystem):
 
         return ignore_list
 
+    def get_ignore_matcher(self, project_config: ComponentBuildConfiguration):
+        """
+        Returns a function that tells if a path relative to the project directory, in posix format, is left out of the zip
+        build. A path is left out if it or one of its parent folders matches an ignored file pattern.
+        """
+        patterns = [utils.compile_glob(pattern.rstrip("/")) for pattern in self.get_ignored_file_patterns(project_config)]
+
+        def is_ignored(path: str) -> bool:
+            parts = path.split("/")
+            return any(pattern.match("/".join(parts[:i])) for i in range(1, len(parts) + 1) for pattern in patterns)
+
+        return is_ignored
+
     def generate_ignore_list_from_globs(self, root_directory, globs):
         ignored_pathnames = set()
         for pattern in globs:
@@ -7,19 +7,38 @@ import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
 
 from gdk.build_system.ComponentBuildSystem import ComponentBuildSystem
+from gdk.build_system.Zip import Zip
 from gdk.commands.Command import Command
 from gdk.commands.component.transformer.BuildRecipeTransformer import BuildRecipeTransformer
 from gdk.commands.component.config.ComponentBuildConfiguration import ComponentBuildConfiguration
+from gdk.common.FileWatcher import FileWatcher
 
 
 class BuildCommand(Command):
+    RECIPE_FILES = ("recipe.json", "recipe.yaml")
+
     def __init__(self, command_args) -> None:
         super().__init__(command_args, "build")
 
         self.project_config = ComponentBuildConfiguration(command_args)
         self.build_recipe_transformer = BuildRecipeTransformer(self.project_config)
+        self._built = False
 
     def run(self):
+        """
+        Builds the component based on the command arguments and the project configuration. With the watch argument, the
+        command keeps watching the project after the build and builds the component again whenever its files change.
+        """
+        if not self.arguments.get("watch"):
+            self.build()
+            return
+        try:
+            self.build()
+        except Exception as e:
+            logging.error("Failed to build the component. It is built again when the project changes. Error details: %s", e)
+        self.watch()
+
+    def build(self):
         """
         Builds the component based on the command arguments and the project configuration. The build files
         are created in current directory under "greengrass-build" folder.
@@ -39,6 +58,7 @@ class BuildCommand(Command):
             None
         """
         build_system = self.project_config.build_system
+        self._built = False
 
         logging.info("Building the component '%s' with the given project configuration.", self.project_config.component_name)
 
@@ -54,6 +74,111 @@ class BuildCommand(Command):
         else:
             logging.info("Using '%s' build system to build the component.", build_system)
             self.default_build_component()
+        self._built = True
+
+    def watch(self):
+        """
+        Watches the project and builds the component again whenever its files change, until the command is interrupted.
+
+        The build folders and hidden files are not watched, nor are the files excluded from the archive of a zip build.
+        """
+        watcher = self._create_watcher()
+        logging.info("Watching the project for changes. Press Ctrl+C to stop.")
+        try:
+            while True:
+                changes = watcher.wait_for_changes()
+                try:
+                    self.rebuild(changes)
+                except Exception as e:
+                    logging.error("Failed to build the component. Error details: %s", e)
+                if changes is None or consts.cli_project_config_file in changes:
+                    # The build system or the excluded files may have changed.
+                    watcher.close()
+                    watcher = self._create_watcher()
+                elif self.project_config.build_system == "custom":
+                    # The outputs of a custom build command are not known, so its changes to the project are dropped.
+                    watcher.discard_changes()
+        except KeyboardInterrupt:
+            logging.info("Stopped watching the project.")
+        finally:
+            watcher.close()
+
+    def rebuild(self, changes):
+        """
+        Builds the component again after the project files changed.
+
+        The component is built from scratch when the project configuration changed, when the changes could not all be
+        tracked, or when it uses a custom build command. Otherwise only the changed files are built: a zip build copies over
+        just these files, and the recipe is transformed again only if it changed. Other artifacts are copied over to the
+        greengrass build folder only if they changed.
+
+        Parameters
+        ----------
+            changes(set): Changed paths relative to the project directory in posix format, or None if all may have changed.
+        """
+        if (
+            not self._built
+            or changes is None
+            or consts.cli_project_config_file in changes
+            or self.project_config.build_system == "custom"
+        ):
+            logging.info("Building the component again.")
+            self._reload_project_config()
+            self.build()
+            return
+
+        recipe_changes = changes.intersection(self.RECIPE_FILES)
+        source_changes = changes - recipe_changes
+        logging.info("Building the component again with the changes of %s.", ", ".join(sorted(changes)))
+        try:
+            # The zip build system copies the changed files into the archive itself. It skips the recipe, which it never
+            # archives, so the recipe only ever reaches the build through the recipe transformer.
+            if isinstance(self.component_build_system, Zip):
+                self.component_build_system.update(self.project_config, changes)
+            elif source_changes:
+                self.run_build_command()
+            if recipe_changes:
+                self._transform_changed_recipe()
+            else:
+                self.build_recipe_transformer.refresh_artifacts()
+        except Exception:
+            self._built = False
+            raise
+
+    def _transform_changed_recipe(self):
+        recipe_file = self.project_config.recipe_file
+        self._reload_project_config()
+        if self.project_config.recipe_file != recipe_file:
+            # The build recipe of the previous recipe file is removed along with the whole build.
+            self.build()
+            return
+        self.build_recipe_transformer.transform(self._get_build_folder_by_build_system())
+
+    def _reload_project_config(self):
+        self.project_config = ComponentBuildConfiguration(self.arguments)
+        self.build_recipe_transformer = BuildRecipeTransformer(self.project_config)
+
+    def _create_watcher(self) -> FileWatcher:
+        project_dir = utils.get_current_directory()
+        ignored_patterns = [consts.greengrass_build_dir, "**/.*"]
+        is_excluded_from_zip = None
+        build_system = self.project_config.build_system
+        if build_system != "custom":
+            component_build_system = ComponentBuildSystem.get(build_system)
+            ignored_patterns.append(f"**/{component_build_system.build_folder[0]}")
+            if isinstance(component_build_system, Zip):
+                is_excluded_from_zip = component_build_system.get_ignore_matcher(self.project_config)
+        ignored_patterns = [utils.compile_glob(pattern) for pattern in ignored_patterns]
+        watched_files = {consts.cli_project_config_file, *self.RECIPE_FILES}
+
+        def is_ignored(path: str) -> bool:
+            if path in watched_files:
+                return False
+            if any(pattern.match(path) for pattern in ignored_patterns):
+                return True
+            return is_excluded_from_zip is not None and is_excluded_from_zip(path)
+
+        return FileWatcher(project_dir, is_ignored)
 
     def create_gg_build_directories(self):
         """
@@ -4,8 +4,9 @@ import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
 import gdk.common.utils as utils
 from gdk.commands.Command import Command
-from gdk.commands.component.ListCommand import ListCommand
 from gdk.common.URLDownloader import URLDownloader
+from gdk.common.DownloadCache import DownloadCache
+from gdk.common.SoftwareCatalog import SoftwareCatalog
 
 
 class InitCommand(Command):
@@ -87,17 +88,17 @@ class InitCommand(Command):
             None
         """
         comp_url = self.get_download_url(comp_name, comp_type)
-        URLDownloader(comp_url).download_and_extract(project_dir)
+        URLDownloader(comp_url, cache=DownloadCache()).download_and_extract(project_dir)
 
     def get_download_url(self, comp_name, comp_type):
         if comp_type == "template":
             url = consts.templates_list_url
         elif comp_type == "repository":
             url = consts.repository_list_url
-        available_components = ListCommand({}).get_component_list_from_github(url)
-        if comp_name in available_components:
+        download_url = SoftwareCatalog(url).find(comp_name)
+        if download_url:
             logging.debug("Component {} '{}' is available in Greengrass Software Catalog.".format(comp_type, comp_name))
-            return available_components[comp_name]
+            return download_url
         else:
             raise Exception(
                 "Could not find the component {} '{}' in Greengrass Software Catalog.".format(comp_type, comp_name)
@@ -4,8 +4,8 @@ from typing import Iterable
 
 import gdk.common.consts as consts
 import gdk.common.exceptions.error_messages as error_messages
-import requests
 from gdk.commands.Command import Command
+from gdk.common.SoftwareCatalog import SoftwareCatalog
 
 
 class ListCommand(Command):
@@ -13,33 +13,32 @@ class ListCommand(Command):
         super().__init__(command_args, "list")
 
     def run(self):
+        refresh = self.arguments.get("refresh", False)
+        search = self.arguments.get("search")
         if "template" in self.arguments and self.arguments["template"]:
             logging.info("Listing all the available component templates from Greengrass Software Catalog.")
-            li = self.get_component_list_from_github(consts.templates_list_url)
+            li = self.get_component_list_from_github(consts.templates_list_url, refresh, search)
             logging.info("Found '{}' component templates to display.".format(len(li)))
             self.display_list(li, transform=self._map_template_name)
             return
         elif "repository" in self.arguments and self.arguments["repository"]:
             logging.info("Listing all the available component repositories from Greengrass Software Catalog.")
-            li = self.get_component_list_from_github(consts.repository_list_url)
+            li = self.get_component_list_from_github(consts.repository_list_url, refresh, search)
             logging.info("Found '{}' component repositories to display.".format(len(li)))
             self.display_list(li)
             return
         raise Exception(error_messages.LIST_WITH_INVALID_ARGS)
 
-    def get_component_list_from_github(self, url) -> list:
-        response = requests.get(url)
-        try:
-            response.raise_for_status()
-        except Exception:
-            logging.error(error_messages.LISTING_COMPONENTS_FAILED)
-            raise
-
-        try:
-            return response.json()
-        except Exception as e:
-            logging.error(e, exc_info=True)
-            return []
+    def get_component_list_from_github(self, url, refresh=False, search=None):
+        """
+        Returns the components listed at the Greengrass Software Catalog URL, served from the locally cached catalog
+        index unless it is stale or a refresh is requested. When search text is given, only the components whose names
+        contain it are returned.
+        """
+        catalog = SoftwareCatalog(url, refresh)
+        if search:
+            return catalog.search(search)
+        return catalog.get_components()
 
     def _map_template_name(self, template_name: str) -> str:
         """
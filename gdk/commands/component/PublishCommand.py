@@ -1,37 +1,65 @@
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-import yaml
 import json
 from gdk.common import diff_utils
 from gdk.commands.component.transformer.PublishRecipeTransformer import PublishRecipeTransformer
 
 import gdk.commands.component.component as component
+import gdk.common.consts as consts
 import gdk.common.utils as utils
+from gdk.aws_clients.ComponentVersionScheduler import ComponentVersionScheduler
 from gdk.aws_clients.Greengrassv2Client import Greengrassv2Client
-from gdk.aws_clients.S3Client import S3Client
 from gdk.commands.Command import Command
 from gdk.commands.component.config.ComponentPublishConfiguration import ComponentPublishConfiguration
-from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile
+from gdk.common.BuildManifest import BuildManifest
+from gdk.common.CaseInsensitive import CaseInsensitiveDict, CaseInsensitiveRecipeFile
 
 
 class PublishCommand(Command):
+    # Compares a recipe with the latest published one. The engine keeps no state about the recipes it compares, so one is
+    # shared by all the publish commands.
+    _recipe_diff = diff_utils.DiffEngine(
+        exclude_paths=[
+            "root['lifecycle']",
+            "root['componentversion']",
+            "root['componenttype']"
+        ],
+        exclude_regex_paths=[
+            r"^root\['manifests'\]\[.+\]\['artifacts'\]"
+        ]
+    )
+
     def __init__(self, command_args) -> None:
         super().__init__(command_args, "publish")
 
+        self.regions = self._get_regions(command_args.get("regions"))
+        if self.regions:
+            # The first region is the primary one. Artifacts are uploaded to it and copied from it to the other regions.
+            command_args = dict(command_args, region=self.regions[0])
         self.project_config = ComponentPublishConfiguration(command_args)
-        self.s3_client = S3Client(self.project_config.region)
-        self.greengrass_client = Greengrassv2Client(self.project_config.region)
+        self.s3_client = self.project_config.s3_client
+        self.scheduler = ComponentVersionScheduler()
+        self.greengrass_client = Greengrassv2Client(self.project_config.region, self.scheduler)
+        self._artifact_hashes = {}
+        self._uploads_cancelled = threading.Event()
+        self._build_manifest = BuildManifest(self.project_config.gg_build_dir)
 
     def run(self):
         try:
             self.try_build()
-            self._publish_component_version(self.project_config.component_name, self.project_config.component_version)
+            if len(self.regions) > 1:
+                self._publish_to_regions(self.project_config.component_name)
+            else:
+                self._publish_component_version(self.project_config.component_name, self.project_config.component_version)
         except Exception:
             logging.error(
                 "Failed to publish a new version '%s' of the component '%s'.",
                 self.project_config.component_version,
                 self.project_config.component_name,
             )
+            self.project_config.account_cache.invalidate()
             raise
 
     def _check_for_changes(self):
@@ -65,6 +93,7 @@ class PublishCommand(Command):
 
     def _diff_artifacts(self, latest_published_recipe):
         build_artifacts = list(self.project_config.gg_build_component_artifacts_dir.iterdir())
+        self._hash_artifacts(build_artifacts)
 
         for build_artifact in build_artifacts:
             artifact_found_in_latest_manifest = False
@@ -72,7 +101,7 @@ class PublishCommand(Command):
                 for latest_p_artifact in latest_p_manifest.get("Artifacts", []):
                     if latest_p_artifact.get("URI", latest_p_artifact.get("Uri")).split("/")[-1] == build_artifact.name:
                         artifact_found_in_latest_manifest = True
-                        if latest_p_artifact.get("Digest", None) != utils.artifact_encoded_hash(build_artifact):
+                        if latest_p_artifact.get("Digest", None) != self._get_artifact_hash(build_artifact):
                             logging.info(f"Changes found in the artifact: {build_artifact}")
                             return True
 
@@ -85,40 +114,27 @@ class PublishCommand(Command):
 
     def _check_recipe_structure(self, recipe, latest_published_recipe):
         """Check for structural changes in the recipe."""
-        diff = diff_utils.deep_diff(
-            latest_published_recipe,
-            recipe,
-            exclude_paths=[
-                "root['Lifecycle']",
-                "root['ComponentVersion']",
-                "root['ComponentType']"
-            ],
-            exclude_regex_paths=[
-                "^root\['Manifests'\]\[.+\]\['Artifacts'\]\[.+\]",  # noqa: W605
-                "^root\['Manifests'\]\[.+\]\['Artifacts'\]"         # noqa: W605
-            ]
-        )
-
-        logging.info(f"Recipe diff: {json.dumps(diff, indent=4)}")
-
-        if "dictionary_item_added" in diff.keys() and len(diff['dictionary_item_removed']) > 0:
-            logging.info(f"Changes found: dictionary_item_added: {item}")
-            return True
+        # The full report is only built to be logged in debug mode. Otherwise the comparison stops at the first change.
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            if self._recipe_diff.has_changes(latest_published_recipe, recipe):
+                logging.info("Changes found in the recipe structure.")
+                return True
+            return False
 
-        if "dictionary_item_removed" in diff.keys() and len(diff['dictionary_item_removed']) > 0:
-            logging.info("Changes found: dictionary_item_removed")
-            return True
+        diff = self._recipe_diff.diff(latest_published_recipe, recipe)
+        logging.debug(f"Recipe diff: {json.dumps(diff, indent=4)}")
 
-        if "values_changed" in diff.keys() and len(diff['values_changed'].keys()) > 0:
-            logging.info(f"Changes found: values_changed: {json.dumps(diff['values_changed'], indent=2)}")
-            return True
+        for change in ("dictionary_item_added", "dictionary_item_removed", "values_changed"):
+            if diff[change]:
+                logging.info(f"Changes found: {change}: {json.dumps(diff[change], indent=2)}")
+                return True
 
         return False
 
     def _check_manifests(self, recipe, latest_published_recipe):
         """Check for changes in manifests and artifacts."""
-        manifests = recipe.get("Manifests", [])
-        latest_manifests = latest_published_recipe.get("Manifests")
+        manifests = recipe.get("manifests", [])
+        latest_manifests = latest_published_recipe.get("manifests", [])
 
         if len(manifests) != len(latest_manifests):
             logging.info("Changes found in the number of defined Manifests")
@@ -132,8 +148,8 @@ class PublishCommand(Command):
 
     def _check_artifacts(self, manifest, latest_manifest):
         """Check for changes in artifacts."""
-        artifacts = manifest.get("Artifacts", [])
-        latest_artifacts = latest_manifest.get("Artifacts", [])
+        artifacts = manifest.get("artifacts", [])
+        latest_artifacts = latest_manifest.get("artifacts", [])
 
         if len(artifacts) != len(latest_artifacts):
             logging.info("Changes found in the number of defined Artifacts")
@@ -150,11 +166,11 @@ class PublishCommand(Command):
 
     def _check_single_artifact(self, artifact, latest_artifact):
         """Check for changes in a single artifact."""
-        recipe_uri = artifact.get("URI", artifact.get("Uri"))
-        recipe_unarchive = artifact.get("Unarchive", "")
+        recipe_uri = artifact.get("uri")
+        recipe_unarchive = artifact.get("unarchive", "")
 
-        latest_uri = latest_artifact.get("URI", latest_artifact.get("Uri"))
-        latest_unarchive = latest_artifact.get("Unarchive", "")
+        latest_uri = latest_artifact.get("uri")
+        latest_unarchive = latest_artifact.get("unarchive", "")
         latest_published_version = self.project_config.latest_published_component_version
 
         # # Check URI changes
@@ -179,13 +195,16 @@ class PublishCommand(Command):
         logging.debug(f"Recipe in Greengrass: {json.dumps(latest_published_recipe,indent=2)}")
 
     def _diff_recipe(self, latest_published_recipe):
-        recipe = self._get_recipe().to_dict()
+        # Both recipes are compared in their normalized form, with lowercase keys, which the publish recipe already shares
+        # with its schema validation.
+        recipe = self._get_recipe().normalized()
 
         self._log_recipe_comparison(recipe, latest_published_recipe)
 
         if not latest_published_recipe:
             logging.info(f"No published recipe found for the component to check against: {self.project_config.component_name}")
             return True
+        latest_published_recipe = CaseInsensitiveDict(latest_published_recipe).normalized()
 
         if self._check_recipe_structure(recipe, latest_published_recipe):
             return True
@@ -197,16 +216,11 @@ class PublishCommand(Command):
         return False
 
     def _get_latest_published_recipe(self):
-        if self.project_config.latest_published_component_version:
-            component = f"components:{self.project_config.component_name}"
-            version = f"versions:{self.project_config.latest_published_component_version}"
-            component_with_version = f"{component}:{version}"
-            arn = f"arn:aws:greengrass:{self.project_config.region}:{self.project_config.account_num}:{component_with_version}"
-            return yaml.safe_load(self.greengrass_client.get_component(arn).decode('utf8'))
-        else:
-            return None
+        return self.project_config.get_latest_published_recipe()
 
     def _get_recipe(self):
+        if self.project_config.publish_recipe is not None:
+            return self.project_config.publish_recipe
         recipe_path = Path(self.project_config.publish_recipe_file)
         return CaseInsensitiveRecipeFile().read(recipe_path)
 
@@ -223,16 +237,11 @@ class PublishCommand(Command):
     def _publish_component_version(self, component_name, component_version):
         logging.info("Publishing the component '%s' with the given project configuration.", component_name)
 
-        logging.info("Transform the component recipe %s-%s.", component_name, component_version)
-        PublishRecipeTransformer(self.project_config).transform()
-        if self._check_for_changes():
-
-            logging.info("Uploading the component built artifacts to s3 bucket.")
-            self.upload_artifacts_s3()
-
+        if self._transform_and_upload_artifacts():
             logging.info("Creating a new greengrass component version %s-%s.", component_name, component_version)
             self.greengrass_client.create_gg_component(self.project_config.publish_recipe_file)
             logging.info("Latest published version is now: %s-%s", component_name, self.project_config.component_version)
+            logging.debug("Component version creation stats: %s", self.scheduler.get_stats())
         else:
             logging.info("No changes found in the component. Skipping the publish step.")
             logging.info(
@@ -241,6 +250,153 @@ class PublishCommand(Command):
                 self.project_config.latest_published_component_version
             )
 
+    def _transform_and_upload_artifacts(self) -> bool:
+        """
+        Transforms the component recipe into the publish recipe and uploads the built artifacts.
+
+        When the component is published regardless of changes, the artifacts are uploaded while the recipe is transformed
+        and validated, so that the component version can be created as soon as the last upload completes. Otherwise the
+        changes are checked against the transformed recipe first, and nothing is uploaded if the component has not changed.
+
+        Returns True if the artifacts were uploaded, and False if the component has no changes to publish.
+        """
+        component_name = self.project_config.component_name
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            uploads = None
+            if not self.project_config.options.get("only_on_change"):
+                logging.info("Uploading the component built artifacts to s3 bucket.")
+                uploads = executor.submit(self.upload_artifacts_s3)
+
+            try:
+                logging.info("Transform the component recipe %s-%s.", component_name, self.project_config.component_version)
+                PublishRecipeTransformer(self.project_config).transform()
+                has_changes = self._check_for_changes()
+            except Exception:
+                if uploads is not None:
+                    self._cancel_uploads(uploads)
+                raise
+            if not has_changes:
+                return False
+
+            if uploads is None:
+                logging.info("Uploading the component built artifacts to s3 bucket.")
+                uploads = executor.submit(self.upload_artifacts_s3)
+            uploads.result()
+        finally:
+            executor.shutdown(wait=True)
+        return True
+
+    def _cancel_uploads(self, uploads: Future) -> None:
+        """
+        Stops the artifact uploads started ahead of a recipe transform that failed, as no component version is created for
+        them. The uploads that have not started yet are skipped, and the ones in progress are waited for so that their
+        errors are logged rather than lost.
+        """
+        self._uploads_cancelled.set()
+        if uploads.cancel():
+            return
+        upload_error = uploads.exception()
+        if upload_error is not None:
+            logging.error("Failed to upload the component artifacts. Error details: %s", upload_error)
+
+    def _get_regions(self, regions_arg) -> list:
+        if not regions_arg:
+            return []
+        regions = []
+        for region in regions_arg.split(","):
+            region = region.strip()
+            if region and region not in regions:
+                regions.append(region)
+        if not regions:
+            raise ValueError("Regions cannot be empty. Please provide a comma separated list of valid regions.")
+        return regions
+
+    def _publish_to_regions(self, component_name):
+        """
+        Publishes the component to all the regions in the command. The artifacts are uploaded once to the bucket of the
+        primary region and copied server-side to the bucket of each other region, and the component versions are created
+        in all the regions concurrently. Whether the component changed is decided against the primary region.
+
+        Raises an exception listing the failed regions after all the regions are attempted.
+        """
+        logging.info("Publishing the component '%s' to the regions: %s.", component_name, ", ".join(self.regions))
+        if not self._transform_and_upload_artifacts():
+            logging.info("No changes found in the component. Skipping the publish step in all the regions.")
+            return
+
+        with ThreadPoolExecutor(max_workers=len(self.regions)) as executor:
+            publishes = {self.project_config.region: executor.submit(self._create_primary_component_version)}
+            for region in self.regions[1:]:
+                publishes[region] = executor.submit(self._publish_to_region, region)
+
+        summary = []
+        failed_regions = []
+        for region, publish in publishes.items():
+            try:
+                regional_config = publish.result()
+                summary.append((region, regional_config.component_version, regional_config.bucket, "Published"))
+            except Exception as e:
+                logging.debug("Failed to publish the component to the region '%s'.", region, exc_info=True)
+                summary.append((region, "-", "-", f"Failed: {e}"))
+                failed_regions.append(region)
+        self._log_publish_summary(summary)
+        logging.debug("Component version creation stats: %s", self.scheduler.get_stats())
+
+        if failed_regions:
+            raise Exception(f"Failed to publish the component '{component_name}' to the regions: {', '.join(failed_regions)}.")
+
+    def _create_primary_component_version(self) -> ComponentPublishConfiguration:
+        self.greengrass_client.create_gg_component(self.project_config.publish_recipe_file)
+        return self.project_config
+
+    def _publish_to_region(self, region) -> ComponentPublishConfiguration:
+        """
+        Creates the component version in a secondary region from the artifacts already uploaded to the primary region.
+        The version is the one resolved in the primary region, so that the same build has the same version in every region.
+        """
+        regional_config = ComponentPublishConfiguration(
+            dict(self.arguments, region=region), component_version=self.project_config.component_version
+        )
+        # Each region has its own bucket in the artifact URIs, so its recipe is written to a file of its own.
+        recipe_file = regional_config.publish_recipe_file
+        regional_config.publish_recipe_file = recipe_file.with_name(f"{recipe_file.stem}-{region}{recipe_file.suffix}")
+        PublishRecipeTransformer(regional_config).transform()
+
+        self._copy_artifacts_to_region(regional_config)
+
+        logging.info(
+            "Creating a new greengrass component version %s-%s in the region '%s'.",
+            regional_config.component_name,
+            regional_config.component_version,
+            region,
+        )
+        Greengrassv2Client(region, self.scheduler).create_gg_component(regional_config.publish_recipe_file)
+        return regional_config
+
+    def _copy_artifacts_to_region(self, regional_config) -> None:
+        build_component_artifacts = list(self.project_config.gg_build_component_artifacts_dir.iterdir())
+        if not build_component_artifacts:
+            return
+
+        regional_config.s3_client.create_bucket(regional_config.bucket)
+        component_name = self.project_config.component_name
+        primary_version = self.project_config.component_version
+        source_prefix = f"{utils.s3_prefix}{self.project_config.bucket}/{component_name}/{primary_version}"
+        s3_upload_file_args = regional_config.options.get("file_upload_args", {})
+        for artifact in build_component_artifacts:
+            s3_file_path = f"{component_name}/{regional_config.component_version}/{artifact.name}"
+            logging.debug("Copying artifact '%s' to the bucket '%s'.", artifact.name, regional_config.bucket)
+            regional_config.s3_client.copy_artifact(
+                f"{source_prefix}/{artifact.name}", regional_config.bucket, s3_file_path, s3_upload_file_args
+            )
+
+    def _log_publish_summary(self, summary) -> None:
+        rows = [("Region", "Version", "Bucket", "Status")] + summary
+        widths = [max(len(str(row[column])) for row in rows) for column in range(len(rows[0]))]
+        lines = ["  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+        logging.info("Publish summary:\n%s", "\n".join(lines))
+
     def upload_artifacts_s3(self) -> None:
         """
         Uploads all the artifacts from component artifacts build folder to s3 bucket.
@@ -267,12 +423,94 @@ class PublishCommand(Command):
 
         self.s3_client.create_bucket(_bucket)
 
+        s3_upload_file_args = self.project_config.options.get("file_upload_args", {})
+        published_artifacts = self._get_published_artifacts()
+        # Each worker hashes its artifact and copies or uploads it right away, so hashing one artifact overlaps with
+        # transferring the others.
+        with ThreadPoolExecutor(max_workers=consts.PUBLISH_ARTIFACT_WORKERS) as executor:
+            uploads = [
+                executor.submit(
+                    self._upload_artifact, artifact, published_artifacts.get(artifact.name), _bucket, s3_upload_file_args
+                )
+                for artifact in build_component_artifacts
+            ]
+        for upload in uploads:
+            upload.result()
+
+    def _upload_artifact(self, artifact, published_artifact, bucket, extra_args) -> None:
+        if self._uploads_cancelled.is_set():
+            logging.debug("Skipping the upload of the artifact '%s' as the publish failed.", artifact.resolve())
+            return
         component_name = self.project_config.component_name
-        component_version = self.project_config.component_version
-        options = self.project_config.options
-        s3_upload_file_args = options.get("file_upload_args", {})
+        s3_file_path = f"{component_name}/{self.project_config.component_version}/{artifact.name}"
+        if published_artifact and self._copy_published_artifact(
+            artifact, published_artifact, bucket, s3_file_path, extra_args
+        ):
+            return
+        logging.debug("Uploading artifact '%s' to the bucket '%s'.", artifact.resolve(), bucket)
+        self.s3_client.upload_artifact(artifact, bucket, s3_file_path, extra_args)
 
-        for artifact in build_component_artifacts:
-            s3_file_path = f"{component_name}/{component_version}/{artifact.name}"
-            logging.debug("Uploading artifact '%s' to the bucket '%s'.", artifact.resolve(), _bucket)
-            self.s3_client.upload_artifact(artifact, _bucket, s3_file_path, s3_upload_file_args)
+    def _get_published_artifacts(self) -> dict:
+        """
+        Returns the S3 artifacts of the latest published version of the component that carry a SHA-256 digest, by file
+        name. Returns an empty dictionary when there is no published version or its recipe cannot be fetched.
+        """
+        try:
+            latest_published_recipe = self._get_latest_published_recipe()
+        except Exception as e:
+            logging.warning("Could not fetch the latest published recipe, so all artifacts are uploaded. Error: %s", e)
+            return {}
+        if not isinstance(latest_published_recipe, dict):
+            return {}
+
+        published_artifacts = {}
+        for manifest in latest_published_recipe.get("Manifests") or []:
+            for artifact in manifest.get("Artifacts") or []:
+                uri = artifact.get("URI", artifact.get("Uri", ""))
+                if (
+                    uri.startswith(utils.s3_prefix)
+                    and artifact.get("Digest")
+                    and artifact.get("Algorithm", "SHA-256") == "SHA-256"
+                ):
+                    published_artifacts[uri.split("/")[-1]] = artifact
+        return published_artifacts
+
+    def _copy_published_artifact(self, artifact, published_artifact, bucket, s3_file_path, extra_args) -> bool:
+        """
+        Copies the artifact server-side from the latest published version when its content has not changed since.
+
+        Returns True if the artifact was copied, and False if it still needs to be uploaded.
+        """
+        source_uri = published_artifact.get("URI", published_artifact.get("Uri"))
+        if source_uri == f"{utils.s3_prefix}{bucket}/{s3_file_path}":
+            return False
+        if published_artifact["Digest"] != self._get_artifact_hash(artifact):
+            return False
+
+        logging.info(
+            "Artifact '%s' is unchanged since the latest published version. Copying it from '%s'.", artifact.name, source_uri
+        )
+        try:
+            self.s3_client.copy_artifact(source_uri, bucket, s3_file_path, extra_args)
+            return True
+        except Exception as e:
+            logging.warning("Could not copy the artifact '%s', uploading it instead. Error: %s", artifact.name, e)
+            return False
+
+    def _hash_artifacts(self, artifacts) -> None:
+        """
+        Hashes all the artifacts not hashed yet concurrently, so that later lookups of their digests are immediate.
+        """
+        missing = [artifact for artifact in artifacts if artifact not in self._artifact_hashes]
+        if missing:
+            self._artifact_hashes.update(self._build_manifest.get_digests(missing))
+
+    def _get_artifact_hash(self, artifact) -> str:
+        """
+        Returns the encoded SHA-256 digest of the artifact. The digest recorded by the build is used when the artifact is
+        unchanged since, and otherwise each artifact is hashed only once per publish.
+        """
+        if artifact not in self._artifact_hashes:
+            digest = self._build_manifest.get_digest(artifact)
+            self._artifact_hashes[artifact] = digest or utils.artifact_encoded_hash(artifact)
+        return self._artifact_hashes[artifact]
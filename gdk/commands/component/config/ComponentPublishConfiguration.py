@@ -1,29 +1,52 @@
 from gdk.common.config.GDKProject import GDKProject
 import json
+import yaml
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from gdk.common.exceptions.CommandError import InvalidArgumentsError
 import logging
 import gdk.common.utils as utils
+from gdk.aws_clients.AccountCache import AccountCache
+from gdk.aws_clients.ClientFactory import ClientFactory
 from gdk.aws_clients.Greengrassv2Client import Greengrassv2Client
-import boto3
+from gdk.aws_clients.S3Client import S3Client
 from botocore import exceptions
 
 
 class ComponentPublishConfiguration(GDKProject):
-    def __init__(self, _args) -> None:
+    def __init__(self, _args, component_version=None) -> None:
+        """
+        Parameters
+        ----------
+            _args(dict): Arguments of the publish command.
+            component_version(string): Version to publish, already resolved in another region. Defaults to the version in
+                                       the gdk configuration, resolved in the region of this configuration.
+        """
         super().__init__()
         self._args = _args
         self._publish_config = self.component_config.get("publish", {})
         self.options = self._get_options()
-        self.account_num = self.get_account_number()
         self.region = self._get_region()
-        self.latest_published_component_version = self.get_latest_published_component_version(self.region)
+        self.account_cache = AccountCache(self.region)
+        self.account_num = self.get_account_number()
         self.bucket = self._get_bucket(self.region, self.account_num)
-        self.component_version = self.get_component_version(self.region)
+        self.s3_client = S3Client(self.region, self.account_cache)
+        # The bucket check and the latest recipe fetch do not depend on each other, so they run in the background while
+        # the configuration resolves the component version.
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            self.s3_client.prefetch_bucket_check(self.bucket, executor)
+            self.latest_published_component_version = self.get_latest_published_component_version(self.region)
+            self._latest_published_recipe = self._prefetch_latest_published_recipe(executor)
+        finally:
+            executor.shutdown(wait=False)
+        self.component_version = component_version or self.get_component_version(self.region)
         self.publisher = self.component_config.get("author", "")
         self.publish_recipe_file = self.gg_build_recipes_dir.joinpath(
             f"{self.component_name}-{self.component_version}.{self.recipe_file.name.split('.')[-1]}"
         )
+        # The publish recipe written by the publish recipe transformer, kept in memory so that it is not read back.
+        self.publish_recipe = None
 
     def _get_region(self):
         _region = ""
@@ -108,6 +131,7 @@ class ComponentPublishConfiguration(GDKProject):
             return c_latest_current_version
         except Exception:
             logging.error("Failed to calculate the latest published version of the component.")
+            self.account_cache.invalidate()
             raise
 
     def get_component_version(self, _region):
@@ -150,23 +174,51 @@ class ComponentPublishConfiguration(GDKProject):
             logging.error("Failed to calculate the next version of the component during publish.")
             raise
 
+    def _prefetch_latest_published_recipe(self, executor):
+        if not self.options.get("only_on_change") or not self.latest_published_component_version:
+            return None
+        return executor.submit(self._fetch_latest_published_recipe)
+
+    def get_latest_published_recipe(self) -> dict:
+        """
+        Returns the recipe of the latest published version of the component, or None when no version is published yet.
+
+        The recipe is fetched in the background during configuration when the publish options set `only_on_change`, and
+        on first use otherwise.
+        """
+        if isinstance(self._latest_published_recipe, Future):
+            self._latest_published_recipe = self._latest_published_recipe.result()
+        elif self._latest_published_recipe is None and self.latest_published_component_version:
+            self._latest_published_recipe = self._fetch_latest_published_recipe()
+        return self._latest_published_recipe
+
+    def _fetch_latest_published_recipe(self) -> dict:
+        component_arn = self._get_component_arn(self.region)
+        version_arn = f"{component_arn}:versions:{self.latest_published_component_version}"
+        return yaml.safe_load(Greengrassv2Client(self.region).get_component(version_arn).decode("utf8"))
+
     def _get_component_arn(self, _region):
         partition = self._get_aws_partition(_region)
         return f"arn:{partition}:greengrass:{_region}:{self.account_num}:components:{self.component_name}"
 
     def _get_aws_partition(self, _region):
-        boto3_session = boto3.Session()
-        return boto3_session.get_partition_for_region(region_name=_region)
+        return ClientFactory.get_partition(_region)
 
     def get_account_number(self) -> str:
         """
-        Uses STS client to get account number from the credentials provided using AWS cli.
+        Uses STS client to get account number from the credentials provided using AWS cli, unless it is cached for the
+        credentials already.
         Raises an exception when the request is unsuccessful.
         """
+        account_num = self.account_cache.get_account_number()
+        if account_num:
+            logging.debug("Using the cached account number '%s'.", account_num)
+            return account_num
         try:
-            _sts_client = boto3.client("sts")
+            _sts_client = ClientFactory.get_client("sts")
             account_num = _sts_client.get_caller_identity().get("Account")
             logging.debug("Identified account number as '%s'.", account_num)
+            self.account_cache.save_account_number(account_num)
             return account_num
         except Exception:
             logging.error("Error while fetching account number from credentials.")
@@ -1,7 +1,7 @@
 import jsonschema
 import logging
-import shutil
 from pathlib import Path
+from gdk.common.BuildManifest import BuildManifest
 from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile, CaseInsensitiveDict
 from gdk.common.RecipeValidator import RecipeValidator
 
@@ -15,7 +15,10 @@ from gdk.common.exceptions.error_messages import RECIPE_SIZE_INVALID, PROJECT_RE
 class BuildRecipeTransformer:
     def __init__(self, project_config: ComponentBuildConfiguration) -> None:
         self.project_config = project_config
+        self.build_manifest = BuildManifest(project_config.gg_build_dir)
         self._s3_client = None
+        # Source of each artifact staged by the last transform, with its size and modification time when it was copied.
+        self._staged_sources = {}
 
     def _get_s3_client(self, _region):
         if not _region:
@@ -34,12 +37,13 @@ class BuildRecipeTransformer:
 
         component_recipe = CaseInsensitiveRecipeFile().read(self.project_config.recipe_file)
         self.update_component_recipe_file(component_recipe, build_folders)
+        self.build_manifest.save()
 
         logging.info("Validating the recipe against the Greengrass recipe schema.")
         try:
             recipe_schema_path = utils.get_static_file_path(consts.recipe_schema_file)
             validator = RecipeValidator(recipe_schema_path)
-            validator.validate_recipe(component_recipe.to_dict())
+            validator.validate_recipe(component_recipe)
         except jsonschema.exceptions.ValidationError as err:
             raise Exception(PROJECT_RECIPE_FILE_INVALID.format(self.project_config.recipe_file, err.message))
         except jsonschema.exceptions.SchemaError as err:
@@ -95,7 +99,8 @@ class BuildRecipeTransformer:
 
         The component artifacts in the recipe are looked up in the build folders specific to the build system of the component.
         If the artifact is found, it is copied over to the greengrass artifacts build folder and the URI is updated in the
-        recipe and returns True. Otherwise, it returns False.
+        recipe and returns True. Otherwise, it returns False. The digest of the artifact is computed while it is copied and
+        recorded in the build manifest.
 
         Parameters
         ----------
@@ -114,7 +119,7 @@ class BuildRecipeTransformer:
                     "Copying file '%s' from '%s' to '%s'.", artifact_file_name, build_folder, gg_build_component_artifacts_dir
                 )
 
-                shutil.copy(artifact_file, gg_build_component_artifacts_dir)
+                self._stage_artifact(artifact_file)
                 logging.debug("Updating artifact URI of '%s' in the recipe file.", artifact_file_name)
                 artifact.update_value("Uri", f"{artifact_uri}/{artifact_file_name}")
                 return True
@@ -127,6 +132,30 @@ class BuildRecipeTransformer:
         logging.warning("Could not find the artifact file '%s' in the build folder '%s'.", artifact_file_name, build_folders)
         return False
 
+    def refresh_artifacts(self) -> None:
+        """
+        Copies over the artifacts that changed in the build folders since the last transform, without transforming the
+        recipe again. The artifact URIs in the recipe do not depend on the content of the artifacts, so the build recipe
+        stays valid as long as the project recipe is unchanged.
+        """
+        for artifact_file, staged_stat in list(self._staged_sources.items()):
+            try:
+                stat = artifact_file.stat()
+            except OSError:
+                logging.warning("Could not find the artifact file '%s' that was copied in the last build.", artifact_file)
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != staged_stat:
+                logging.debug("Copying the changed artifact '%s'.", artifact_file)
+                self._stage_artifact(artifact_file)
+        self.build_manifest.save()
+
+    def _stage_artifact(self, artifact_file: Path) -> None:
+        gg_build_component_artifacts_dir = self.project_config.gg_build_component_artifacts_dir
+        stat = artifact_file.stat()
+        digest = utils.copy_artifact_with_hash(artifact_file, gg_build_component_artifacts_dir)
+        self.build_manifest.record(gg_build_component_artifacts_dir.joinpath(artifact_file.name), digest)
+        self._staged_sources[artifact_file] = (stat.st_size, stat.st_mtime_ns)
+
     def create_build_recipe_file(self, parsed_component_recipe) -> None:
         """
         Creates a new recipe file(json or yaml) in the component recipes build directory.
@@ -19,6 +19,7 @@ class PublishRecipeTransformer:
         component_recipe = CaseInsensitiveRecipeFile().read(recipe_path)
         self.update_component_recipe_file(component_recipe)
         self.create_publish_recipe_file(component_recipe)
+        self.project_config.publish_recipe = component_recipe
 
     def update_component_recipe_file(self, parsed_component_recipe):
         logging.debug(
@@ -86,13 +87,13 @@ class PublishRecipeTransformer:
 
         """
 
-        logging.debug("Creating component recipe at '%s'.", self.project_config.publish_recipe_file)
-        CaseInsensitiveRecipeFile().write(self.project_config.publish_recipe_file, parsed_component_recipe)
-
+        recipe_file = CaseInsensitiveRecipeFile()
         recipe_path = Path(self.project_config.gg_build_recipes_dir).joinpath(self.project_config.publish_recipe_file)
+        # The recipe is serialized once, and checked in memory so that nothing is written if it is invalid.
+        data = recipe_file.serialize(recipe_path, parsed_component_recipe)
+
         logging.info(f"Validating the file size of the built recipe {recipe_path}")
-        # Validate the size of the created recipe file so we can raise an exception if it is too big
-        valid_file_size, input_recipe_file_size = utils.is_recipe_size_valid(recipe_path)
+        valid_file_size, input_recipe_file_size = utils.is_recipe_data_size_valid(data)
         if not valid_file_size:
             logging.error(BUILT_RECIPE_SIZE_INVALID.format(input_recipe_file_size))
             raise Exception(BUILT_RECIPE_SIZE_INVALID.format(input_recipe_file_size))
@@ -101,8 +102,11 @@ class PublishRecipeTransformer:
         try:
             recipe_schema_path = utils.get_static_file_path(consts.recipe_schema_file)
             validator = RecipeValidator(recipe_schema_path)
-            validator.validate_recipe(parsed_component_recipe.to_dict())
+            validator.validate_recipe(parsed_component_recipe)
         except jsonschema.exceptions.ValidationError as err:
             raise Exception(PROJECT_RECIPE_FILE_INVALID.format(recipe_path, err.message))
         except jsonschema.exceptions.SchemaError as err:
             raise Exception(SCHEMA_FILE_INVALID.format(err.message))
+
+        logging.debug("Creating component recipe at '%s'.", self.project_config.publish_recipe_file)
+        recipe_file.write(self.project_config.publish_recipe_file, parsed_component_recipe, data)
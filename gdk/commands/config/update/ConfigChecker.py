@@ -102,20 +102,25 @@ class ConfigChecker:
         if not isinstance(input_obj, dict):
             return False
 
-        if "excludes" in input_obj:
-            excluded = input_obj.get("excludes")
-            if not isinstance(excluded, list) or not all(
-                isinstance(item, str) for item in excluded
-            ):
-                return False
+        if "excludes" in input_obj and not self._is_string_list(input_obj.get("excludes")):
+            return False
 
         if "zip_name" in input_obj:
             zip_name = input_obj.get("zip_name")
             if not isinstance(zip_name, str):
                 return False
 
+        if "reproducible" in input_obj and not isinstance(input_obj.get("reproducible"), bool):
+            return False
+
+        if "store" in input_obj and not self._is_string_list(input_obj.get("store")):
+            return False
+
         return True
 
+    def _is_string_list(self, value):
+        return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
     def is_valid_bucket(self, input_value):
         # input must be a non-empty string
         return isinstance(input_value, str) and len(input_value) > 0
@@ -0,0 +1,28 @@
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+from gdk.commands.Command import Command
+from gdk.common.DaemonServer import DaemonServer
+
+
+class StartCommand(Command):
+    def __init__(self, command_args) -> None:
+        super().__init__(command_args, "start")
+
+    def run(self):
+        """
+        Starts the gdk daemon in the foreground. It runs the gdk commands forwarded to it until it is stopped or idle for
+        longer than the idle timeout.
+        """
+        DaemonServer(idle_timeout_seconds=self._get_idle_timeout()).serve()
+
+    def _get_idle_timeout(self) -> float:
+        idle_timeout = self.arguments.get("idle_timeout")
+        if idle_timeout is None:
+            return consts.DAEMON_IDLE_TIMEOUT_SECONDS
+        try:
+            idle_timeout_seconds = float(idle_timeout)
+        except ValueError:
+            idle_timeout_seconds = 0
+        if idle_timeout_seconds <= 0:
+            raise Exception(error_messages.DAEMON_IDLE_TIMEOUT_INVALID.format(idle_timeout))
+        return idle_timeout_seconds
@@ -0,0 +1,18 @@
+import logging
+
+from gdk.commands.Command import Command
+from gdk.common import DaemonClient
+
+
+class StopCommand(Command):
+    def __init__(self, command_args) -> None:
+        super().__init__(command_args, "stop")
+
+    def run(self):
+        """
+        Stops the running gdk daemon once it finishes the command it is running.
+        """
+        if DaemonClient.stop():
+            logging.info("Stopped the gdk daemon.")
+        else:
+            logging.info("No gdk daemon is running.")
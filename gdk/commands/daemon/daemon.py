@@ -0,0 +1,16 @@
+def start(d_args):
+    """
+    gdk daemon start
+    """
+    from gdk.commands.daemon.StartCommand import StartCommand
+
+    StartCommand(d_args).run()
+
+
+def stop(d_args):
+    """
+    gdk daemon stop
+    """
+    from gdk.commands.daemon.StopCommand import StopCommand
+
+    StopCommand(d_args).run()
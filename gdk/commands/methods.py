@@ -1,6 +1,7 @@
 from gdk.commands.component import component
 from gdk.commands.test import test
 from gdk.commands.config import config
+from gdk.commands.daemon import daemon
 import gdk.CLIParser
 
 
@@ -29,6 +30,14 @@ def _gdk_config_update(d_args):
     config.update(d_args)
 
 
+def _gdk_daemon_start(d_args):
+    daemon.start(d_args)
+
+
+def _gdk_daemon_stop(d_args):
+    daemon.stop(d_args)
+
+
 def _gdk_test_hyphen_e2e_init(d_args):
     test.init(d_args)
 
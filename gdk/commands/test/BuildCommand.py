@@ -1,4 +1,5 @@
 from gdk.commands.Command import Command
+from gdk.common.BuildManifest import BuildManifest
 from gdk.common.config.GDKProject import GDKProject
 from gdk.build_system.E2ETestBuildSystem import E2ETestBuildSystem
 from pathlib import Path
@@ -96,8 +97,8 @@ class BuildCommand(Command):
         """
         When the component is built using `gdk component build` command gdk creates a build recipe file. This method uses
         that build recipe file and creates a E2E test recipe file in the greengrass-build/recipes folder by replacing the
-        s3 artifact URIs with their absolute file paths. It also updates the component version to 1.0.0 if it is set to
-        NEXT_PATCH.
+        s3 artifact URIs with their absolute file paths and the digests recorded in the build manifest. It also updates the
+        component version to 1.0.0 if it is set to NEXT_PATCH.
         """
         if not self.should_create_e2e_test_recipe:
             return
@@ -110,6 +111,7 @@ class BuildCommand(Command):
             _recipe.update_value("ComponentVersion", self._test_component_default_v)
 
         # Update artifact URIs
+        local_artifacts = []
         for manifest in _recipe.get("manifests", []):
             for artifact in manifest.get("artifacts", []):
                 artifact_uri = artifact.get("uri", "")
@@ -124,5 +126,12 @@ class BuildCommand(Command):
                     )
                     continue
                 artifact.update_value("Uri", artifact_path.as_uri())
+                local_artifacts.append((artifact, artifact_path))
+
+        # Digests recorded by the build are reused, and the artifacts changed since are hashed concurrently.
+        digests = BuildManifest(self._gdk_project.gg_build_dir).get_digests(path for _, path in local_artifacts)
+        for artifact, artifact_path in local_artifacts:
+            artifact.update_value("Digest", digests[artifact_path])
+            artifact.update_value("Algorithm", "SHA-256")
         logging.info("Creating the E2E testing recipe file: %s", e2e_test_recipe_file.resolve())
         CaseInsensitiveRecipeFile().write(e2e_test_recipe_file, _recipe)
@@ -1,11 +1,13 @@
 import logging
 from pathlib import Path
+from typing import List
 
 from gdk.commands.test.config.InitConfiguration import InitConfiguration
 import gdk.common.utils as utils
 from gdk.commands.Command import Command
 from gdk.build_system.E2ETestBuildSystem import E2ETestBuildSystem
 from gdk.common.URLDownloader import URLDownloader
+from gdk.common.DownloadCache import DownloadCache
 import gdk.common.consts as consts
 
 
@@ -34,9 +36,22 @@ class InitCommand(Command):
 
         logging.info("Downloading the E2E testing template from GitHub into %s directory...", consts.E2E_TESTS_DIR_NAME)
 
-        URLDownloader(self.template_url).download_and_extract(self.test_directory)
+        URLDownloader(self.template_url, cache=DownloadCache()).download_and_extract(
+            self.test_directory, exclude=self.get_unused_build_identifiers(self._test_config.test_build_system)
+        )
         self.update_testing_module_build_identifiers(self._test_config.test_build_system, self._init_config.gtf_version)
 
+    def get_unused_build_identifiers(self, build_system_str) -> List[str]:
+        """
+        Return the build files of the build systems other than the one configured for the testing module. These are not
+        extracted from the template.
+        """
+        used_identifiers = set(E2ETestBuildSystem.get(build_system_str).build_system_identifier)
+        unused_identifiers = set()
+        for build_system_type in E2ETestBuildSystem.supported_types:
+            unused_identifiers.update(E2ETestBuildSystem.get(build_system_type).build_system_identifier)
+        return sorted(unused_identifiers - used_identifiers)
+
     def update_testing_module_build_identifiers(self, build_system_str, gtf_version):
         build_system = E2ETestBuildSystem.get(build_system_str)
         for identifier in build_system.build_system_identifier:
@@ -3,6 +3,7 @@ from gdk.build_system.E2ETestBuildSystem import E2ETestBuildSystem
 from gdk.commands.test.config.RunConfiguration import RunConfiguration
 from pathlib import Path
 from gdk.common.URLDownloader import URLDownloader
+from gdk.common.DownloadCache import DownloadCache
 import logging
 import subprocess as sp
 import gdk.common.consts as consts
@@ -33,7 +34,9 @@ class RunCommand(Command):
         _nucleus_path = Path(self._run_config.options.get("ggc-archive"))
         if self._should_download_nucleus_archive(_nucleus_path):
             logging.info("Downloading latest nucleus archive from url %s", self._nucleus_archive_link)
-            URLDownloader(self._nucleus_archive_link).download(_nucleus_path)
+            URLDownloader(
+                self._nucleus_archive_link, parallel_ranges=consts.NUCLEUS_DOWNLOAD_PARALLEL_RANGES, cache=DownloadCache()
+            ).download(_nucleus_path)
 
         self.run_testing_jar()
 
@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+
+
+class BuildManifest:
+    """
+    Manifest of the artifacts staged by the last component build, kept in the greengrass-build directory.
+
+    The SHA-256 digest of each artifact is computed while the artifact is copied into the build folder and recorded here
+    together with its size and modification time. Later commands read the digest instead of hashing the artifact again,
+    as long as the file is unchanged since it was recorded.
+    """
+
+    def __init__(self, gg_build_dir: Path):
+        self.gg_build_dir = Path(gg_build_dir).resolve()
+        self.manifest_file = self.gg_build_dir.joinpath(consts.build_manifest_file)
+        self._artifacts = None
+        self._lock = threading.Lock()
+
+    def record(self, artifact: Path, digest: str) -> None:
+        """
+        Records the encoded SHA-256 digest of the staged artifact. Call save() to write the manifest.
+        """
+        stat = Path(artifact).stat()
+        with self._lock:
+            self._get_artifacts()[self._get_key(artifact)] = {
+                "digest": digest,
+                "algorithm": "SHA-256",
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+
+    def get_digest(self, artifact: Path) -> Optional[str]:
+        """
+        Returns the recorded digest of the artifact, or None if it is not recorded or the file changed since.
+        """
+        with self._lock:
+            entry = self._get_artifacts().get(self._get_key(artifact))
+        if not entry:
+            return None
+        try:
+            stat = Path(artifact).stat()
+        except OSError:
+            return None
+        if entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            logging.debug("Ignoring the recorded digest of '%s' as the file changed since it was built.", artifact)
+            return None
+        return entry.get("digest")
+
+    def get_digests(self, artifacts) -> Dict[Path, str]:
+        """
+        Returns the digest of each artifact, by its path. Recorded digests are used where the artifact is unchanged, and the
+        other artifacts are hashed concurrently.
+        """
+        digests = {artifact: self.get_digest(artifact) for artifact in artifacts}
+        digests.update(utils.hash_artifacts([artifact for artifact, digest in digests.items() if digest is None]))
+        return digests
+
+    def save(self) -> None:
+        with self._lock:
+            content = {"artifacts": self._get_artifacts()}
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.manifest_file.with_name(f"{self.manifest_file.name}.{os.getpid()}.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=2)
+            os.replace(temp_file, self.manifest_file)
+
+    def _get_key(self, artifact: Path) -> str:
+        # Artifacts are keyed relative to the build directory, so the manifest stays valid if the project is moved.
+        artifact = Path(artifact).resolve()
+        try:
+            return artifact.relative_to(self.gg_build_dir).as_posix()
+        except ValueError:
+            return artifact.as_posix()
+
+    def _get_artifacts(self) -> dict:
+        if self._artifacts is None:
+            self._artifacts = {}
+            if self.manifest_file.exists():
+                try:
+                    with open(self.manifest_file, "r", encoding="utf-8") as f:
+                        self._artifacts = json.load(f).get("artifacts", {})
+                except (OSError, ValueError, AttributeError) as e:
+                    logging.debug("Ignoring the unreadable build manifest '%s'. Error details: %s", self.manifest_file, e)
+        return self._artifacts
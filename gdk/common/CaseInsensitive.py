@@ -1,64 +1,242 @@
+import hashlib
 import json
 import logging
+import os
+import threading
+from collections.abc import Mapping, MutableMapping, MutableSequence
 from pathlib import Path
 
 import yaml
-from requests.structures import CaseInsensitiveDict as _CaseInsensitiveDict
 from gdk.common.consts import DOCS_RECIPE_LINK
 
+# libyaml is much faster at parsing and emitting recipes, and is used whenever PyYAML is built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class CaseInsensitiveDict(MutableMapping):
+    """
+    Case insensitive view over a recipe tree of plain dictionaries and lists.
+
+    The view wraps the dictionary it is given instead of copying it. Lowercase key indexes are built for each nested
+    dictionary only when it is first accessed, so building and walking a recipe is linear in its size, and to_dict()
+    returns the underlying tree itself. Nested dictionaries and lists are returned as views sharing their data, so updating
+    them updates the recipe.
+
+    normalized() returns the recipe with all its keys in lowercase. It is computed once and shared by everything that
+    needs a canonical form of the recipe, like schema validation and diffing, until the recipe is updated through a view.
+    """
+
+    __slots__ = ("_data", "_index", "_children", "_parent", "_normalized")
 
-class CaseInsensitiveDict(_CaseInsensitiveDict):
     def __init__(self, data=None, **kwargs):
-        super().__init__(data, **kwargs)
-        _dict = _CaseInsensitiveDict(data)
-        self._convert_nested_dict(_dict)
-        self.update(_dict)
+        if isinstance(data, CaseInsensitiveDict):
+            data = data._data
+        elif data is None:
+            data = {}
+        elif not isinstance(data, dict):
+            data = dict(data)
+        self._data = data
+        self._index = {key.lower(): key for key in data}
+        self._children = {}
+        self._parent = None
+        self._normalized = None
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def to_dict(self) -> dict:
+        """
+        Returns the underlying recipe tree of plain dictionaries and lists. It is not a copy.
+        """
+        return self._data
 
-    def to_dict(self):
-        _dict = dict(self)
-        self._convert_nested_case_insensitive_dict(_dict)
-        return _dict
+    def normalized(self) -> dict:
+        """
+        Returns the recipe tree with all its keys in lowercase. The result is cached and shared, so it must not be modified.
+        """
+        if self._normalized is None:
+            self._normalized = _normalize(self._data)
+        return self._normalized
 
     def update_value(self, key, value):
-        if key.lower() in self._store:
-            key = self._store[key.lower()][0]
-        self._store[key.lower()] = (key, value)
-
-    def _convert_nested_dict(self, case_insensitive_dict: _CaseInsensitiveDict) -> None:
-        for key, value in case_insensitive_dict.items():
-            if isinstance(value, dict):
-                case_insensitive_dict.update({key: CaseInsensitiveDict(value)})
-            elif isinstance(value, list):
-                case_insensitive_dict.update(
-                    {key: [CaseInsensitiveDict(val) if isinstance(val, dict) else val for val in value]}
-                )
-
-    def _convert_nested_case_insensitive_dict(self, dictObj: dict) -> dict:
-        for key, value in dictObj.items():
-            if isinstance(value, CaseInsensitiveDict):
-                dictObj.update({key: self._convert_nested_case_insensitive_dict(dict(value))})
-            elif isinstance(value, list):
-                dictObj.update(
-                    {
-                        key: [
-                            self._convert_nested_case_insensitive_dict(dict(val))
-                            if isinstance(val, CaseInsensitiveDict)
-                            else val
-                            for val in value
-                        ]
-                    }
-                )
-        return dictObj
+        """
+        Sets the value of the key, keeping the original case of the key if it already exists.
+        """
+        self._set(self._index.get(key.lower(), key), value)
+
+    def __setitem__(self, key, value):
+        self._set(key, value)
+
+    def __getitem__(self, key):
+        lower_key = key.lower()
+        child = self._children.get(lower_key)
+        if child is not None:
+            return child
+        value = self._data[self._index[lower_key]]
+        if isinstance(value, dict):
+            child = CaseInsensitiveDict(value)
+        elif isinstance(value, list):
+            child = CaseInsensitiveList(value)
+        else:
+            return value
+        child._parent = self
+        self._children[lower_key] = child
+        return child
+
+    def __delitem__(self, key):
+        lower_key = key.lower()
+        del self._data[self._index.pop(lower_key)]
+        self._children.pop(lower_key, None)
+        _invalidate(self)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return isinstance(key, str) and key.lower() in self._index
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        # Keys are compared in lowercase at every level, not only at the top one.
+        other_normalized = other.normalized() if isinstance(other, CaseInsensitiveDict) else _normalize(dict(other))
+        return self.normalized() == other_normalized
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def copy(self):
+        return CaseInsensitiveDict(dict(self._data))
+
+    def _set(self, key, value):
+        lower_key = key.lower()
+        existing_key = self._index.get(lower_key)
+        if existing_key is not None and existing_key != key:
+            # Renamed in place so that the key keeps its position and views sharing the dictionary see the change.
+            items = [(key if k == existing_key else k, v) for k, v in self._data.items()]
+            self._data.clear()
+            self._data.update(items)
+        self._data[key] = _unwrap(value)
+        self._index[lower_key] = key
+        self._children.pop(lower_key, None)
+        _invalidate(self)
+
+
+class CaseInsensitiveList(MutableSequence):
+    """
+    View over a list of a recipe tree that returns its dictionaries as CaseInsensitiveDict views.
+    """
+
+    __slots__ = ("_data", "_views", "_parent", "_normalized")
+
+    def __init__(self, data: list):
+        self._data = data
+        self._views = {}
+        self._parent = None
+        self._normalized = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+        item = self._data[index]
+        if not isinstance(item, dict):
+            return item
+        # Views are cached by the identity of the dictionary they wrap, so a replaced item gets a new view.
+        cached = self._views.get(id(item))
+        if cached is None or cached[0] is not item:
+            cached = (item, CaseInsensitiveDict(item))
+            cached[1]._parent = self
+            self._views[id(item)] = cached
+        return cached[1]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._data[index] = [_unwrap(item) for item in value]
+        else:
+            self._data[index] = _unwrap(value)
+        _invalidate(self)
+
+    def __delitem__(self, index):
+        del self._data[index]
+        _invalidate(self)
+
+    def __len__(self):
+        return len(self._data)
+
+    def insert(self, index, value):
+        self._data.insert(index, _unwrap(value))
+        _invalidate(self)
+
+    def __eq__(self, other):
+        if isinstance(other, CaseInsensitiveList):
+            other = other._data
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self):
+        return repr(self._data)
+
+
+def _invalidate(view) -> None:
+    # Drops the normalized form cached by the view and all the views it is nested in.
+    while view is not None:
+        view._normalized = None
+        view = view._parent
+
+
+def _normalize(value):
+    if isinstance(value, (CaseInsensitiveDict, CaseInsensitiveList)):
+        value = value._data
+    if isinstance(value, dict):
+        return {key.lower() if isinstance(key, str) else key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _unwrap(value):
+    # Keeps the underlying tree made of plain dictionaries and lists, so that it can be exported without copying.
+    if isinstance(value, (CaseInsensitiveDict, CaseInsensitiveList)):
+        return value._data
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    return value
 
 
 class CaseInsensitiveRecipeFile:
-    def write(self, file_path: Path, content: CaseInsensitiveDict) -> None:
+    """
+    Reads and writes recipe files as CaseInsensitiveDicts.
+
+    YAML recipes are parsed and emitted with libyaml when PyYAML is built with it. Parsed recipes are cached per process by
+    their path and the hash of their content, so reading a recipe that is unchanged since it was last read or written only
+    costs reading and hashing the file. Every read returns a copy of the cached recipe, which the caller is free to update.
+    """
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def write(self, file_path: Path, content: CaseInsensitiveDict, data: bytes = None) -> None:
         """
         Writes CaseInsensitiveDict contents to a JSON or a YAML file based on the file path.
+
+        The file is replaced atomically, so it is never left partially written. If the contents are already serialized
+        with serialize(), their bytes can be given as data so that they are not serialized again.
+        """
+        if data is None:
+            data = self.serialize(file_path, content)
+        self._write(file_path, content.to_dict(), data)
+
+    def serialize(self, file_path: Path, content: CaseInsensitiveDict) -> bytes:
+        """
+        Serializes CaseInsensitiveDict contents to the bytes of a JSON or a YAML file based on the file path.
         """
         if not self._is_json(file_path) and not self._is_yaml(file_path):
             raise Exception(f"Invalid recipe file : {file_path}. Recipe file must be in json or yaml format.")
-        self._write(file_path, content.to_dict())
+        if self._is_json(file_path):
+            return self._serialize_to_json(content.to_dict()).encode("utf-8")
+        return self._serialize_to_yaml(content.to_dict()).encode("utf-8")
 
     def read(self, file_path: Path) -> CaseInsensitiveDict:
         """
@@ -68,46 +246,88 @@ class CaseInsensitiveRecipeFile:
             raise Exception(f"Invalid recipe file : {file_path}. Recipe file must be in json or yaml format.")
         return CaseInsensitiveDict(self._read(file_path))
 
-    def _write(self, file_path, content):
-        if self._is_json(file_path):
-            self._write_to_json(file_path, content)
-        else:
-            self._write_to_yaml(file_path, content)
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Drops all the parsed recipes cached in this process.
+        """
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    def _write(self, file_path, content, data: bytes):
+        file_path = Path(file_path)
+        temp_file = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_file, "wb") as f:
+                f.write(data)
+            os.replace(temp_file, file_path)
+        except OSError:
+            if temp_file.exists():
+                temp_file.unlink()
+            raise
+        self._cache_recipe(file_path, data, content)
 
     def _read(self, file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        key = self._get_cache_key(file_path)
+        digest = hashlib.sha256(data).digest()
+        with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == digest:
+            logging.debug("Using the cached recipe parsed from '%s'.", file_path)
+            return _copy_tree(cached[1])
+
         if self._is_json(file_path):
-            return self._read_from_json(file_path)
+            content = self._read_from_json(file_path, data.decode("utf-8"))
         else:
-            return self._read_from_yaml(file_path)
-
-    def _read_from_yaml(self, file_path: Path) -> dict:
-        with open(file_path, "r", encoding="utf-8") as f:
-            try:
-                return yaml.safe_load(f.read())
-            except yaml.YAMLError as err:
-                logging.error(f"Syntax error when parsing the recipe file: {file_path}. For information and examples" +
-                              f" regarding component recipes refer to the docs here: {DOCS_RECIPE_LINK}")
-                raise err
-
-    def _read_from_json(self, file_path: Path) -> dict:
-        with open(file_path, "r", encoding="utf-8") as f:
-            try:
-                return json.loads(f.read())
-            except json.JSONDecodeError as err:
-                logging.error(f"Syntax error when parsing the recipe file: {file_path}. For information and examples" +
-                              f" regarding component recipes refer to the docs here: {DOCS_RECIPE_LINK}")
-                raise err
-
-    def _write_to_json(self, file_path: Path, content: dict) -> None:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(json.dumps(content, indent=4))
-
-    def _write_to_yaml(self, file_path: Path, content: dict) -> None:
-        with open(file_path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(content, f, sort_keys=False)
+            content = self._read_from_yaml(file_path, data.decode("utf-8"))
+        self._cache_recipe(file_path, data, content)
+        return content
+
+    def _cache_recipe(self, file_path, data: bytes, content) -> None:
+        # The cache keeps its own copy so that updates to the returned recipe do not leak into later reads.
+        with self._cache_lock:
+            self._cache[self._get_cache_key(file_path)] = (hashlib.sha256(data).digest(), _copy_tree(content))
+
+    def _get_cache_key(self, file_path) -> str:
+        return str(Path(file_path).resolve())
+
+    def _read_from_yaml(self, file_path: Path, text: str) -> dict:
+        try:
+            return yaml.load(text, Loader=_YAML_LOADER)
+        except yaml.YAMLError as err:
+            logging.error(f"Syntax error when parsing the recipe file: {file_path}. For information and examples" +
+                          f" regarding component recipes refer to the docs here: {DOCS_RECIPE_LINK}")
+            if _YAML_LOADER is not yaml.SafeLoader:
+                # libyaml reports syntax errors with less detail, so the recipe is parsed again to report the error.
+                yaml.load(text, Loader=yaml.SafeLoader)
+            raise err
+
+    def _read_from_json(self, file_path: Path, text: str) -> dict:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as err:
+            logging.error(f"Syntax error when parsing the recipe file: {file_path}. For information and examples" +
+                          f" regarding component recipes refer to the docs here: {DOCS_RECIPE_LINK}")
+            raise err
+
+    def _serialize_to_json(self, content: dict) -> str:
+        return json.dumps(content, indent=4)
+
+    def _serialize_to_yaml(self, content: dict) -> str:
+        return yaml.dump(content, Dumper=_YAML_DUMPER, sort_keys=False)
 
     def _is_json(self, file_path: Path) -> bool:
         return file_path.name.endswith(".json")
 
     def _is_yaml(self, file_path: Path) -> bool:
         return file_path.name.endswith(".yaml") or file_path.name.endswith(".yml")
+
+
+def _copy_tree(value):
+    if isinstance(value, dict):
+        return {key: _copy_tree(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(item) for item in value]
+    return value
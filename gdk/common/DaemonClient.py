@@ -0,0 +1,126 @@
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional
+
+import gdk._version as version
+import gdk.common.consts as consts
+
+# This module is the entry point of the gdk command. It imports no more than it needs to talk to the gdk daemon, so that
+# a command run by the daemon does not pay for loading the dependencies of the commands in every invocation.
+
+
+def main():
+    """
+    Runs the gdk command. The command is forwarded to the gdk daemon when one is running and the command can run in it,
+    and runs in this process otherwise.
+    """
+    argv = sys.argv[1:]
+    exit_code = forward(argv) if can_forward(argv) else None
+    if exit_code is not None:
+        sys.exit(exit_code)
+    from gdk.CLIParser import main as cli_main
+
+    cli_main()
+
+
+def get_socket_path() -> Path:
+    """
+    Returns the path of the Unix domain socket the gdk daemon listens on, in the user level gdk directory.
+    """
+    return Path.home().joinpath(consts.gdk_user_dir_name, consts.daemon_socket_file_name)
+
+
+def can_forward(argv) -> bool:
+    """
+    Returns True if the command can run in the gdk daemon. Commands that prompt for input or run until they are
+    interrupted, like a build in watch mode, run in the gdk process instead. This is a quick check that saves the round
+    trip to the daemon. The daemon refuses commands in watch mode with abbreviated options after parsing them.
+    """
+    return tuple(argv[:2]) in consts.DAEMON_COMMANDS and "-w" not in argv and "--watch" not in argv
+
+
+def forward(argv, socket_path: Path = None) -> Optional[int]:
+    """
+    Runs the command in the gdk daemon and writes its output to the standard output and error of this process.
+
+    Parameters
+    ----------
+        argv(list): Arguments of the gdk command, without the program name.
+        socket_path(Path): Socket of the daemon. Defaults to get_socket_path().
+
+    Returns
+    -------
+        exit_code(int): Exit code of the command, or None if no compatible daemon is running and the command must run in
+                        this process.
+    """
+    connection = connect(socket_path)
+    if connection is None:
+        return None
+    with connection:
+        send_message(
+            connection,
+            {"version": version.__version__, "argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)},
+        )
+        for message in read_messages(connection):
+            if "exit_code" in message:
+                return message["exit_code"]
+            if "refused" in message:
+                return None
+            stream = sys.stdout if message.get("stream") == "stdout" else sys.stderr
+            stream.write(message.get("data", ""))
+            stream.flush()
+    # The daemon stopped before the command finished.
+    return 1
+
+
+def stop(socket_path: Path = None) -> bool:
+    """
+    Stops the gdk daemon once it finishes the command it is running. Returns False if no daemon is running.
+    """
+    connection = connect(socket_path)
+    if connection is None:
+        return False
+    with connection:
+        send_message(connection, {"stop": True})
+        for message in read_messages(connection):
+            if "exit_code" in message:
+                return True
+    return False
+
+
+def connect(socket_path: Path = None) -> Optional[socket.socket]:
+    """
+    Returns a connection to the gdk daemon, or None if no daemon listens on the socket.
+    """
+    socket_path = Path(socket_path or get_socket_path())
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.settimeout(consts.DAEMON_CONNECT_TIMEOUT_SECONDS)
+        connection.connect(str(socket_path))
+        # Commands take as long as they take, so only the connection itself is timed out.
+        connection.settimeout(None)
+        return connection
+    except OSError:
+        connection.close()
+        return None
+
+
+def send_message(connection: socket.socket, message: dict) -> None:
+    """
+    Sends a message of the daemon protocol, which is a JSON object on a line of its own.
+    """
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def read_messages(connection: socket.socket):
+    """
+    Yields the messages of the daemon protocol received on the connection until it is closed.
+    """
+    with connection.makefile("rb") as lines:
+        for line in lines:
+            yield json.loads(line)
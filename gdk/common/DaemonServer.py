@@ -0,0 +1,266 @@
+import codecs
+import logging
+import os
+import socket
+import sys
+import threading
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import boto3
+
+import gdk._version as version
+import gdk.CLIParser
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+import gdk.common.utils as utils
+from gdk.aws_clients.ClientFactory import ClientFactory
+from gdk.aws_clients.ComponentVersionResolver import ComponentVersionResolver
+from gdk.common import DaemonClient
+
+
+class DaemonServer:
+    """
+    Runs the gdk commands sent by gdk clients over a Unix domain socket in one long-lived process.
+
+    Every gdk invocation otherwise starts Python, imports boto3, parses the cli model and the schemas, resolves the AWS
+    credentials and reads the recipes again. The daemon keeps all of it warm: the imported modules, the cli parser, the
+    schema validators, the AWS session and clients, and the parsed recipes, which are cached by the digest of their files.
+
+    Commands run one at a time in the working directory and the environment of the client. Everything they write to the
+    standard output and error, including the output of the build tools they run, is streamed back to the client. The AWS
+    clients are created again when the credentials of the client change, and the component versions are listed again for
+    every command. The daemon stops when it is idle for longer than its idle timeout.
+    """
+
+    def __init__(self, socket_path: Path = None, idle_timeout_seconds=consts.DAEMON_IDLE_TIMEOUT_SECONDS):
+        self.socket_path = Path(socket_path or DaemonClient.get_socket_path())
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._credentials_fingerprint = None
+        self._stopping = False
+
+    def serve(self) -> None:
+        """
+        Runs the commands sent to the socket until the daemon is stopped or idle for longer than its idle timeout.
+        """
+        server = self._bind()
+        utils.cli_version_check()
+        logging.info(
+            "The gdk daemon is listening on '%s'. It stops after %s seconds without commands.",
+            self.socket_path,
+            self.idle_timeout_seconds,
+        )
+        try:
+            with server:
+                while not self._stopping:
+                    try:
+                        connection, _ = server.accept()
+                    except socket.timeout:
+                        logging.info("Stopping the gdk daemon as it is idle.")
+                        break
+                    with connection:
+                        try:
+                            self._handle(connection)
+                        except (OSError, ValueError) as e:
+                            logging.debug("Dropped the connection of a gdk client. Error details: %s", e)
+        finally:
+            self._unlink_socket()
+        logging.info("The gdk daemon is stopped.")
+
+    def _bind(self) -> socket.socket:
+        if not hasattr(socket, "AF_UNIX"):
+            raise Exception(error_messages.DAEMON_NOT_SUPPORTED)
+        connection = DaemonClient.connect(self.socket_path)
+        if connection is not None:
+            connection.close()
+            raise Exception(error_messages.DAEMON_ALREADY_RUNNING.format(self.socket_path))
+        # A socket left behind by a daemon that did not stop cleanly.
+        self._unlink_socket()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user running the daemon may connect to it, as commands run with the user's credentials.
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(self.socket_path))
+        except OSError:
+            server.close()
+            raise
+        finally:
+            os.umask(umask)
+        server.listen()
+        server.settimeout(self.idle_timeout_seconds)
+        return server
+
+    def _unlink_socket(self) -> None:
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _handle(self, connection: socket.socket) -> None:
+        connection.settimeout(consts.DAEMON_REQUEST_TIMEOUT_SECONDS)
+        request = next(DaemonClient.read_messages(connection), None)
+        connection.settimeout(None)
+        if request is None:
+            return
+        if not isinstance(request, dict):
+            DaemonClient.send_message(connection, {"refused": "The request is not a JSON object."})
+            return
+        if request.get("stop"):
+            logging.info("Stopping the gdk daemon on request.")
+            self._stopping = True
+            DaemonClient.send_message(connection, {"exit_code": 0})
+            return
+        if request.get("version") != version.__version__:
+            # The client runs the command itself, with the version of gdk it belongs to.
+            DaemonClient.send_message(connection, {"refused": f"The gdk daemon runs gdk version {version.__version__}."})
+            return
+        invalid_reason = self._get_invalid_reason(request)
+        if invalid_reason:
+            logging.debug("Refused an invalid request of a gdk client: %s", invalid_reason)
+            DaemonClient.send_message(connection, {"refused": invalid_reason})
+            return
+        logging.debug("Running 'gdk %s' in '%s'.", " ".join(request["argv"]), request["cwd"])
+        send_lock = threading.Lock()
+        with self._client_context(request):
+            if self._runs_until_interrupted(request["argv"]):
+                # The client runs the command itself, as it would block every other command.
+                DaemonClient.send_message(connection, {"refused": "The command runs until it is interrupted."})
+                return
+            with self._capture_output(connection, send_lock):
+                exit_code = self._run_command()
+        with send_lock:
+            DaemonClient.send_message(connection, {"exit_code": exit_code})
+
+    def _get_invalid_reason(self, request: dict) -> str:
+        """
+        Returns why the command request is invalid, or an empty string if it is valid. A request of a client that does
+        not follow the protocol must not stop the daemon.
+        """
+        argv, cwd, env = request.get("argv"), request.get("cwd"), request.get("env")
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            return "The 'argv' of the request must be a list of strings."
+        if not isinstance(cwd, str):
+            return "The 'cwd' of the request must be a string."
+        if not isinstance(env, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in env.items()):
+            return "The 'env' of the request must be an object of strings."
+        return ""
+
+    @contextmanager
+    def _client_context(self, request: dict):
+        # Commands rely on the process wide working directory, environment and arguments, which is why they run one at a
+        # time.
+        root_logger = logging.getLogger()
+        saved_cwd, saved_env, saved_argv, saved_level = os.getcwd(), dict(os.environ), sys.argv, root_logger.level
+        try:
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            sys.argv = [consts.cli_tool_name, *request["argv"]]
+            self._refresh_state()
+            yield
+        finally:
+            os.chdir(saved_cwd)
+            os.environ.clear()
+            os.environ.update(saved_env)
+            sys.argv = saved_argv
+            # The debug argument of a command raises the level of the root logger.
+            root_logger.setLevel(saved_level)
+
+    def _refresh_state(self) -> None:
+        # Versions published since the last command must be seen by the next one.
+        ComponentVersionResolver.clear()
+        fingerprint = self._get_credentials_fingerprint()
+        if fingerprint != self._credentials_fingerprint:
+            if self._credentials_fingerprint is not None:
+                logging.debug("The AWS credentials changed since the last command. Creating new AWS clients.")
+            ClientFactory.clear()
+            boto3.DEFAULT_SESSION = None
+            self._credentials_fingerprint = fingerprint
+
+    def _get_credentials_fingerprint(self) -> tuple:
+        env = tuple(sorted((key, value) for key, value in os.environ.items() if key.startswith("AWS_")))
+        files = []
+        for path in (
+            os.environ.get("AWS_SHARED_CREDENTIALS_FILE", "~/.aws/credentials"),
+            os.environ.get("AWS_CONFIG_FILE", "~/.aws/config"),
+        ):
+            try:
+                stat = os.stat(os.path.expanduser(path))
+                files.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                files.append(None)
+        return env, tuple(files)
+
+    def _runs_until_interrupted(self, argv) -> bool:
+        """
+        Returns True if the command runs until it is interrupted, like a build in watch mode. The arguments are parsed
+        like the command would parse them, so that abbreviated options are recognized too.
+        """
+        # Invalid arguments make the parser log an error and exit. The command reports them when it runs instead.
+        logging.disable(logging.CRITICAL)
+        try:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+                args_namespace, _ = gdk.CLIParser.cli_parser.parse_known_args(argv)
+        except SystemExit:
+            return False
+        finally:
+            logging.disable(logging.NOTSET)
+        return bool(getattr(args_namespace, "watch", False))
+
+    def _run_command(self) -> int:
+        try:
+            gdk.CLIParser.main(check_version=False)
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            print(e.code, file=sys.stderr)
+            return 1
+        return 0
+
+    @contextmanager
+    def _capture_output(self, connection: socket.socket, send_lock: threading.Lock):
+        # The file descriptors are redirected rather than sys.stdout and sys.stderr, so that the output of subprocesses
+        # such as build tools is sent to the client too.
+        pumps = []
+        saved_fds = []
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, stream_name in ((1, "stdout"), (2, "stderr")):
+            read_fd, write_fd = os.pipe()
+            saved_fds.append((fd, os.dup(fd)))
+            os.dup2(write_fd, fd)
+            os.close(write_fd)
+            pump = threading.Thread(
+                target=self._pump_output, args=(read_fd, stream_name, connection, send_lock), daemon=True
+            )
+            pump.start()
+            pumps.append(pump)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in saved_fds:
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+            # The pumps finish once all the writers of the pipes are closed, unless a subprocess left running holds them.
+            for pump in pumps:
+                pump.join(consts.DAEMON_OUTPUT_DRAIN_TIMEOUT_SECONDS)
+
+    def _pump_output(self, read_fd, stream_name, connection: socket.socket, send_lock: threading.Lock) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        connected = True
+        with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+            while True:
+                data = pipe.read(consts.DAEMON_OUTPUT_CHUNK_SIZE_BYTES)
+                text = decoder.decode(data or b"", final=not data)
+                if text and connected:
+                    try:
+                        with send_lock:
+                            DaemonClient.send_message(connection, {"stream": stream_name, "data": text})
+                    except OSError:
+                        # The client is gone. The command runs to completion all the same.
+                        connected = False
+                if not data:
+                    return
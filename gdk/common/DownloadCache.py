@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Mapping
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import gdk.common.consts as consts
+import gdk.common.utils as utils
+
+
+class DownloadCache:
+    """
+    User level cache of downloaded files shared by all projects.
+
+    Each entry is keyed by the URL it was downloaded from and remembers the ETag and Last-Modified validators of the
+    response, so that it can be revalidated with a conditional request instead of being downloaded again. Processes
+    that fetch the same URL at the same time are serialized with a lock file in the entry directory.
+    """
+
+    _metadata_file_name = ".metadata.json"
+    _lock_file_name = ".lock"
+
+    def __init__(self, cache_dir: Path = None):
+        self.cache_dir = cache_dir or utils.get_gdk_user_dir().joinpath(consts.download_cache_dir_name)
+
+    def get_entry_path(self, url: str) -> Path:
+        """
+        Returns the path of the cached file for the URL. The file need not exist yet.
+        """
+        entry_dir = self._get_entry_dir(url)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        file_name = url.split("?")[0].rstrip("/").rsplit("/", 1)[-1] or "download"
+        return entry_dir.joinpath(file_name)
+
+    def get_conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Returns the headers that make a request for the URL conditional on the cached file being out of date. Returns an
+        empty dictionary when there is no cached file or it cannot be revalidated.
+        """
+        if not self.get_entry_path(url).exists():
+            return {}
+        metadata = self._read_metadata(url)
+        headers = {}
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+        return headers
+
+    @contextmanager
+    def lock(self, url: str):
+        """
+        Holds an exclusive lock on the cache entry for the URL, waiting for other processes to release it first. The entry
+        must only be revalidated or downloaded while the lock is held, so that two processes never write to the same
+        partial file.
+        """
+        entry_dir = self._get_entry_dir(url)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        with open(entry_dir.joinpath(self._lock_file_name), "a+b") as lock_file:
+            _lock(lock_file)
+            try:
+                yield
+            finally:
+                _unlock(lock_file)
+
+    def save_validators(self, url: str, response_headers: Mapping[str, str]) -> None:
+        """
+        Records the validators of the response that the cached file for the URL was downloaded from.
+        """
+        metadata = {
+            "url": url,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+        }
+        entry_dir = self._get_entry_dir(url)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        metadata_file = entry_dir.joinpath(self._metadata_file_name)
+        # Written aside and renamed, so that a process reading the validators never sees half of them.
+        temp_file = metadata_file.with_name(f"{metadata_file.name}.{os.getpid()}")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(temp_file, metadata_file)
+
+    def place(self, url: str, destination: Path) -> None:
+        """
+        Places the cached file for the URL at the destination, replacing whatever is there. The file is hard linked when
+        the destination is on the same file system as the cache and copied otherwise.
+        """
+        entry = self.get_entry_path(url)
+        link = destination.with_name(destination.name + ".link")
+        if link.exists():
+            link.unlink()
+        try:
+            os.link(entry, link)
+        except OSError as e:
+            logging.debug("Could not hard link the cached file '%s', copying it instead. Error details: %s", entry, e)
+            shutil.copyfile(entry, link)
+        os.replace(link, destination)
+
+    def _get_entry_dir(self, url: str) -> Path:
+        return self.cache_dir.joinpath(hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _read_metadata(self, url: str) -> dict:
+        metadata_file = self._get_entry_dir(url).joinpath(self._metadata_file_name)
+        try:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.debug("Ignoring the unreadable download cache metadata '%s'. Error details: %s", metadata_file, e)
+            return {}
+
+
+def _lock(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return
+    lock_file.seek(0)
+    while True:
+        try:
+            # Gives up after about ten seconds, so it is retried until the other process is done.
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock(lock_file) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        return
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
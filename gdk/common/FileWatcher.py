@@ -0,0 +1,200 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional, Set
+
+import gdk.common.consts as consts
+
+
+class FileWatcher:
+    """
+    Watches a project tree for changed files.
+
+    Changes are read from inotify on Linux and found by polling the tree everywhere else, or when inotify is not usable.
+    Ignored paths are not reported and ignored folders are not watched. Bursts of changes, like an editor saving several
+    files or a build tool writing its outputs, are debounced into a single set of changes.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        is_ignored: Callable[[str], bool],
+        debounce_seconds=consts.WATCH_DEBOUNCE_SECONDS,
+        poll_interval_seconds=consts.WATCH_POLL_INTERVAL_SECONDS,
+    ):
+        """
+        Parameters
+        ----------
+            root(Path): Folder to watch.
+            is_ignored(Callable): Returns True if the change of a path, relative to the root in posix format, is ignored.
+        """
+        self.root = Path(root).resolve()
+        self.is_ignored = is_ignored
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._backend = None
+        if _InotifyBackend.is_supported():
+            try:
+                self._backend = _InotifyBackend(self.root, is_ignored)
+            except OSError as e:
+                logging.debug("Could not watch the project with inotify, polling it instead. Error details: %s", e)
+        if self._backend is None:
+            self._backend = _PollingBackend(self.root, is_ignored)
+        logging.debug("Watching '%s' with %s.", self.root, type(self._backend).__name__)
+
+    def wait_for_changes(self) -> Optional[Set[str]]:
+        """
+        Blocks until files change and no more changes follow within the debounce interval.
+
+        Returns the changed paths relative to the root in posix format, or None if the changes could not all be tracked
+        and the whole tree must be considered changed.
+        """
+        changes = set()
+        while changes is not None and not changes:
+            changes = self._backend.read(self.poll_interval_seconds)
+        while changes is not None:
+            more = self._backend.read(self.debounce_seconds)
+            if more is None:
+                return None
+            if not more:
+                break
+            changes |= more
+        return changes
+
+    def discard_changes(self) -> None:
+        """
+        Drops the changes made since the last call to wait_for_changes(), like the files written by a build.
+        """
+        while self._backend.read(0):
+            pass
+
+    def close(self) -> None:
+        self._backend.close()
+
+
+class _PollingBackend:
+    def __init__(self, root: Path, is_ignored: Callable[[str], bool]):
+        self.root = root
+        self.is_ignored = is_ignored
+        self._snapshot = self._scan()
+
+    def read(self, timeout) -> Set[str]:
+        time.sleep(timeout)
+        snapshot = self._scan()
+        changes = {path for path in snapshot.keys() | self._snapshot.keys() if snapshot.get(path) != self._snapshot.get(path)}
+        self._snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        pass
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        for dir_path, dir_names, file_names in os.walk(self.root):
+            relative_dir = Path(dir_path).relative_to(self.root).as_posix()
+            prefix = "" if relative_dir == "." else f"{relative_dir}/"
+            dir_names[:] = [name for name in dir_names if not self.is_ignored(prefix + name)]
+            for name in file_names:
+                path = prefix + name
+                if self.is_ignored(path):
+                    continue
+                try:
+                    path_stat = os.stat(os.path.join(dir_path, name))
+                except OSError:
+                    continue
+                snapshot[path] = (path_stat.st_mtime_ns, path_stat.st_size, path_stat.st_mode)
+        return snapshot
+
+
+class _InotifyBackend:
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        return sys.platform.startswith("linux") and hasattr(cls._load_libc(), "inotify_init1")
+
+    @staticmethod
+    def _load_libc():
+        return ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+
+    def __init__(self, root: Path, is_ignored: Callable[[str], bool]):
+        self.root = root
+        self.is_ignored = is_ignored
+        self._libc = self._load_libc()
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches = {}
+        try:
+            self._watch_tree("")
+        except OSError:
+            self.close()
+            raise
+
+    def read(self, timeout) -> Optional[Set[str]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changes = set()
+        try:
+            data = os.read(self._fd, consts.WATCH_INOTIFY_BUFFER_SIZE_BYTES)
+        except BlockingIOError:
+            return changes
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+            offset += name_length
+            if mask & self.IN_Q_OVERFLOW:
+                logging.debug("Too many changes to track in '%s'.", self.root)
+                return None
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = f"{parent}{name}"
+            if self.is_ignored(path):
+                continue
+            changes.add(path)
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                # Files created in the new folder before it is watched are reported as changed too.
+                changes.update(self._watch_tree(path))
+        return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_tree(self, relative_dir: str) -> Set[str]:
+        paths = set()
+        for dir_path, dir_names, file_names in os.walk(self.root.joinpath(relative_dir)):
+            relative_path = Path(dir_path).relative_to(self.root).as_posix()
+            prefix = "" if relative_path == "." else f"{relative_path}/"
+            dir_names[:] = [name for name in dir_names if not self.is_ignored(prefix + name)]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), self.WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Could not watch '{dir_path}'")
+            self._watches[wd] = prefix
+            paths.update(prefix + name for name in file_names if not self.is_ignored(prefix + name))
+        return paths
@@ -1,19 +1,28 @@
-import json
 import jsonschema
 
+import gdk.common.utils as utils
+from gdk.common.CaseInsensitive import CaseInsensitiveDict
+
 
 class RecipeValidator:
     def __init__(self, schema_file):
         self._setup_schema(schema_file)
 
     def validate_recipe(self, recipe):
-        processed_recipe = self._keys_to_lower(recipe)
-        jsonschema.validate(instance=processed_recipe, schema=self.schema, cls=jsonschema.validators.Draft7Validator)
+        """
+        Validates the recipe against the schema, whose keys are all lowercase. A CaseInsensitiveDict is validated through
+        its shared normalized form, and any other dictionary is converted to lowercase keys first.
+        """
+        if isinstance(recipe, CaseInsensitiveDict):
+            processed_recipe = recipe.normalized()
+        else:
+            processed_recipe = self._keys_to_lower(recipe)
+        utils.validate_with_schema(processed_recipe, self.schema_file, jsonschema.Draft7Validator)
 
     def _setup_schema(self, schema_file):
-        with open(schema_file, 'r') as file:
-            self.schema = json.loads(file.read())
-            jsonschema.Draft7Validator.check_schema(schema=self.schema)
+        # The schema is checked here, so that an invalid schema fails before any recipe is validated.
+        self.schema_file = schema_file
+        self.schema = utils.get_schema_validator(schema_file, jsonschema.Draft7Validator).schema
 
     def _keys_to_lower(self, obj):
         if type(obj) is dict:
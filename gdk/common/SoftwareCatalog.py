@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+import gdk.common.consts as consts
+import gdk.common.exceptions.error_messages as error_messages
+import gdk.common.utils as utils
+
+
+class SoftwareCatalog:
+    """
+    Index of the components listed at a Greengrass Software Catalog URL, cached on disk so that listing, searching and
+    initializing components does not fetch the catalog every time.
+
+    A cached index younger than the TTL is used as it is. An older one is revalidated with a conditional request using
+    its ETag, and is still used when the catalog cannot be reached.
+    """
+
+    def __init__(self, url: str, refresh: bool = False, cache_dir: Optional[Path] = None):
+        """
+        Parameters
+        ----------
+            url(str): URL of the catalog listing, such as templates.json or community-components.json.
+            refresh(bool): Fetch the catalog listing even if the cached index is fresh.
+            cache_dir(Path): Directory in which the index is cached. Defaults to the catalog directory under ~/.gdk.
+        """
+        self.url = url
+        self.refresh = refresh
+        self.cache_dir = cache_dir or utils.get_gdk_user_dir().joinpath(consts.catalog_cache_dir_name)
+        self._served_from_cache = False
+
+    def get_components(self):
+        """
+        Returns the catalog listing as a dictionary of component names to their download URLs.
+        """
+        cached_index = self._read_cached_index()
+        if cached_index and not self.refresh and time.time() - cached_index["fetched_at"] < consts.CATALOG_CACHE_TTL_SECONDS:
+            logging.debug("Using the cached Greengrass Software Catalog index of %s", self.url)
+            self._served_from_cache = True
+            return cached_index["components"]
+        return self._fetch_components(cached_index)
+
+    def search(self, text: str):
+        """
+        Returns the components whose names contain the given text, ignoring case.
+        """
+        components = self.get_components()
+        return {name: components[name] for name in components if text.lower() in name.lower()}
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        Returns the download URL of the component with the given name, or None if the catalog does not list it. A cached
+        index that does not list the component is refreshed before giving up, in case the component was added since.
+        """
+        components = self.get_components()
+        if name not in components and self._served_from_cache:
+            logging.debug("Component '%s' is not in the cached catalog index. Refreshing the index.", name)
+            self.refresh = True
+            components = self.get_components()
+        return components.get(name) if isinstance(components, dict) else None
+
+    def _fetch_components(self, cached_index: Optional[dict]):
+        self._served_from_cache = False
+        try:
+            if cached_index and cached_index.get("etag") and not self.refresh:
+                response = requests.get(self.url, timeout=30, headers={"If-None-Match": cached_index["etag"]})
+            else:
+                response = requests.get(self.url, timeout=30)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if not cached_index:
+                logging.error(error_messages.LISTING_COMPONENTS_FAILED)
+                raise
+            logging.warning("Could not reach Greengrass Software Catalog, using the cached catalog index. Error: %s", e)
+            self._served_from_cache = True
+            return cached_index["components"]
+
+        if response.status_code == 304:
+            self._save_index(cached_index["components"], cached_index["etag"])
+            return cached_index["components"]
+        try:
+            response.raise_for_status()
+        except Exception:
+            logging.error(error_messages.LISTING_COMPONENTS_FAILED)
+            raise
+
+        try:
+            components = response.json()
+        except Exception as e:
+            logging.error(e, exc_info=True)
+            return []
+        self._save_index(components, response.headers.get("ETag"))
+        return components
+
+    def _index_file(self) -> Path:
+        return self.cache_dir.joinpath(hashlib.sha256(self.url.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_cached_index(self) -> Optional[dict]:
+        index_file = self._index_file()
+        if not index_file.exists():
+            return None
+        try:
+            with open(index_file, "r", encoding="utf-8") as f:
+                cached_index = json.load(f)
+            if isinstance(cached_index.get("components"), dict) and isinstance(cached_index.get("fetched_at"), (int, float)):
+                return cached_index
+        except (OSError, ValueError) as e:
+            logging.debug("Ignoring the unreadable catalog index '%s'. Error details: %s", index_file, e)
+        return None
+
+    def _save_index(self, components, etag: Optional[str]) -> None:
+        if not isinstance(components, dict):
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached_index = {"url": self.url, "etag": etag, "fetched_at": time.time(), "components": components}
+        index_file = self._index_file()
+        # Written aside and renamed, so that a failed write or a concurrent gdk process never sees half of the index.
+        temp_file = index_file.with_name(f"{index_file.name}.{os.getpid()}")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(cached_index, f)
+        os.replace(temp_file, index_file)
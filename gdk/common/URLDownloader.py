@@ -1,48 +1,395 @@
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Mapping, Optional, Tuple
+import fnmatch
+import hashlib
 import requests
 import logging
+import os
 import zipfile
-from io import BytesIO
 import tempfile
 import shutil
 
+from gdk.common.consts import DOWNLOAD_CHUNK_SIZE_BYTES, DOWNLOAD_MIN_RANGE_SIZE_BYTES
+from gdk.common.DownloadCache import DownloadCache
+
 
 class URLDownloader:
-    def __init__(self, url):
+    def __init__(self, url, parallel_ranges: int = 1, sha256: Optional[str] = None, cache: Optional[DownloadCache] = None):
+        """
+        Parameters
+        ----------
+            url(str): URL of the file to download.
+            parallel_ranges(int): Number of byte ranges to fetch concurrently when the server supports range requests and
+                the file is large enough to be split. Defaults to a single sequential download.
+            sha256(str): Optional hex encoded SHA-256 digest that the downloaded file must match.
+            cache(DownloadCache): Optional download cache. When given, the file is downloaded into the cache only if the
+                cached copy is out of date, and placed at the destination from there.
+        """
         self.url = url
+        self.parallel_ranges = parallel_ranges
+        self.sha256 = sha256
+        self.cache = cache
 
     def download(self, destination: Path):
+        """
+        Downloads the file into a partial file next to the destination and renames it to the destination once its size
+        and checksum are verified.
+
+        When a partial file is left behind by an interrupted download, the download resumes from where it stopped using
+        an HTTP range request, made conditional on the remote file being the one the partial file was downloaded from.
+        With a download cache, the file is downloaded into the cache and linked to the destination.
+        """
         logging.debug("Downloading the content from URL %s to the file %s", self.url, destination.name)
-        download_response = self._get_download_response()
-        # TODO: Write in chunks so as to not overload the memory in case of large files
-        with open(destination, "wb") as file:
-            file.write(download_response.content)
+        if self.cache is None:
+            self._download_to(destination)
+            return
+        self._fetch_into_cache()
+        self.cache.place(self.url, destination)
+
+    def download_and_extract(
+        self, destination: Path, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None
+    ):
+        """
+        Downloads the zip archive and extracts the contents of its top-level folder directly into the destination.
 
-    def download_and_extract(self, destination: Path):
+        Parameters
+        ----------
+            destination(Path): Directory to extract into. It is created if it does not exist.
+            include(list): Glob patterns of the paths, relative to the top-level folder, to extract. Defaults to all paths.
+            exclude(list): Glob patterns of the paths, relative to the top-level folder, to skip.
+        """
         logging.debug("Downloading the content from URL %s to the destination %s", self.url, destination.name)
-        download_response = self._get_download_response()
-        with zipfile.ZipFile(BytesIO(download_response.content)) as zfile:
-            with tempfile.TemporaryDirectory() as tmpdirname:
-                # Extracts the zip file into temporary directory - /some-temp-dir/downloaded-zip-folder/
-                zfile.extractall(tmpdirname)
-                self._create_dir(destination)
-                # Moves the unarchived contents from temporary folder (downloaded-zip-folder) to current directory.
-                for f in Path(tmpdirname).joinpath(zfile.namelist()[0]).iterdir():
-                    shutil.move(str(f), destination)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            if self.cache is None:
+                archive_path = Path(tmpdirname).joinpath("download.zip")
+                self._download_to(archive_path)
+            else:
+                archive_path = self._fetch_into_cache()
+            self._extract(archive_path, destination, include or [], exclude or [])
+
+    def _extract(self, archive_path: Path, destination: Path, include: List[str], exclude: List[str]) -> None:
+        """
+        Extracts the selected entries of the archive into the destination, stripping the top-level folder of the archive
+        from their paths as they are written.
+        """
+        with zipfile.ZipFile(archive_path) as zfile:
+            members = zfile.infolist()
+            # Archive contents are under a single top-level folder - downloaded-zip-folder/ - which is not extracted.
+            top_level_folder = members[0].filename.split("/")[0] + "/" if members else ""
+            self._create_dir(destination)
+            for member in members:
+                relative_path = member.filename[len(top_level_folder):] if member.filename.startswith(top_level_folder) else ""
+                if not relative_path or not self._is_selected(relative_path.rstrip("/"), include, exclude):
+                    continue
+                target = self._get_extract_target(destination, member.filename, relative_path)
+                if member.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zfile.open(member) as source, open(target, "wb") as target_file:
+                    shutil.copyfileobj(source, target_file, DOWNLOAD_CHUNK_SIZE_BYTES)
+
+    def _is_selected(self, relative_path: str, include: List[str], exclude: List[str]) -> bool:
+        if include and not any(fnmatch.fnmatch(relative_path, pattern) for pattern in include):
+            return False
+        return not any(fnmatch.fnmatch(relative_path, pattern) for pattern in exclude)
 
-    def _get_download_response(self) -> requests.Response:
+    def _get_extract_target(self, destination: Path, member_name: str, relative_path: str) -> Path:
         """
-        Returns the response of the download request.
+        Returns the path to extract the archive entry to, making sure that it stays within the destination.
+        """
+        entry_path = PurePosixPath(relative_path)
+        if entry_path.is_absolute() or ".." in entry_path.parts:
+            raise Exception(f"Archive downloaded from {self.url} contains an entry outside its folder: {member_name}")
+        return destination.joinpath(*entry_path.parts)
+
+    def _download_to(self, destination: Path, download_response: Optional[requests.Response] = None) -> Mapping[str, str]:
+        """
+        Downloads the file to the destination and returns the headers of the response that describes it. When the
+        response of an earlier request for the whole file is given, its body is written instead of requesting the file.
+        """
+        part_file = self._part_file(destination)
+        head_response = None
+        if self.parallel_ranges > 1 and download_response is None and not part_file.exists():
+            head_response = self._get_head_response_for_ranged_download()
+        if head_response is not None:
+            total_size = int(head_response.headers["Content-Length"])
+            self._download_ranges(part_file, total_size, head_response.headers)
+            response_headers = head_response.headers
+        else:
+            total_size, response_headers = self._download_stream(part_file, download_response)
+        self._verify_download(part_file, total_size)
+        os.replace(part_file, destination)
+        self._remove_file(self._validator_file(part_file))
+        return response_headers
+
+    def _fetch_into_cache(self) -> Path:
+        """
+        Revalidates the cached copy of the file with a conditional request and downloads the file into the cache only if
+        the cached copy is missing or out of date. The partial file is written under the lock of the cache entry and
+        renamed to the cached file once it is complete. Returns the path of the cached file.
+        """
+        cache_entry = self.cache.get_entry_path(self.url)
+        # Another process fetching the same URL either finishes first, after which the cached copy is current, or waits.
+        with self.cache.lock(self.url):
+            conditional_headers = self.cache.get_conditional_headers(self.url)
+            download_response = None
+            if conditional_headers:
+                download_response = self._revalidate(conditional_headers)
+                if download_response is None:
+                    logging.info("Using the cached download of %s", self.url)
+                    return cache_entry
+            self.cache.save_validators(self.url, self._download_to(cache_entry, download_response))
+        return cache_entry
+
+    def _revalidate(self, conditional_headers: Dict[str, str]) -> Optional[requests.Response]:
+        """
+        Sends the conditional request for the file. Returns the response when it carries a newer file, so that its body
+        is downloaded without requesting the file again. Returns None when the cached copy is current, and also when it
+        could not be revalidated, in which case the cached copy is used as it is.
+        """
+        try:
+            download_response = requests.get(self.url, stream=True, timeout=30, headers=conditional_headers)
+        except Exception as e:
+            logging.warning("Could not check if the cached download of %s is up to date. Error details: %s", self.url, e)
+            return None
+        if download_response.status_code == 200:
+            return download_response
+        download_response.close()
+        if download_response.status_code != 304:
+            logging.warning(
+                "Could not check if the cached download of %s is up to date. The server responded with status %s.",
+                self.url,
+                download_response.status_code,
+            )
+        return None
+
+    def _get_download_response(
+        self, first_byte: Optional[int] = None, last_byte: Optional[int] = None, validator: Optional[str] = None
+    ) -> requests.Response:
+        """
+        Returns the response of the download request. When the first byte is given, only the range of bytes starting at
+        it is requested. When a validator is given too, the range is only sent if the remote file still matches it, and
+        the whole file is sent otherwise.
         """
         try:
-            download_response = requests.get(self.url, stream=True, timeout=30)
-            if download_response.status_code != 200:
+            if first_byte is None:
+                download_response = requests.get(self.url, stream=True, timeout=30)
+            else:
+                headers = {"Range": f"bytes={first_byte}-{'' if last_byte is None else last_byte}"}
+                if validator is not None:
+                    headers["If-Range"] = validator
+                download_response = requests.get(self.url, stream=True, timeout=30, headers=headers)
+            if download_response.status_code not in (200, 206):
                 download_response.raise_for_status()
         except Exception:
             logging.error("Failed to download the file from %s", self.url)
             raise
         return download_response
 
+    def _download_stream(
+        self, part_file: Path, download_response: Optional[requests.Response] = None
+    ) -> Tuple[Optional[int], Mapping[str, str]]:
+        """
+        Downloads the file with a single request, appending to the partial file if there is one and the server honours
+        the range request. A given response for the whole file is written instead. Returns the total size of the file if
+        the server reported it, along with the response headers.
+        """
+        if download_response is None:
+            download_response = self._get_stream_response(part_file)
+
+        if download_response.status_code == 206:
+            self._write_chunks(download_response, part_file, "ab")
+            return self._size_from_content_range(download_response), download_response.headers
+        # The server sent the whole file, either because the remote file changed or because it ignores ranges, so any
+        # partial content is discarded. The partial file is emptied before the new validator is saved, so that the
+        # validator never describes content it was not downloaded with.
+        self._remove_file(self._validator_file(part_file))
+        part_file.write_bytes(b"")
+        self._save_validator(part_file, download_response.headers)
+        self._write_chunks(download_response, part_file, "ab")
+        return self._size_from_content_length(download_response), download_response.headers
+
+    def _get_stream_response(self, part_file: Path) -> requests.Response:
+        offset = part_file.stat().st_size if part_file.exists() else 0
+        validator = self._read_validator(part_file)
+        if offset and validator is None:
+            logging.debug("Discarding the partial download of %s as it cannot be validated against the remote file", self.url)
+            offset = 0
+        if not offset:
+            return self._get_download_response()
+        logging.info("Resuming the download from %s at byte %s", self.url, offset)
+        return self._get_resumed_download_response(offset, validator)
+
+    def _get_resumed_download_response(self, offset: int, validator: str) -> requests.Response:
+        """
+        Requests the rest of the file after the given offset. Falls back to downloading the whole file when the server
+        cannot satisfy the range, which happens when the partial file is no longer a prefix of the remote file.
+        """
+        try:
+            return self._get_download_response(offset, validator=validator)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 416:
+                raise
+        logging.debug("Discarding the partial download of %s as the server cannot resume it", self.url)
+        return self._get_download_response()
+
+    def _get_head_response_for_ranged_download(self) -> Optional[requests.Response]:
+        """
+        Returns the response of a HEAD request for the file if the server accepts range requests and the file is large
+        enough to be split into the configured number of ranges. Returns None otherwise, in which case the file is
+        downloaded with a single request.
+        """
+        try:
+            head_response = requests.head(self.url, allow_redirects=True, timeout=30)
+            head_response.raise_for_status()
+            accepts_ranges = head_response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            size = int(head_response.headers.get("Content-Length", "0"))
+        except Exception as e:
+            logging.debug("Could not determine if %s supports range requests. Error details: %s", self.url, e)
+            return None
+        if not accepts_ranges or size < self.parallel_ranges * DOWNLOAD_MIN_RANGE_SIZE_BYTES:
+            return None
+        return head_response
+
+    def _download_ranges(self, part_file: Path, total_size: int, head_headers: Mapping[str, str]) -> None:
+        """
+        Downloads the ranges of the file concurrently, each into its own segment file, and joins the segments into the
+        partial file. Segments left behind by an interrupted download are resumed from where they stopped, as long as
+        the remote file still has the validator they were downloaded with. They are discarded otherwise.
+        """
+        ranges = self._split_into_ranges(total_size)
+        segments = [part_file.with_name(f"{part_file.name}{index}") for index in range(len(ranges))]
+        validator = self._get_validator(head_headers)
+        if validator is None or validator != self._read_validator(part_file):
+            for segment in segments:
+                self._remove_file(segment)
+            self._save_validator(part_file, head_headers)
+        logging.debug("Downloading %s in %s ranges", self.url, len(ranges))
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(self._download_range, segment, first_byte, last_byte, validator)
+                for segment, (first_byte, last_byte) in zip(segments, ranges)
+            ]
+            for future in futures:
+                future.result()
+
+        with open(part_file, "wb") as file:
+            for segment in segments:
+                with open(segment, "rb") as segment_file:
+                    shutil.copyfileobj(segment_file, file, DOWNLOAD_CHUNK_SIZE_BYTES)
+        for segment in segments:
+            segment.unlink()
+
+    def _split_into_ranges(self, total_size: int) -> List[Tuple[int, int]]:
+        range_size = -(-total_size // self.parallel_ranges)
+        return [
+            (first_byte, min(first_byte + range_size, total_size) - 1) for first_byte in range(0, total_size, range_size)
+        ]
+
+    def _download_range(self, segment: Path, first_byte: int, last_byte: int, validator: Optional[str]) -> None:
+        range_size = last_byte - first_byte + 1
+        offset = segment.stat().st_size if segment.exists() else 0
+        if offset == range_size:
+            return
+        if offset > range_size:
+            segment.unlink()
+            offset = 0
+        download_response = self._get_download_response(first_byte + offset, last_byte, validator)
+        if download_response.status_code != 206:
+            download_response.close()
+            # The remote file changed since the download started, so the bytes of the segment are no longer valid.
+            self._remove_file(segment)
+            raise Exception(f"Server did not return the requested range of bytes while downloading {self.url}")
+        self._write_chunks(download_response, segment, "ab")
+
+    def _write_chunks(self, download_response: requests.Response, file_path: Path, mode: str) -> None:
+        """
+        Writes the response body to the file in fixed size chunks, so that memory use does not grow with the size of the
+        download. Whatever was written before a failure is kept so that the download can be resumed.
+        """
+        try:
+            with open(file_path, mode) as file:
+                for chunk in download_response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE_BYTES):
+                    if chunk:
+                        file.write(chunk)
+        except Exception:
+            logging.error("Failed to write the content downloaded from %s to the file %s", self.url, file_path)
+            raise
+        finally:
+            download_response.close()
+
+    def _verify_download(self, part_file: Path, expected_size: Optional[int]) -> None:
+        """
+        Verifies the size of the downloaded file against the size reported by the server and its digest against the
+        expected SHA-256 digest, if one is given. Partial files that can never be completed are removed.
+        """
+        actual_size = part_file.stat().st_size
+        if expected_size is not None and actual_size != expected_size:
+            if actual_size > expected_size:
+                part_file.unlink()
+                self._remove_file(self._validator_file(part_file))
+            raise Exception(
+                f"Download of {self.url} is incomplete. Expected {expected_size} bytes but received {actual_size} bytes."
+            )
+        if self.sha256 is not None:
+            file_hash = hashlib.sha256()
+            with open(part_file, "rb") as file:
+                for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE_BYTES), b""):
+                    file_hash.update(chunk)
+            if file_hash.hexdigest() != self.sha256.lower():
+                part_file.unlink()
+                self._remove_file(self._validator_file(part_file))
+                raise Exception(f"Checksum of the file downloaded from {self.url} does not match the expected checksum.")
+
+    def _size_from_content_length(self, download_response: requests.Response) -> Optional[int]:
+        # Content-Length is the size of the encoded body, which differs from the size on disk when it is compressed.
+        if download_response.headers.get("Content-Encoding") or not download_response.headers.get("Content-Length"):
+            return None
+        return int(download_response.headers["Content-Length"])
+
+    def _size_from_content_range(self, download_response: requests.Response) -> Optional[int]:
+        # Content-Range: bytes <first>-<last>/<total>
+        total = download_response.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+
+    def _part_file(self, destination: Path) -> Path:
+        return destination.with_name(destination.name + ".part")
+
+    def _validator_file(self, part_file: Path) -> Path:
+        return part_file.with_name(part_file.name + ".validator")
+
+    def _get_validator(self, response_headers: Mapping[str, str]) -> Optional[str]:
+        # If-Range only accepts a strong ETag or a Last-Modified date, as a weak ETag does not guarantee identical bytes.
+        etag = response_headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return response_headers.get("Last-Modified")
+
+    def _save_validator(self, part_file: Path, response_headers: Mapping[str, str]) -> None:
+        """
+        Records the validator of the remote file next to the partial file, so that an interrupted download is only
+        resumed if the remote file has not changed since.
+        """
+        validator = self._get_validator(response_headers)
+        if validator is None:
+            self._remove_file(self._validator_file(part_file))
+            return
+        self._validator_file(part_file).write_text(validator, encoding="utf-8")
+
+    def _read_validator(self, part_file: Path) -> Optional[str]:
+        try:
+            return self._validator_file(part_file).read_text(encoding="utf-8") or None
+        except OSError:
+            return None
+
+    def _remove_file(self, file_path: Path) -> None:
+        try:
+            file_path.unlink()
+        except FileNotFoundError:
+            pass
+
     def _create_dir(self, project_dir: Path):
         """
         Creates a new directory if it does not exist already.
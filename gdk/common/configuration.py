@@ -52,10 +52,8 @@ def validate_configuration(data):
     """
 
     config_schema_file = utils.get_static_file_path(consts.config_schema_file)
-    with open(config_schema_file, "r") as schemaFile:
-        schema = json.loads(schemaFile.read())
     logging.debug("Validating the configuration file.")
-    jsonschema.validate(data, schema)
+    utils.validate_with_schema(data, config_schema_file)
 
 
 def validate_cli_version(config_data):
@@ -17,12 +17,67 @@ arg_parameters = [
 # MAX RECIPE FILE SIZE
 MAX_RECIPE_FILE_SIZE_BYTES = 16000
 
+# ZIP BUILD
+ZIP_REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+ZIP_COMPRESS_LEVEL = 6
+ZIP_COPY_CHUNK_SIZE_BYTES = 1024 * 1024
+ZIP64_FORCE_THRESHOLD_BYTES = 2 * 1024 * 1024 * 1024
+
+# BUILD WATCH MODE
+WATCH_DEBOUNCE_SECONDS = 0.5
+WATCH_POLL_INTERVAL_SECONDS = 1.0
+WATCH_INOTIFY_BUFFER_SIZE_BYTES = 64 * 1024
+
+# DAEMON
+DAEMON_IDLE_TIMEOUT_SECONDS = 30 * 60
+DAEMON_CONNECT_TIMEOUT_SECONDS = 1.0
+DAEMON_REQUEST_TIMEOUT_SECONDS = 10.0
+DAEMON_OUTPUT_CHUNK_SIZE_BYTES = 64 * 1024
+DAEMON_OUTPUT_DRAIN_TIMEOUT_SECONDS = 5.0
+# Commands that read no input from the terminal and finish on their own, so they can run in the daemon.
+DAEMON_COMMANDS = (("component", "build"), ("component", "publish"), ("component", "list"))
+
+# DOWNLOADS
+DOWNLOAD_CHUNK_SIZE_BYTES = 1024 * 1024
+DOWNLOAD_MIN_RANGE_SIZE_BYTES = 8 * 1024 * 1024
+NUCLEUS_DOWNLOAD_PARALLEL_RANGES = 4
+
+# SOFTWARE CATALOG
+CATALOG_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# AWS CLIENTS
+AWS_CLIENT_MAX_POOL_CONNECTIONS = 32
+AWS_CLIENT_MAX_ATTEMPTS = 10
+ACCOUNT_CACHE_TTL_SECONDS = 12 * 60 * 60
+
+# COMPONENT VERSION CREATION
+CREATE_COMPONENT_VERSION_RATE_PER_SECOND = 2.0
+CREATE_COMPONENT_VERSION_BURST = 4
+CREATE_COMPONENT_VERSION_MAX_CONCURRENCY = 4
+CREATE_COMPONENT_VERSION_MAX_ATTEMPTS = 8
+CREATE_COMPONENT_VERSION_BASE_DELAY_SECONDS = 0.5
+CREATE_COMPONENT_VERSION_MAX_DELAY_SECONDS = 20
+
+# PUBLISH
+PUBLISH_ARTIFACT_WORKERS = 4
+
+# BUILD
+ARTIFACT_COPY_CHUNK_SIZE_BYTES = 1024 * 1024
+ARTIFACT_HASH_CHUNK_SIZE_BYTES = 4 * 1024 * 1024
+ARTIFACT_HASH_MAX_WORKERS = 8
+
 # FILES
 config_schema_file = "config_schema.json"
 recipe_schema_file = "recipe_schema.json"
 cli_model_file = "cli_model.json"
 cli_project_config_file = "gdk-config.json"
 greengrass_build_dir = "greengrass-build"
+build_manifest_file = "build-manifest.json"
+gdk_user_dir_name = ".gdk"
+download_cache_dir_name = "downloads"
+catalog_cache_dir_name = "catalog"
+account_cache_dir_name = "accounts"
+daemon_socket_file_name = "daemon.sock"
 E2E_TESTS_DIR_NAME = "gg-e2e-tests"
 
 # URLS
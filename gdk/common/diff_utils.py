@@ -1,13 +1,111 @@
-from typing import Any, Dict, List, Union
 import re
+from typing import Any, Dict, List, Union
+
+
+class PathMatcher:
+    """Matches the paths excluded from a diff.
+
+    The exact paths are kept in a set and the regex paths are compiled once into a single pattern, so that matching a path
+    costs one lookup and at most one regex match, however many exclusions are given. Results are cached per path.
+    """
+
+    def __init__(self, exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None):
+        self._paths = frozenset(exclude_paths or ())
+        self._pattern = None
+        if exclude_regex_paths:
+            self._pattern = re.compile("|".join(f"(?:{pattern})" for pattern in exclude_regex_paths))
+        self._matches = {}
+
+    def match(self, path: str) -> bool:
+        matched = self._matches.get(path)
+        if matched is None:
+            matched = path in self._paths or bool(self._pattern and self._pattern.match(path))
+            self._matches[path] = matched
+        return matched
+
+
+class DiffEngine:
+    """Compares recipe-like trees of dicts, lists and plain values.
+
+    Subtrees are first compared with the native equality of dicts and lists, which runs in C and stops at the first
+    difference, and only subtrees that differ are walked key by key. Equal subtrees are therefore skipped without building
+    any of their paths.
+
+    has_changes() stops at the first difference that is not excluded. diff() walks all the differences and returns the
+    full report of deep_diff(). An engine holds no state about the trees it compares, so one engine can be reused for
+    any number of comparisons with the same exclusions.
+    """
+
+    def __init__(self, exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None):
+        self.matcher = PathMatcher(exclude_paths, exclude_regex_paths)
 
-def deep_diff(old: Union[Dict, List], new: Union[Dict, List], exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None) -> Dict[str, Any]:
+    def has_changes(self, old: Any, new: Any) -> bool:
+        """Returns True if the trees have any difference outside the excluded paths."""
+        return self._has_changes(old, new, "root")
+
+    def diff(self, old: Any, new: Any) -> Dict[str, Any]:
+        """Returns the differences between the trees in DeepDiff format. See deep_diff()."""
+        result = {
+            "dictionary_item_added": [],
+            "excluded_dictionary_item_added": [],
+            "dictionary_item_removed": [],
+            "excluded_dictionary_item_removed": [],
+            "values_changed": {},
+            "excluded_values_changed": {}
+        }
+        self._diff(old, new, "root", result)
+        return result
+
+    def _children(self, old: Any, new: Any):
+        # Lists are compared like dictionaries with their indices as keys.
+        if isinstance(old, list):
+            return {str(i): value for i, value in enumerate(old)}, {str(i): value for i, value in enumerate(new)}
+        return old, new
+
+    def _has_changes(self, old: Any, new: Any, path: str) -> bool:
+        if old is new or old == new:
+            return False
+        if not _is_container_pair(old, new):
+            return not self.matcher.match(path)
+        old, new = self._children(old, new)
+        for key in new.keys() - old.keys():
+            if not self.matcher.match(f"{path}['{key}']"):
+                return True
+        for key in old.keys() - new.keys():
+            if not self.matcher.match(f"{path}['{key}']"):
+                return True
+        return any(self._has_changes(old[key], new[key], f"{path}['{key}']") for key in old.keys() & new.keys())
+
+    def _diff(self, old: Any, new: Any, path: str, result: Dict) -> None:
+        if old is new or old == new:
+            return
+        if not _is_container_pair(old, new):
+            changes = "excluded_values_changed" if self.matcher.match(path) else "values_changed"
+            result[changes][path] = {"old_value": old, "new_value": new}
+            return
+        old, new = self._children(old, new)
+        for key in new.keys() - old.keys():
+            current_path = f"{path}['{key}']"
+            changes = "excluded_dictionary_item_added" if self.matcher.match(current_path) else "dictionary_item_added"
+            result[changes].append(current_path)
+        for key in old.keys() - new.keys():
+            current_path = f"{path}['{key}']"
+            changes = "excluded_dictionary_item_removed" if self.matcher.match(current_path) else "dictionary_item_removed"
+            result[changes].append(current_path)
+        for key in old.keys() & new.keys():
+            self._diff(old[key], new[key], f"{path}['{key}']", result)
+
+
+def deep_diff(old: Union[Dict, List], new: Union[Dict, List], exclude_paths: List[str] = None,
+              exclude_regex_paths: List[str] = None) -> Dict[str, Any]:
     """Compare two objects (dicts or lists) recursively and return their differences.
-    
+
     Args:
         old: Original object (dict or list)
         new: New object to compare against (dict or list)
-        
+        exclude_paths: Paths whose differences are reported as excluded, like "root['a']['b']"
+        exclude_regex_paths: Regular expressions matching the paths whose differences are reported as excluded
+
     Returns:
         Dict containing differences in DeepDiff format with keys:
         - dictionary_item_added
@@ -17,74 +115,17 @@ def deep_diff(old: Union[Dict, List], new: Union[Dict, List], exclude_paths: Lis
         - values_changed
         - excluded_values_changed
     """
-    result = {
-        "dictionary_item_added": [],
-        "excluded_dictionary_item_added": [],
-        "dictionary_item_removed": [],
-        "excluded_dictionary_item_removed": [],
-        "values_changed": {},
-        "excluded_values_changed": {}
-    }
-
-    if isinstance(old, dict) and isinstance(new, dict):
-        _compare_dicts(old, new, "root", result, exclude_paths, exclude_regex_paths)
-    elif isinstance(old, list) and isinstance(new, list):
-        _compare_lists(old, new, "root", result, exclude_paths, exclude_regex_paths)
-    else:
-        if old != new and not _should_exclude("root", exclude_paths, exclude_regex_paths):
-            result["values_changed"]["root"] = {"old_value": old, "new_value": new}
-        elif old != new and _should_exclude("root", exclude_paths, exclude_regex_paths):
-            result["excluded_values_changed"]["root"] = {"old_value": old, "new_value": new}
-    
-    return result
-
-def _should_exclude(path: str, exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None) -> bool:
-    """Check if the current path should be excluded from comparison."""
-    if exclude_paths and path in exclude_paths:
-        return True
-    if exclude_regex_paths:
-        for pattern in exclude_regex_paths:
-            return any(re.match(pattern, path) for pattern in exclude_regex_paths)
-    return False
-
-def _compare_dicts(old: Dict, new: Dict, path: str, result: Dict, exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None) -> None:
-    """Compare two dictionaries recursively and track differences."""
-    old_keys = set(old.keys())
-    new_keys = set(new.keys())
-    
-    # Find added and removed items
-    for key in new_keys - old_keys:
-        if not _should_exclude(f"{path}['{key}']", exclude_paths, exclude_regex_paths):
-            result["dictionary_item_added"].append(f"{path}['{key}']" if path else f"['{key}']")
-        else:
-            result["excluded_dictionary_item_added"].append(f"{path}['{key}']" if path else f"['{key}']")
-    for key in old_keys - new_keys:
-        if not _should_exclude(f"{path}['{key}']", exclude_paths, exclude_regex_paths):
-            result["dictionary_item_removed"].append(f"{path}['{key}']" if path else f"['{key}']")
-        else:
-            result["excluded_dictionary_item_removed"].append(f"{path}['{key}']" if path else f"['{key}']")
-        
-    # Compare common keys (values_changed)
-    for key in old_keys & new_keys:
-        current_path = f"{path}['{key}']" if path else f"['{key}']"
-        if isinstance(old[key], dict) and isinstance(new[key], dict):
-            _compare_dicts(old[key], new[key], current_path, result, exclude_paths, exclude_regex_paths)
-        elif isinstance(old[key], list) and isinstance(new[key], list):
-            _compare_lists(old[key], new[key], current_path, result, exclude_paths, exclude_regex_paths)
-        elif old[key] != new[key] and not _should_exclude(f"{path}['{key}']", exclude_paths, exclude_regex_paths):
-            result["values_changed"][current_path] = {
-                "old_value": old[key],
-                "new_value": new[key]
-            }
-        elif old[key] != new[key] and _should_exclude(f"{path}['{key}']", exclude_paths, exclude_regex_paths):
-            result["excluded_values_changed"][current_path] = {
-                "old_value": old[key],
-                "new_value": new[key]
-            }
-
-def _compare_lists(old: List, new: List, path: str, result: Dict, exclude_paths: List[str] = None, exclude_regex_paths: List[str] = None) -> None:
-    """Compare two lists recursively and track differences."""
-    # For simplicity, treat lists like dictionaries with numeric keys
-    old_dict = {str(i): val for i, val in enumerate(old)}
-    new_dict = {str(i): val for i, val in enumerate(new)}
-    _compare_dicts(old_dict, new_dict, path, result, exclude_paths, exclude_regex_paths)
\ No newline at end of file
+    return DiffEngine(exclude_paths, exclude_regex_paths).diff(old, new)
+
+
+def has_changes(old: Union[Dict, List], new: Union[Dict, List], exclude_paths: List[str] = None,
+                exclude_regex_paths: List[str] = None) -> bool:
+    """Return True if deep_diff() would report any added, removed or changed item that is not excluded.
+
+    Unlike deep_diff(), the comparison stops at the first such difference.
+    """
+    return DiffEngine(exclude_paths, exclude_regex_paths).has_changes(old, new)
+
+
+def _is_container_pair(old: Any, new: Any) -> bool:
+    return (isinstance(old, dict) and isinstance(new, dict)) or (isinstance(old, list) and isinstance(new, list))
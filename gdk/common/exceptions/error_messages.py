@@ -67,3 +67,11 @@ CONFIG_UPDATE_WITH_INVALID_ARGS = (
     "Could not start the prompter as the command arguments are invalid. Please supply `--component`"
     " as an argument to the update command.\nTry `gdk config update --help`"
 )
+
+# DAEMON COMMAND
+DAEMON_NOT_SUPPORTED = "Could not start the gdk daemon as Unix domain sockets are not supported on this platform."
+DAEMON_ALREADY_RUNNING = "Could not start the gdk daemon as another gdk daemon is already listening on '{}'."
+DAEMON_IDLE_TIMEOUT_INVALID = (
+    "Could not start the gdk daemon as the idle timeout '{}' is not a positive number of seconds.\n"
+    "Try `gdk daemon start --help`"
+)
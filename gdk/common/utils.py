@@ -1,14 +1,21 @@
 import hashlib
+import json
 import base64
 import logging
+import os
+import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import jsonschema
 import requests
 from packaging.version import Version
 
 import gdk
 import gdk._version as version
+import gdk.common.consts as consts
 from gdk.common.consts import MAX_RECIPE_FILE_SIZE_BYTES
 
 
@@ -149,22 +156,141 @@ def get_current_directory() -> Path:
     return Path(".").resolve()
 
 
+def get_gdk_user_dir() -> Path:
+    """
+    Returns the user level directory in which GDK keeps the state shared by all projects, such as cached downloads.
+    """
+    return Path.home().joinpath(consts.gdk_user_dir_name)
+
+
 def is_recipe_size_valid(file_path):
     file_size = Path(file_path).stat().st_size
     return file_size <= MAX_RECIPE_FILE_SIZE_BYTES, file_size
 
 
+def compile_glob(pattern):
+    """
+    Compiles a glob pattern of relative posix paths into a regex, where '**/' matches any number of folders and '*' and
+    '?' do not match '/'.
+    """
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex, i = regex + "(?:.*/)?", i + 3
+        elif pattern.startswith("**", i):
+            regex, i = regex + ".*", i + 2
+        elif pattern[i] == "*":
+            regex, i = regex + "[^/]*", i + 1
+        elif pattern[i] == "?":
+            regex, i = regex + "[^/]", i + 1
+        else:
+            regex, i = regex + re.escape(pattern[i]), i + 1
+    return re.compile(regex + r"\Z")
+
+
+_schema_validators = {}
+_schema_validators_lock = threading.Lock()
+
+
+def get_schema_validator(schema_file, validator_class=None):
+    """
+    Returns a validator of the JSON schema file. The schema is read and checked once per process and its validator is
+    reused as long as the file is unchanged.
+
+    Raises SchemaError if the schema is invalid.
+
+    Parameters
+    ----------
+        schema_file(Path): Path of the JSON schema file.
+        validator_class(type): jsonschema validator class. Defaults to the class of the schema's draft.
+    """
+    schema_file = Path(schema_file).resolve()
+    stat = schema_file.stat()
+    key = (str(schema_file), stat.st_mtime_ns, stat.st_size, validator_class)
+    with _schema_validators_lock:
+        validator = _schema_validators.get(key)
+    if validator is None:
+        with open(schema_file, "r") as f:
+            schema = json.loads(f.read())
+        cls = validator_class or jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+        with _schema_validators_lock:
+            _schema_validators[key] = validator
+    return validator
+
+
+def validate_with_schema(instance, schema_file, validator_class=None):
+    """
+    Validates the instance against the JSON schema file like jsonschema.validate(), with the cached validator of the
+    schema.
+
+    Raises ValidationError with the most relevant error if the instance is invalid.
+    """
+    error = jsonschema.exceptions.best_match(get_schema_validator(schema_file, validator_class).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def is_recipe_data_size_valid(data):
+    data_size = len(data)
+    return data_size <= MAX_RECIPE_FILE_SIZE_BYTES, data_size
+
+
 def convertToLowercase(value):
     return str.lower(value)
 
 
 def artifact_encoded_hash(file_path):
-    with open(file_path, "rb") as f:
-        file_hash = hashlib.sha256()
-        chunk = f.read(4096)
+    file_hash = hashlib.sha256()
+    # A large reusable buffer keeps the number of reads low, and hashlib releases the GIL while hashing it.
+    buffer = bytearray(consts.ARTIFACT_HASH_CHUNK_SIZE_BYTES)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        size = f.readinto(buffer)
+        while size:
+            file_hash.update(view[:size])
+            size = f.readinto(buffer)
+    return base64.b64encode(file_hash.digest()).decode("utf-8")
+
+
+def hash_artifacts(file_paths) -> dict:
+    """
+    Computes the encoded SHA-256 digests of the files concurrently.
+
+    Parameters
+    ----------
+        file_paths(list): Paths of the files to hash.
+
+    Returns
+    -------
+        digests(dict): Encoded digest of each file, by its path.
+    """
+    file_paths = list(dict.fromkeys(file_paths))
+    max_workers = min(len(file_paths), os.cpu_count() or 1, consts.ARTIFACT_HASH_MAX_WORKERS)
+    if max_workers <= 1:
+        return {file_path: artifact_encoded_hash(file_path) for file_path in file_paths}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(file_paths, executor.map(artifact_encoded_hash, file_paths)))
+
+
+def copy_artifact_with_hash(file_path, target_dir) -> str:
+    """
+    Copies the file into the target directory like shutil.copy and computes its encoded SHA-256 digest in the same pass,
+    so that the artifact is read only once.
+
+    Returns the encoded digest of the copied file.
+    """
+    target_file = Path(target_dir).joinpath(Path(file_path).name)
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as source, open(target_file, "wb") as target:
+        chunk = source.read(consts.ARTIFACT_COPY_CHUNK_SIZE_BYTES)
         while chunk:
             file_hash.update(chunk)
-            chunk = f.read(4096)
+            target.write(chunk)
+            chunk = source.read(consts.ARTIFACT_COPY_CHUNK_SIZE_BYTES)
+    shutil.copymode(file_path, target_file)
     return base64.b64encode(file_hash.digest()).decode("utf-8")
 
 
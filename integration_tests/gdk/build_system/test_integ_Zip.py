@@ -0,0 +1,76 @@
+import logging
+import os
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from gdk.build_system.Zip import Zip
+
+# The stress benchmark writes multi-GB sparse files and reads them back, so it only runs when it is asked for.
+STRESS_ENV_KEY = "GDK_ZIP_STRESS"
+LARGE_FILE_SIZE_BYTES = int(os.environ.get("GDK_ZIP_STRESS_FILE_SIZE_BYTES", 4 * 1024 * 1024 * 1024 + 1024 * 1024))
+MANY_ENTRIES = 70000
+MAX_TRACED_MEMORY_BYTES = 64 * 1024 * 1024
+
+stress = pytest.mark.skipif(
+    os.environ.get(STRESS_ENV_KEY, "false").lower() != "true", reason=f"Set {STRESS_ENV_KEY}=true to run the benchmark."
+)
+
+
+@stress
+class ZipStressIntegTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, tmp_path):
+        self.tmp_path = tmp_path
+        self.root_dir = tmp_path.joinpath("component")
+        self.root_dir.mkdir()
+
+    def test_GIVEN_file_larger_than_4GB_WHEN_create_archive_THEN_archive_with_zip64_and_flat_memory(self):
+        weights = self.root_dir.joinpath("model", "weights.bin")
+        weights.parent.mkdir()
+        with open(weights, "wb") as f:
+            # Sparse file: only the marker at the end takes space on disk.
+            f.truncate(LARGE_FILE_SIZE_BYTES - 4)
+            f.seek(LARGE_FILE_SIZE_BYTES - 4)
+            f.write(b"last")
+
+        archive_path, seconds, peak = self._create_archive()
+
+        with zipfile.ZipFile(archive_path) as archive:
+            info = archive.getinfo("model/weights.bin")
+            assert info.file_size == LARGE_FILE_SIZE_BYTES
+            with archive.open(info) as f:
+                f.seek(LARGE_FILE_SIZE_BYTES - 4)
+                assert f.read() == b"last"
+        assert peak < MAX_TRACED_MEMORY_BYTES
+        logging.info(
+            "Archived %d bytes in %.1f seconds (%.0f MB/s), peak traced memory %.1f MB, archive size %d bytes.",
+            LARGE_FILE_SIZE_BYTES, seconds, LARGE_FILE_SIZE_BYTES / seconds / 1e6, peak / 1e6, archive_path.stat().st_size,
+        )
+
+    def test_GIVEN_more_than_65535_entries_WHEN_create_archive_THEN_archive_all_entries(self):
+        for i in range(MANY_ENTRIES):
+            self.root_dir.joinpath(f"file-{i:05d}.txt").write_bytes(b"%d" % i)
+
+        archive_path, seconds, peak = self._create_archive()
+
+        with zipfile.ZipFile(archive_path) as archive:
+            names = archive.namelist()
+            assert len(names) == MANY_ENTRIES
+            assert archive.read(names[-1]) == b"%d" % (MANY_ENTRIES - 1)
+        logging.info("Archived %d entries in %.1f seconds, peak traced memory %.1f MB.", MANY_ENTRIES, seconds, peak / 1e6)
+
+    def _create_archive(self):
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            archive_path = Zip().create_archive(Path(self.tmp_path).joinpath("component"), self.root_dir, {})
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return archive_path, seconds, peak
@@ -3,7 +3,12 @@ import pytest
 from pathlib import Path
 import os
 from gdk.common.URLDownloader import URLDownloader
+from gdk.common.consts import DOWNLOAD_CHUNK_SIZE_BYTES
+from gdk.common.DownloadCache import DownloadCache
 import requests
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
 class URLDownloaderIntegTest(TestCase):
@@ -31,3 +36,107 @@ class URLDownloaderIntegTest(TestCase):
             URLDownloader(download_link).download(self.tmpdir.joinpath("HelloWorld-python.zip"))
         assert not self.tmpdir.joinpath("HelloWorld-python.zip").exists()
         assert isinstance(e.value, requests.exceptions.HTTPError)
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves a single in-memory file and honours single byte range requests, like the CDN hosting the nucleus archive.
+    """
+
+    content = bytes(range(256)) * 12 * 1024
+    etag = '"nucleus-v1"'
+    drop_connection_after = None
+    requests_served = []
+
+    def do_HEAD(self):
+        self._send_headers(200, len(self.content))
+
+    def do_GET(self):
+        self.requests_served.append(self.command)
+        if self.headers.get("If-None-Match") == self.etag:
+            self._send_headers(304, 0)
+            return
+        first_byte, last_byte = 0, len(self.content) - 1
+        range_header = self.headers.get("Range")
+        if range_header:
+            start, end = range_header[len("bytes="):].split("-")
+            first_byte = int(start)
+            last_byte = int(end) if end else last_byte
+            if first_byte >= len(self.content):
+                self._send_headers(416, 0)
+                return
+        body = self.content[first_byte:last_byte + 1]
+        self._send_headers(206 if range_header else 200, len(body), first_byte, last_byte)
+        if self.drop_connection_after is not None:
+            body = body[: self.drop_connection_after]
+        self.wfile.write(body)
+
+    def _send_headers(self, status, length, first_byte=None, last_byte=None):
+        self.send_response(status)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(length))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {first_byte}-{last_byte}/{len(self.content)}")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class URLDownloaderRangeRequestIntegTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker, tmpdir):
+        self.mocker = mocker
+        self.tmpdir = Path(tmpdir)
+        RangeRequestHandler.drop_connection_after = None
+        RangeRequestHandler.requests_served = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/greengrass-latest.zip"
+        yield
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_given_interrupted_download_when_download_again_then_resume_from_partial_file(self):
+        destination = self.tmpdir.joinpath("greengrass-nucleus-latest.zip")
+        RangeRequestHandler.drop_connection_after = len(RangeRequestHandler.content) // 2
+
+        with pytest.raises(Exception):
+            URLDownloader(self.url).download(destination)
+        assert not destination.exists()
+        # Every chunk received in full before the connection dropped is kept.
+        assert self.tmpdir.joinpath("greengrass-nucleus-latest.zip.part").stat().st_size == DOWNLOAD_CHUNK_SIZE_BYTES
+
+        RangeRequestHandler.drop_connection_after = None
+        URLDownloader(self.url, sha256=hashlib.sha256(RangeRequestHandler.content).hexdigest()).download(destination)
+
+        assert destination.read_bytes() == RangeRequestHandler.content
+        assert list(self.tmpdir.iterdir()) == [destination]
+
+    def test_given_parallel_ranges_when_download_then_download_file_in_ranges(self):
+        self.mocker.patch("gdk.common.URLDownloader.DOWNLOAD_MIN_RANGE_SIZE_BYTES", 512 * 1024)
+        destination = self.tmpdir.joinpath("greengrass-nucleus-latest.zip")
+        spy_download_range = self.mocker.spy(URLDownloader, "_download_range")
+
+        URLDownloader(self.url, parallel_ranges=4, sha256=hashlib.sha256(RangeRequestHandler.content).hexdigest()).download(
+            destination
+        )
+
+        assert spy_download_range.call_count == 4
+        assert destination.read_bytes() == RangeRequestHandler.content
+        assert list(self.tmpdir.iterdir()) == [destination]
+
+    def test_given_download_cache_when_download_twice_then_revalidate_and_link_cached_file(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        first_project = self.tmpdir.joinpath("first-project.zip")
+        second_project = self.tmpdir.joinpath("second-project.zip")
+
+        URLDownloader(self.url, cache=cache).download(first_project)
+        URLDownloader(self.url, cache=cache).download(second_project)
+
+        assert second_project.read_bytes() == RangeRequestHandler.content
+        assert first_project.samefile(second_project)
+        # The second download is a conditional request answered with 304 Not Modified.
+        assert RangeRequestHandler.requests_served == ["GET", "GET"]
+        assert cache.get_conditional_headers(self.url) == {"If-None-Match": RangeRequestHandler.etag}
@@ -13,8 +13,9 @@ import requests
 
 class InitCommandIntegTest(TestCase):
     @pytest.fixture(autouse=True)
-    def __inject_fixtures(self, mocker, tmpdir):
+    def __inject_fixtures(self, mocker, tmpdir, tmp_path_factory):
         self.mocker = mocker
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=tmp_path_factory.mktemp("gdk-user-dir"))
         self.tmpdir = Path(tmpdir).resolve()
         self.c_dir = Path(".").resolve()
         self.url = "https://raw.githubusercontent.com/aws-greengrass/aws-greengrass-software-catalog/main/cli-components/"
@@ -126,7 +127,7 @@ class InitCommandIntegTest(TestCase):
             )
         assert "Not found" in e.value.args[0]
         assert mock_requests_get.call_args_list == [
-            call(self.url + "templates.json"),
+            call(self.url + "templates.json", timeout=30),
             call("https://dummy-link", stream=True, timeout=30),
         ]
 
@@ -152,7 +153,7 @@ class InitCommandIntegTest(TestCase):
             parse_args_actions.run_command(CLIParser.cli_parser.parse_args(["component", "init", "-r", "dummy"]))
         assert "Not found" in e.value.args[0]
         assert mock_requests_get.call_args_list == [
-            call(self.url + "community-components.json"),
+            call(self.url + "community-components.json", timeout=30),
             call("https://dummy-link", stream=True, timeout=30),
         ]
 
@@ -181,7 +182,7 @@ class InitCommandIntegTest(TestCase):
             in e.value.args[0]
         )
 
-        assert mock_requests_get.call_args_list == [call(self.url + "templates.json")]
+        assert mock_requests_get.call_args_list == [call(self.url + "templates.json", timeout=30)]
         _new_dir = Path(self.tmpdir).joinpath("new-dir").resolve()
 
         # Then
@@ -204,7 +205,7 @@ class InitCommandIntegTest(TestCase):
             )
 
         assert "Could not find the component repository 'repo-not-exists' in Greengrass Software Catalog." in e.value.args[0]
-        assert mock_requests_get.call_args_list == [call(self.url + "community-components.json")]
+        assert mock_requests_get.call_args_list == [call(self.url + "community-components.json", timeout=30)]
         _new_dir = Path(self.tmpdir).joinpath("new-dir").resolve()
 
         # Then
@@ -7,6 +7,11 @@ import pytest
 from urllib3.exceptions import HTTPError
 
 
+@pytest.fixture(autouse=True)
+def gdk_user_dir(mocker, tmp_path):
+    mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=tmp_path)
+
+
 def test_list_run():
     with pytest.raises(Exception) as e:
         parse_args_actions.run_command(CLIParser.cli_parser.parse_args(["component", "list", "-d"]))
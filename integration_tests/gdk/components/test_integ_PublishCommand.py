@@ -10,8 +10,7 @@ import os
 import shutil
 from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile
 from botocore.stub import Stubber, ANY
-
-from unittest.mock import Mock
+from gdk.aws_clients.ClientFactory import ClientFactory
 
 
 class ComponentPublishCommandIntegTest(TestCase):
@@ -45,9 +44,7 @@ class ComponentPublishCommandIntegTest(TestCase):
 
         self.gg_client_stub.activate()
         self.sts_client_stub.activate()
-        boto3_ses = Mock()
-        boto3_ses.get_partition_for_region.return_value = "aws"
-        self.mocker.patch("boto3.Session", return_value=boto3_ses)
+        self.mocker.patch.object(ClientFactory, "get_partition", return_value="aws")
 
     def test_GIVEN_no_artifacts_and_NEXT_PATCH_WHEN_publish_THEN_create_a_component_with_recipe(self):
         self.zip_test_data()
@@ -10,18 +10,22 @@ import gdk.common.consts as consts
 from gdk.common.config.GDKProject import GDKProject
 from gdk.common.GithubUtils import GithubUtils
 import requests
+import json
 
 
 class E2ETestInitCommandTest(TestCase):
     @pytest.fixture(autouse=True)
-    def __inject_fixtures(self, mocker, tmpdir):
+    def __inject_fixtures(self, mocker, tmpdir, tmp_path_factory):
         self.mocker = mocker
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=tmp_path_factory.mktemp("gdk-user-dir"))
         self.tmpdir = tmpdir
         self.c_dir = Path(".").resolve()
         template_path = Path(self.c_dir).joinpath("integration_tests/test_data/templates/TestTemplateForCLI.zip").resolve()
         with open(template_path, "rb") as f:
             template_content = f.read()
-        mock_response = self.mocker.Mock(status_code=200, content=template_content)
+        mock_response = self.mocker.Mock(
+            status_code=200, headers={}, iter_content=self.mocker.Mock(return_value=[template_content])
+        )
         self.mock_template_download = self.mocker.patch("requests.get", return_value=mock_response)
         self.url_for_template = (
             "https://github.com/aws-greengrass/aws-greengrass-component-templates/releases/download/v1.0/"
@@ -144,6 +148,23 @@ class E2ETestInitCommandTest(TestCase):
 
         assert not Path(self.tmpdir).joinpath(consts.E2E_TESTS_DIR_NAME).exists()
 
+    def test_GIVEN_gradle_test_build_system_WHEN_test_init_THEN_maven_build_file_is_not_extracted(self):
+        self.setup_test_data_config("config.json")
+        with open(Path(self.tmpdir).joinpath("gdk-config.json"), "r", encoding="utf-8") as f:
+            config = json.loads(f.read())
+        config["test-e2e"]["build"] = {"build_system": "gradle"}
+        with open(Path(self.tmpdir).joinpath("gdk-config.json"), "w", encoding="utf-8") as f:
+            f.write(json.dumps(config))
+        response = requests.Response()
+        response.status_code = 200
+        self.mocker.patch("requests.head", return_value=response)
+
+        InitCommand({}).run()
+
+        e2e_test_folder = Path(self.tmpdir).joinpath(consts.E2E_TESTS_DIR_NAME)
+        assert not e2e_test_folder.joinpath("pom.xml").exists()
+        assert e2e_test_folder.joinpath("src/main/java/com/aws/greengrass/CustomSteps.java").exists()
+
     def test_init_run_error_downloading_template(self):
         self.setup_test_data_config("config.json")
         mock_response = self.mocker.Mock(
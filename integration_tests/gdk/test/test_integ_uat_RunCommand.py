@@ -14,15 +14,19 @@ from gdk.common.config.GDKProject import GDKProject
 
 class E2ETestRunCommandTest(TestCase):
     @pytest.fixture(autouse=True)
-    def __inject_fixtures(self, mocker, tmpdir):
+    def __inject_fixtures(self, mocker, tmpdir, tmp_path_factory):
         self.mocker = mocker
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=tmp_path_factory.mktemp("gdk-user-dir"))
         self.tmpdir = Path(tmpdir).resolve()
         self.c_dir = Path(".").resolve()
         template_path = Path(self.c_dir).joinpath("integration_tests/test_data/templates/TestTemplateForCLI.zip").resolve()
         with open(template_path, "rb") as f:
             template_content = f.read()
-        mock_response = self.mocker.Mock(status_code=200, content=template_content)
+        mock_response = self.mocker.Mock(
+            status_code=200, headers={}, iter_content=self.mocker.Mock(return_value=[template_content])
+        )
         self.mock_template_download = self.mocker.patch("requests.get", return_value=mock_response)
+        self.mocker.patch("requests.head", return_value=self.mocker.Mock(headers={}))
         self.url_for_template = (
             "https://github.com/aws-greengrass/aws-greengrass-component-templates/releases/download/v1.0/"
             + "TestTemplateForCLI.zip"
@@ -21,7 +21,7 @@ classifiers = [
     "License :: OSI Approved :: Apache Software License",
     "Programming Language :: Python :: 3",
 ]
-entry_points = {"console_scripts": ["gdk = gdk.CLIParser:main"]}
+entry_points = {"console_scripts": ["gdk = gdk.common.DaemonClient:main"]}
 
 
 def get_requirements():
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pytest
+
+import gdk.common.consts as consts
+from gdk.aws_clients.AccountCache import AccountCache
+from gdk.aws_clients.ClientFactory import ClientFactory
+
+
+class AccountCacheTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker, tmp_path):
+        self.mocker = mocker
+        self.cache_dir = tmp_path.joinpath("accounts")
+        self.session = Mock()
+        self.session.get_credentials.return_value = Mock(access_key="AKIAEXAMPLE")
+        self.mocker.patch.object(ClientFactory, "get_session", return_value=self.session)
+
+    def test_GIVEN_saved_account_number_WHEN_get_account_number_THEN_return_cached_number(self):
+        AccountCache("us-east-1", self.cache_dir).save_account_number("123456789012")
+
+        assert AccountCache("us-east-1", self.cache_dir).get_account_number() == "123456789012"
+
+    def test_GIVEN_saved_account_number_WHEN_get_for_other_region_or_credentials_THEN_return_none(self):
+        AccountCache("us-east-1", self.cache_dir).save_account_number("123456789012")
+
+        assert AccountCache("us-west-2", self.cache_dir).get_account_number() is None
+        self.session.get_credentials.return_value = Mock(access_key="AKIAOTHER")
+        assert AccountCache("us-east-1", self.cache_dir).get_account_number() is None
+
+    def test_GIVEN_expired_entries_WHEN_get_THEN_return_none(self):
+        cache = AccountCache("us-east-1", self.cache_dir)
+        cache.save_account_number("123456789012")
+        cache.save_validated_bucket("bucket")
+        self.mocker.patch.object(consts, "ACCOUNT_CACHE_TTL_SECONDS", 0)
+
+        assert cache.get_account_number() is None
+        assert not cache.is_bucket_validated("bucket")
+
+    def test_GIVEN_validated_bucket_WHEN_is_bucket_validated_THEN_return_true_only_for_that_bucket(self):
+        cache = AccountCache("us-east-1", self.cache_dir)
+        cache.save_account_number("123456789012")
+        cache.save_validated_bucket("bucket")
+
+        assert cache.is_bucket_validated("bucket")
+        assert not cache.is_bucket_validated("other-bucket")
+        assert cache.get_account_number() == "123456789012"
+
+    def test_GIVEN_cached_entries_WHEN_invalidate_THEN_drop_all_entries(self):
+        cache = AccountCache("us-east-1", self.cache_dir)
+        cache.save_account_number("123456789012")
+        cache.save_validated_bucket("bucket")
+
+        cache.invalidate()
+
+        assert cache.get_account_number() is None
+        assert not cache.is_bucket_validated("bucket")
+        assert list(self.cache_dir.iterdir()) == []
+
+    def test_GIVEN_no_credentials_WHEN_save_THEN_cache_nothing(self):
+        self.session.get_credentials.return_value = None
+        cache = AccountCache("us-east-1", self.cache_dir)
+        cache.save_account_number("123456789012")
+        cache.invalidate()
+
+        assert cache.get_account_number() is None
+        assert not self.cache_dir.exists()
+
+    def test_GIVEN_unreadable_entry_WHEN_get_account_number_THEN_return_none(self):
+        cache = AccountCache("us-east-1", self.cache_dir)
+        cache.save_account_number("123456789012")
+        entry_file = next(self.cache_dir.iterdir())
+        entry_file.write_text("not json")
+
+        assert cache.get_account_number() is None
+        cache.save_account_number("123456789012")
+        assert cache.get_account_number() == "123456789012"
@@ -0,0 +1,70 @@
+from unittest import TestCase
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pytest
+
+import gdk.common.consts as consts
+from gdk.aws_clients.ClientFactory import ClientFactory
+from gdk.aws_clients.Greengrassv2Client import Greengrassv2Client
+from gdk.aws_clients.S3Client import S3Client
+
+
+class ClientFactoryTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+
+    def test_GIVEN_same_service_and_region_WHEN_get_client_THEN_reuse_the_client(self):
+        spy_client = self.mocker.spy(boto3, "client")
+
+        first = ClientFactory.get_client("s3", "us-east-1")
+        second = ClientFactory.get_client("s3", "us-east-1")
+
+        assert first is second
+        assert spy_client.call_count == 1
+
+    def test_GIVEN_different_regions_WHEN_get_client_THEN_create_a_client_per_region(self):
+        east = ClientFactory.get_client("s3", "us-east-1")
+        west = ClientFactory.get_client("s3", "us-west-2")
+
+        assert east is not west
+        assert east.meta.region_name == "us-east-1"
+        assert west.meta.region_name == "us-west-2"
+
+    def test_GIVEN_client_wrappers_WHEN_created_THEN_share_clients_of_the_factory(self):
+        assert S3Client("us-east-1").s3_client is S3Client("us-east-1").s3_client
+        assert Greengrassv2Client("us-east-1").client is ClientFactory.get_client("greengrassv2", "us-east-1")
+
+    def test_GIVEN_client_WHEN_get_client_THEN_use_tuned_config(self):
+        config = ClientFactory.get_client("greengrassv2", "us-east-1").meta.config
+
+        assert config.max_pool_connections == consts.AWS_CLIENT_MAX_POOL_CONNECTIONS
+        assert config.retries["mode"] == "adaptive"
+        assert config.tcp_keepalive
+
+    def test_GIVEN_concurrent_requests_WHEN_get_client_THEN_create_the_client_once(self):
+        spy_client = self.mocker.spy(boto3, "client")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: ClientFactory.get_client("sts", "us-east-1"), range(16)))
+
+        assert all(client is clients[0] for client in clients)
+        assert spy_client.call_count == 1
+
+    def test_GIVEN_cached_clients_WHEN_clear_THEN_create_new_clients(self):
+        first = ClientFactory.get_client("s3", "us-east-1")
+        ClientFactory.clear()
+
+        assert ClientFactory.get_client("s3", "us-east-1") is not first
+
+    def test_GIVEN_region_WHEN_get_partition_THEN_return_partition_of_the_region(self):
+        assert ClientFactory.get_partition("us-east-1") == "aws"
+        assert ClientFactory.get_partition("cn-north-1") == "aws-cn"
+        assert ClientFactory.get_session() is ClientFactory.get_session()
+
+    def test_GIVEN_max_attempts_WHEN_get_client_THEN_create_a_separate_client_with_standard_retries(self):
+        client = ClientFactory.get_client("greengrassv2", "us-east-1", max_attempts=1)
+
+        assert client is not ClientFactory.get_client("greengrassv2", "us-east-1")
+        assert client.meta.config.retries == {"mode": "standard", "total_max_attempts": 1}
@@ -0,0 +1,114 @@
+from unittest import TestCase
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from gdk.aws_clients.ComponentVersionResolver import ComponentVersionResolver
+
+ARN_PREFIX = "arn:aws:greengrass:us-east-1:123456789012:components:"
+
+
+class ComponentVersionResolverTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.client = boto3.client("greengrassv2", region_name="us-east-1")
+        self.mock_client = self.mocker.patch("boto3.client", return_value=self.client)
+        self.stub = Stubber(self.client)
+        self.stub.activate()
+
+    def test_GIVEN_one_component_WHEN_get_latest_version_THEN_list_its_versions_only(self):
+        self.stub.add_response(
+            "list_component_versions",
+            {"componentVersions": [{"componentVersion": "1.0.4"}, {"componentVersion": "1.0.1"}]},
+            {"arn": ARN_PREFIX + "a"},
+        )
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.4"
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.4"
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_unpublished_component_WHEN_get_latest_version_THEN_return_none(self):
+        self.stub.add_response("list_component_versions", {"componentVersions": []}, {"arn": ARN_PREFIX + "a"})
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") is None
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_several_components_WHEN_get_latest_version_THEN_list_components_from_all_pages_once(self):
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "1.0.0"}]}, {"arn": ARN_PREFIX + "a"}
+        )
+        self.stub.add_response(
+            "list_components",
+            {"components": [component("a", "1.0.0")], "nextToken": "page-2"},
+            {"scope": "PRIVATE"},
+        )
+        self.stub.add_response(
+            "list_components",
+            {"components": [component("b", "2.1.0")]},
+            {"scope": "PRIVATE", "nextToken": "page-2"},
+        )
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.0"
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "b") == "2.1.0"
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "unknown") is None
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.0"
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_list_components_denied_WHEN_get_latest_version_THEN_list_versions_of_each_component(self):
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "1.0.0"}]}, {"arn": ARN_PREFIX + "a"}
+        )
+        self.stub.add_client_error("list_components", service_error_code="AccessDeniedException")
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "2.1.0"}]}, {"arn": ARN_PREFIX + "b"}
+        )
+        self.stub.add_response("list_component_versions", {"componentVersions": []}, {"arn": ARN_PREFIX + "c"})
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.0"
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "b") == "2.1.0"
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "c") is None
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_list_components_fails_WHEN_get_latest_version_THEN_raise_exception(self):
+        self.stub.add_response("list_component_versions", {"componentVersions": []}, {"arn": ARN_PREFIX + "a"})
+        self.stub.add_client_error("list_components", service_error_code="500")
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") is None
+        with pytest.raises(ClientError):
+            ComponentVersionResolver.get_latest_version(ARN_PREFIX + "b")
+
+    def test_GIVEN_other_region_WHEN_get_latest_version_THEN_list_versions_in_that_region(self):
+        west_arn = "arn:aws:greengrass:us-west-2:123456789012:components:a"
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "1.0.0"}]}, {"arn": ARN_PREFIX + "a"}
+        )
+        self.stub.add_response("list_component_versions", {"componentVersions": []}, {"arn": west_arn})
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.0"
+        assert ComponentVersionResolver.get_latest_version(west_arn) is None
+        assert [c.kwargs["region_name"] for c in self.mock_client.call_args_list] == ["us-east-1", "us-west-2"]
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_cached_versions_WHEN_clear_THEN_list_versions_again(self):
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "1.0.0"}]}, {"arn": ARN_PREFIX + "a"}
+        )
+        self.stub.add_response(
+            "list_component_versions", {"componentVersions": [{"componentVersion": "1.0.1"}]}, {"arn": ARN_PREFIX + "a"}
+        )
+
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.0"
+        ComponentVersionResolver.clear()
+        assert ComponentVersionResolver.get_latest_version(ARN_PREFIX + "a") == "1.0.1"
+        self.stub.assert_no_pending_responses()
+
+
+def component(name, latest_version):
+    return {
+        "arn": ARN_PREFIX + name,
+        "componentName": name,
+        "latestVersion": {"componentVersion": latest_version},
+    }
@@ -0,0 +1,180 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError, ConnectionClosedError, EndpointConnectionError
+from botocore.stub import Stubber
+
+from gdk.aws_clients.ComponentVersionScheduler import ComponentVersionScheduler, TokenBucket
+
+CREATE_RESPONSE = {
+    "componentName": "com.example.HelloWorld",
+    "componentVersion": "1.0.0",
+    "creationTimestamp": datetime.datetime(2024, 1, 1),
+    "status": {},
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(TestCase):
+    def test_GIVEN_full_bucket_WHEN_acquire_burst_THEN_wait_only_once_it_is_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2.0, 3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits == [0.0, 0.0, 0.0, 0.5, 0.5]
+        assert clock.now == 1.0
+
+    def test_GIVEN_idle_bucket_WHEN_acquire_THEN_refill_up_to_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(1.0, 2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        clock.now += 60
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+
+class ComponentVersionSchedulerTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.client = boto3.client("greengrassv2", region_name="us-east-1")
+        self.mock_client = self.mocker.patch("boto3.client", return_value=self.client)
+        self.stub = Stubber(self.client)
+        self.stub.activate()
+        self.clock = FakeClock()
+
+    def test_GIVEN_recipe_WHEN_create_component_version_THEN_create_with_botocore_retries_disabled(self):
+        self.stub.add_response("create_component_version", CREATE_RESPONSE, {"inlineRecipe": "recipe"})
+        scheduler = ComponentVersionScheduler(sleep=self.clock.sleep)
+
+        assert scheduler.create_component_version("us-east-1", "recipe")["componentVersion"] == "1.0.0"
+        assert scheduler.get_stats() == {"calls": 1, "retries": 0, "throttles": 0}
+        assert self.mock_client.call_args.kwargs["config"].retries == {"mode": "standard", "total_max_attempts": 1}
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_throttled_requests_WHEN_create_component_version_THEN_retry_with_backoff(self):
+        self.stub.add_client_error("create_component_version", "ThrottlingException", http_status_code=429)
+        self.stub.add_client_error("create_component_version", "TooManyRequestsException", http_status_code=429)
+        self.stub.add_response("create_component_version", CREATE_RESPONSE)
+        mock_uniform = self.mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        scheduler = ComponentVersionScheduler(burst=10, sleep=self.clock.sleep)
+
+        scheduler.create_component_version("us-east-1", "recipe")
+
+        assert scheduler.get_stats() == {"calls": 3, "retries": 2, "throttles": 2}
+        assert [c.args for c in mock_uniform.call_args_list] == [(0, 0.5), (0, 1.0)]
+        assert self.clock.sleeps == [0.5, 1.0]
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_throttled_on_all_attempts_WHEN_create_component_version_THEN_raise_throttling_error(self):
+        for _ in range(3):
+            self.stub.add_client_error("create_component_version", "ThrottlingException", http_status_code=429)
+        scheduler = ComponentVersionScheduler(burst=10, max_attempts=3, sleep=self.clock.sleep)
+
+        with pytest.raises(ClientError) as e:
+            scheduler.create_component_version("us-east-1", "recipe")
+
+        assert e.value.response["Error"]["Code"] == "ThrottlingException"
+        assert scheduler.get_stats() == {"calls": 3, "retries": 2, "throttles": 3}
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_server_error_WHEN_create_component_version_THEN_retry_with_backoff(self):
+        self.stub.add_client_error("create_component_version", "InternalServerException", http_status_code=500)
+        self.stub.add_client_error("create_component_version", "ServiceUnavailable", http_status_code=503)
+        self.stub.add_response("create_component_version", CREATE_RESPONSE)
+        self.mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        scheduler = ComponentVersionScheduler(burst=10, sleep=self.clock.sleep)
+
+        assert scheduler.create_component_version("us-east-1", "recipe")["componentVersion"] == "1.0.0"
+
+        assert scheduler.get_stats() == {"calls": 3, "retries": 2, "throttles": 0}
+        assert self.clock.sleeps == [0.5, 1.0]
+        self.stub.assert_no_pending_responses()
+
+    def test_GIVEN_connection_errors_WHEN_create_component_version_THEN_retry(self):
+        endpoint_url = "https://greengrass.us-east-1.amazonaws.com"
+        mock_create = self.mocker.patch.object(
+            self.client,
+            "create_component_version",
+            side_effect=[
+                EndpointConnectionError(endpoint_url=endpoint_url),
+                ConnectionClosedError(endpoint_url=endpoint_url),
+                CREATE_RESPONSE,
+            ],
+        )
+        scheduler = ComponentVersionScheduler(burst=10, sleep=self.clock.sleep)
+
+        assert scheduler.create_component_version("us-east-1", "recipe")["componentVersion"] == "1.0.0"
+
+        assert mock_create.call_count == 3
+        assert scheduler.get_stats() == {"calls": 3, "retries": 2, "throttles": 0}
+
+    def test_GIVEN_server_error_on_all_attempts_WHEN_create_component_version_THEN_raise_server_error(self):
+        for _ in range(2):
+            self.stub.add_client_error("create_component_version", "InternalServerException", http_status_code=500)
+        scheduler = ComponentVersionScheduler(burst=10, max_attempts=2, sleep=self.clock.sleep)
+
+        with pytest.raises(ClientError) as e:
+            scheduler.create_component_version("us-east-1", "recipe")
+
+        assert e.value.response["Error"]["Code"] == "InternalServerException"
+        assert scheduler.get_stats() == {"calls": 2, "retries": 1, "throttles": 0}
+
+    def test_GIVEN_invalid_recipe_WHEN_create_component_version_THEN_raise_without_retrying(self):
+        self.stub.add_client_error("create_component_version", "ValidationException", http_status_code=400)
+        scheduler = ComponentVersionScheduler(sleep=self.clock.sleep)
+
+        with pytest.raises(ClientError):
+            scheduler.create_component_version("us-east-1", "recipe")
+
+        assert scheduler.get_stats() == {"calls": 1, "retries": 0, "throttles": 0}
+        assert self.clock.sleeps == []
+
+    def test_GIVEN_many_versions_WHEN_created_concurrently_THEN_bound_the_requests_in_flight(self):
+        in_flight = []
+        peak = []
+
+        def _create_component_version(**kwargs):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            time.sleep(0.005)
+            in_flight.pop()
+            return CREATE_RESPONSE
+
+        self.mocker.patch.object(self.client, "create_component_version", side_effect=_create_component_version)
+        scheduler = ComponentVersionScheduler(rate=1000, burst=1000, max_concurrency=2, sleep=self.clock.sleep)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: scheduler.create_component_version("us-east-1", "recipe"), range(16)))
+
+        assert max(peak) <= 2
+        assert scheduler.get_stats() == {"calls": 16, "retries": 0, "throttles": 0}
+
+    def test_GIVEN_two_regions_WHEN_create_component_version_THEN_pace_each_region_separately(self):
+        self.mocker.patch.object(self.client, "create_component_version", return_value=CREATE_RESPONSE)
+        scheduler = ComponentVersionScheduler(rate=1.0, burst=1, sleep=self.clock.sleep)
+
+        scheduler.create_component_version("us-east-1", "recipe")
+        scheduler.create_component_version("us-west-2", "recipe")
+
+        assert self.clock.sleeps == []
+        scheduler.create_component_version("us-east-1", "recipe")
+        assert self.clock.sleeps == [pytest.approx(1.0, abs=0.1)]
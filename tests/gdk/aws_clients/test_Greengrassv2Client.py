@@ -66,6 +66,16 @@ class Greengrassv2ClientTest(TestCase):
 
         self.mock_ggv2_client.assert_no_pending_responses()
 
+    def test_create_gg_component_with_scheduler(self):
+        scheduler = mock.Mock()
+        ggv2 = Greengrassv2Client("region", scheduler)
+
+        with mock.patch("builtins.open", mock.mock_open(read_data="some-recipe-content")):
+            ggv2.create_gg_component(Path("some-recipe.yaml"))
+
+        assert scheduler.create_component_version.call_args_list == [call("region", "some-recipe-content")]
+        self.mock_ggv2_client.assert_no_pending_responses()
+
     def test_create_gg_component_exception(self):
         greengrass_client = Greengrassv2Client("region")
         self.mock_ggv2_client.add_client_error("create_component_version", service_error_code="400")
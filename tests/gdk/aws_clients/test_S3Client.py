@@ -1,5 +1,6 @@
 from unittest import TestCase
-from unittest.mock import call
+from unittest.mock import call, Mock
+from concurrent.futures import ThreadPoolExecutor
 
 import boto3
 import pytest
@@ -68,6 +69,49 @@ class S3ClientTest(TestCase):
         assert mock_valid_bucket_exists.call_args_list == [call("test-bucket", "region")]
         assert self.s3_client_stub.assert_no_pending_responses
 
+    def test_GIVEN_prefetched_bucket_check_WHEN_create_bucket_THEN_use_prefetched_result(self):
+        region = "us-west-2"
+        s3_client_utils = S3Client(region)
+        self.s3_client_stub.add_response("get_bucket_location", {"LocationConstraint": region}, {"Bucket": "bucket"})
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            s3_client_utils.prefetch_bucket_check("bucket", executor)
+        spy_valid_bucket_exists = self.mocker.spy(S3Client, "valid_bucket_for_artifacts_exists")
+        s3_client_utils.create_bucket("bucket")
+
+        assert not spy_valid_bucket_exists.called
+        self.s3_client_stub.assert_no_pending_responses()
+
+    def test_GIVEN_failed_prefetched_bucket_check_WHEN_create_bucket_THEN_raise_exception(self):
+        region = "us-west-2"
+        s3_client_utils = S3Client(region)
+        self.s3_client_stub.add_client_error("get_bucket_location", "AccessDenied")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            s3_client_utils.prefetch_bucket_check("bucket", executor)
+        with pytest.raises(Exception) as e:
+            s3_client_utils.create_bucket("bucket")
+
+        assert "An error occurred (AccessDenied) when calling the GetBucketLocation operation" in e.value.args[0]
+        self.s3_client_stub.assert_no_pending_responses()
+
+    def test_GIVEN_artifact_in_s3_WHEN_copy_artifact_THEN_copy_server_side(self):
+        mock_copy = self.mocker.patch.object(self.client, "copy", return_value=None)
+        s3_client_utils = S3Client("us-west-2")
+
+        s3_client_utils.copy_artifact("s3://old-bucket/c/1.0.0/a.zip", "bucket", "c/1.0.1/a.zip", {"ACL": "private"})
+        s3_client_utils.copy_artifact("s3://bucket/c/1.0.0/b.zip", "bucket", "c/1.0.1/b.zip", {"Metadata": {"k": "v"}})
+
+        assert mock_copy.call_args_list == [
+            call({"Bucket": "old-bucket", "Key": "c/1.0.0/a.zip"}, "bucket", "c/1.0.1/a.zip", ExtraArgs={"ACL": "private"}),
+            call(
+                {"Bucket": "bucket", "Key": "c/1.0.0/b.zip"},
+                "bucket",
+                "c/1.0.1/b.zip",
+                ExtraArgs={"Metadata": {"k": "v"}, "MetadataDirective": "REPLACE"},
+            ),
+        ]
+
     def test_GIVEN_bucket_exists_WHEN_check_existence_THEN_return_true_non_us_east_1(self):
         region = "us-west-2"
         s3_client_utils = S3Client(region)
@@ -119,6 +163,24 @@ class S3ClientTest(TestCase):
         assert not s3_client_utils.valid_bucket_for_artifacts_exists(bucket, region)
         assert self.s3_client_stub.assert_no_pending_responses
 
+    def test_GIVEN_bucket_validated_in_cache_WHEN_check_existence_THEN_skip_request(self):
+        account_cache = Mock()
+        account_cache.is_bucket_validated.return_value = True
+        s3_client_utils = S3Client("us-west-2", account_cache)
+
+        assert s3_client_utils.valid_bucket_for_artifacts_exists("bucket", "us-west-2")
+        account_cache.is_bucket_validated.assert_called_once_with("bucket")
+        self.s3_client_stub.assert_no_pending_responses()
+
+    def test_GIVEN_bucket_not_in_cache_WHEN_check_existence_THEN_cache_valid_bucket(self):
+        account_cache = Mock()
+        account_cache.is_bucket_validated.return_value = False
+        s3_client_utils = S3Client("us-west-2", account_cache)
+        self.s3_client_stub.add_response("get_bucket_location", {"LocationConstraint": "us-west-2"}, {"Bucket": "bucket"})
+
+        assert s3_client_utils.valid_bucket_for_artifacts_exists("bucket", "us-west-2")
+        account_cache.save_validated_bucket.assert_called_once_with("bucket")
+
     def test_WHEN_check_bucket_existence_and_raise_exception_THEN_raise_exception(self):
         bucket = "test-bucket"
         region = "region"
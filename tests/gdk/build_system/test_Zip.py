@@ -1,3 +1,7 @@
+import os
+import struct
+import tempfile
+import zipfile
 import pytest
 from pathlib import Path
 from unittest import TestCase
@@ -55,6 +59,156 @@ class ZipTests(TestCase):
         ignore_set = zip.generate_ignore_list_from_globs("/path/to/root", ["glob", "glob2", "glob3"])
         assert ignore_set == {'a', 'b', '1', 'c'}
 
+    def test_zip_ignore_list_with_only_archive_options(self):
+        con = config()
+        con["component"]["com.example.PythonLocalPubSub"]["build"] = {"build_system": "zip", "options": {"reproducible": True}}
+        self.mocker.patch("gdk.common.configuration.get_configuration", return_value=con)
+
+        ignored = Zip().get_ignored_file_patterns(ComponentBuildConfiguration({}))
+
+        assert ignored[3:] == ["**/test*", "**/.*", "**/node_modules"]
+
+    def test_GIVEN_unchanged_files_WHEN_create_archive_again_THEN_archive_is_byte_identical(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            root_dir = Path(newDir).joinpath("component")
+            root_dir.joinpath("src", "empty").mkdir(parents=True)
+            root_dir.joinpath("src", "main.py").write_text("print('hello')")
+            root_dir.joinpath("run.sh").write_text("python3 src/main.py")
+            root_dir.joinpath("run.sh").chmod(0o775)
+
+            first = Zip().create_archive(Path(newDir).joinpath("first"), root_dir, {})
+            for path in root_dir.rglob("*"):
+                os.utime(path, (1700000000, 1700000000))
+            root_dir.joinpath("src", "main.py").chmod(0o600)
+            second = Zip().create_archive(Path(newDir).joinpath("second"), root_dir, {})
+
+            assert first.read_bytes() == second.read_bytes()
+            with zipfile.ZipFile(first) as archive:
+                infos = archive.infolist()
+                assert [info.filename for info in infos] == ["run.sh", "src/", "src/empty/", "src/main.py"]
+                assert {info.date_time for info in infos} == {(1980, 1, 1, 0, 0, 0)}
+                assert [info.external_attr >> 16 & 0o777 for info in infos] == [0o755, 0o755, 0o755, 0o644]
+                assert archive.read("src/main.py") == b"print('hello')"
+
+    def test_GIVEN_compress_level_WHEN_create_archive_THEN_deflate_files_with_that_level(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            root_dir = Path(newDir).joinpath("component")
+            root_dir.mkdir()
+            content = "".join(f"line {i} of {i * 7 % 13}\n" for i in range(20000))
+            root_dir.joinpath("data.txt").write_text(content)
+
+            self.mocker.patch("gdk.common.consts.ZIP_COMPRESS_LEVEL", 1)
+            fast = Zip().create_archive(Path(newDir).joinpath("fast"), root_dir, {})
+            self.mocker.patch("gdk.common.consts.ZIP_COMPRESS_LEVEL", 9)
+            best = Zip().create_archive(Path(newDir).joinpath("best"), root_dir, {})
+
+            assert fast.read_bytes() != best.read_bytes()
+            with zipfile.ZipFile(fast) as fast_archive, zipfile.ZipFile(best) as best_archive:
+                assert best_archive.getinfo("data.txt").compress_size < fast_archive.getinfo("data.txt").compress_size
+                assert fast_archive.read("data.txt") == best_archive.read("data.txt") == content.encode()
+
+    def test_GIVEN_reproducible_disabled_WHEN_create_archive_THEN_keep_file_timestamps(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            root_dir = Path(newDir).joinpath("component")
+            root_dir.mkdir()
+            root_dir.joinpath("main.py").write_text("print('hello')")
+            os.utime(root_dir.joinpath("main.py"), (1700000000, 1700000000))
+
+            archive_path = Zip().create_archive(Path(newDir).joinpath("component"), root_dir, {"reproducible": False})
+
+            with zipfile.ZipFile(archive_path) as archive:
+                assert archive.getinfo("main.py").date_time[0] == 2023
+                assert archive.read("main.py") == b"print('hello')"
+
+    def test_GIVEN_large_file_WHEN_create_archive_THEN_write_zip64_local_header(self):
+        self.mocker.patch("gdk.common.consts.ZIP64_FORCE_THRESHOLD_BYTES", 10)
+        with tempfile.TemporaryDirectory() as newDir:
+            root_dir = Path(newDir).joinpath("component")
+            root_dir.mkdir()
+            root_dir.joinpath("small.txt").write_bytes(b"x" * 9)
+            root_dir.joinpath("weights.bin").write_bytes(b"x" * 10)
+
+            archive_path = Zip().create_archive(Path(newDir).joinpath("component"), root_dir, {})
+
+            with zipfile.ZipFile(archive_path) as archive:
+                assert archive.testzip() is None
+                headers = {info.filename: local_extra(archive_path, info) for info in archive.infolist()}
+            assert headers == {"small.txt": b"", "weights.bin": headers["weights.bin"]}
+            assert struct.unpack("<H", headers["weights.bin"][:2]) == (0x0001,)
+
+    def test_GIVEN_store_patterns_WHEN_create_archive_THEN_store_matching_files_and_log_ratios(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            root_dir = Path(newDir).joinpath("component")
+            root_dir.joinpath("models", "v1").mkdir(parents=True)
+            root_dir.joinpath("models", "v1", "model.onnx").write_bytes(b"0" * 4096)
+            root_dir.joinpath("model.onnx").write_bytes(b"0" * 4096)
+            root_dir.joinpath("data.tar.gz").write_bytes(b"0" * 4096)
+            root_dir.joinpath("main.py").write_bytes(b"0" * 4096)
+            mock_info = self.mocker.patch("logging.info")
+
+            archive_path = Zip().create_archive(
+                Path(newDir).joinpath("component"), root_dir, {"store": ["**/*.onnx", "*.gz", "**/*.tflite"]}
+            )
+
+            with zipfile.ZipFile(archive_path) as archive:
+                compression = {info.filename: info.compress_type for info in archive.infolist() if not info.is_dir()}
+                assert archive.read("models/v1/model.onnx") == b"0" * 4096
+            assert compression == {
+                "data.tar.gz": zipfile.ZIP_STORED,
+                "main.py": zipfile.ZIP_DEFLATED,
+                "model.onnx": zipfile.ZIP_STORED,
+                "models/v1/model.onnx": zipfile.ZIP_STORED,
+            }
+            logged = [c.args[1:] for c in mock_info.call_args_list]
+            assert [log[:3] for log in logged] == [
+                ("the files stored by the pattern '**/*.onnx'", 2, 8192),
+                ("the files stored by the pattern '*.gz'", 1, 4096),
+                ("the files stored by the pattern '**/*.tflite'", 0, 0),
+                ("the other files (deflated)", 1, 4096),
+            ]
+            assert logged[0][4] == 100.0
+            assert logged[3][4] < 10
+
+    def test_GIVEN_previous_build_WHEN_update_THEN_sync_only_changed_files_and_rezip(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            project_dir = Path(newDir).joinpath("component")
+            project_dir.joinpath("src").mkdir(parents=True)
+            project_dir.joinpath("src", "main.py").write_text("print('hello')")
+            project_dir.joinpath("src", "old.py").write_text("old")
+            project_dir.joinpath("recipe.json").write_text("{}")
+            self.mocker.patch("gdk.common.utils.get_current_directory", return_value=project_dir)
+            build_config = ComponentBuildConfiguration({})
+            Zip().build(project_config=build_config)
+
+            project_dir.joinpath("src", "main.py").write_text("print('changed')")
+            project_dir.joinpath("src", "old.py").unlink()
+            project_dir.joinpath("src", "new.py").write_text("new")
+            project_dir.joinpath("src", "test_main.py").write_text("test")
+            mock_copytree = self.mocker.patch("shutil.copytree")
+            Zip().update(build_config, {"src/main.py", "src/old.py", "src/new.py", "src/test_main.py", "recipe.json"})
+
+            assert not mock_copytree.called
+            with zipfile.ZipFile(project_dir.joinpath("zip-build", "component.zip")) as archive:
+                assert sorted(archive.namelist()) == ["src/", "src/main.py", "src/new.py"]
+                assert archive.read("src/main.py") == b"print('changed')"
+
+    def test_GIVEN_no_previous_build_WHEN_update_THEN_build(self):
+        mock_build = self.mocker.patch.object(Zip, "build")
+        self.mocker.patch("gdk.common.utils.get_current_directory", return_value=Path("/non-existent/component"))
+        build_config = ComponentBuildConfiguration({})
+
+        Zip().update(build_config, {"main.py"})
+
+        mock_build.assert_called_once_with(project_config=build_config)
+
+    def test_get_ignore_matcher(self):
+        is_ignored = Zip().get_ignore_matcher(ComponentBuildConfiguration({}))
+
+        assert is_ignored("greengrass-build/recipes/recipe.json")
+        assert is_ignored("src/node_modules/package/index.js")
+        assert is_ignored("tests/test_main.py")
+        assert not is_ignored("src/main.py")
+
 
 def config():
     return {
@@ -68,3 +222,12 @@ def config():
         },
         "gdk_version": "1.0.0",
     }
+
+
+def local_extra(archive_path, info):
+    with open(archive_path, "rb") as f:
+        f.seek(info.header_offset)
+        header = f.read(zipfile.sizeFileHeader)
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        f.seek(info.header_offset + zipfile.sizeFileHeader + name_length)
+        return f.read(extra_length)
@@ -29,7 +29,7 @@ def configuration_base(options: dict) -> dict:
 
 @pytest.mark.parametrize(
     "options",
-    [None, {"excludes": ["*.ts"]}, dict()],
+    [None, {"excludes": ["*.ts"]}, dict(), {"reproducible": False, "store": ["**/*.onnx"]}],
 )
 def test_valid_configuration_options(options):
     validate_configuration(configuration_base(options))
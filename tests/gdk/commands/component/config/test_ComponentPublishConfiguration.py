@@ -1,12 +1,15 @@
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import patch, mock_open, Mock
+from unittest.mock import patch, mock_open, call
 import pytest
 
 
 from gdk.commands.component.config.ComponentPublishConfiguration import ComponentPublishConfiguration
 import boto3
 from botocore.stub import Stubber
+from gdk.aws_clients.AccountCache import AccountCache
+from gdk.aws_clients.ClientFactory import ClientFactory
+from gdk.aws_clients.S3Client import S3Client
 from gdk.common.config.GDKProject import GDKProject
 
 
@@ -35,9 +38,7 @@ class ComponentPublishConfigurationTest(TestCase):
         self.gg_client_stub.activate()
         self.sts_client_stub.activate()
         self.sts_client_stub.add_response("get_caller_identity", {"Account": "123456789012"})
-        boto3_ses = Mock()
-        boto3_ses.get_partition_for_region.return_value = "aws"
-        self.mocker.patch("boto3.Session", return_value=boto3_ses)
+        self.mocker.patch.object(ClientFactory, "get_partition", return_value="aws")
 
     def test_GIVEN_config_with_no_arguments_WHEN_read_publish_config_THEN_read_from_config(self):
         self.gg_client_stub.add_response(
@@ -166,6 +167,59 @@ class ComponentPublishConfigurationTest(TestCase):
                 ComponentPublishConfiguration({"options": opts})
         assert "JSON string is incorrectly formatted." in e.value.args[0]
 
+    def test_GIVEN_only_on_change_and_published_version_WHEN_read_publish_config_THEN_prefetch_latest_recipe(self):
+        mock_valid_bucket_exists = self.mocker.patch.object(S3Client, "valid_bucket_for_artifacts_exists", return_value=True)
+        self.gg_client_stub.add_response("list_component_versions", {"componentVersions": [{"componentVersion": "1.0.4"}]})
+        self.gg_client_stub.add_response(
+            "get_component",
+            {"recipeOutputFormat": "YAML", "recipe": b"ComponentName: com.example.HelloWorld\nComponentVersion: 1.0.4\n"},
+            {
+                "recipeOutputFormat": "YAML",
+                "arn": "arn:aws:greengrass:us-east-1:123456789012:components:com.example.HelloWorld:versions:1.0.4",
+            },
+        )
+
+        pconfig = ComponentPublishConfiguration({"options": '{"only_on_change": ["RECIPE"]}'})
+
+        assert pconfig.get_latest_published_recipe() == {
+            "ComponentName": "com.example.HelloWorld",
+            "ComponentVersion": "1.0.4",
+        }
+        self.gg_client_stub.assert_no_pending_responses()
+        pconfig.s3_client.create_bucket(pconfig.bucket)
+        assert mock_valid_bucket_exists.call_args_list == [call("default-us-east-1-123456789012", "us-east-1")]
+
+    def test_GIVEN_no_published_version_WHEN_get_latest_published_recipe_THEN_return_none(self):
+        self.mocker.patch.object(S3Client, "valid_bucket_for_artifacts_exists", return_value=True)
+        self.gg_client_stub.add_response("list_component_versions", {"componentVersions": []})
+
+        pconfig = ComponentPublishConfiguration({"options": '{"only_on_change": ["RECIPE"]}'})
+
+        assert pconfig.get_latest_published_recipe() is None
+        self.gg_client_stub.assert_no_pending_responses()
+
+    def test_GIVEN_cached_account_number_WHEN_read_publish_config_THEN_skip_caller_identity(self):
+        self.mocker.patch.object(AccountCache, "get_account_number", return_value="210987654321")
+        self.gg_client_stub.add_response("list_component_versions", {"componentVersions": []})
+
+        pconfig = ComponentPublishConfiguration({})
+
+        assert pconfig.account_num == "210987654321"
+        assert pconfig.bucket == "default-us-east-1-210987654321"
+        with pytest.raises(AssertionError):
+            self.sts_client_stub.assert_no_pending_responses()
+
+    def test_GIVEN_version_lookup_fails_WHEN_read_publish_config_THEN_invalidate_account_cache(self):
+        mock_save_account = self.mocker.patch.object(AccountCache, "save_account_number")
+        mock_invalidate = self.mocker.patch.object(AccountCache, "invalidate")
+        self.gg_client_stub.add_client_error("list_component_versions", "AccessDeniedException")
+
+        with pytest.raises(Exception):
+            ComponentPublishConfiguration({})
+
+        assert mock_save_account.call_args_list == [call("123456789012")]
+        assert mock_invalidate.call_count == 1
+
     def test_GIVEN_config_with_no_region_WHEN_get_config_THEN_raise_exception(self):
         conf = config()
         conf["component"]["com.example.HelloWorld"]["publish"]["region"] = ""
@@ -7,6 +7,7 @@ import pytest
 
 import gdk.common.utils as utils
 from gdk.build_system.ComponentBuildSystem import ComponentBuildSystem
+from gdk.build_system.Zip import Zip
 from gdk.commands.component.BuildCommand import BuildCommand
 from gdk.commands.component.transformer.BuildRecipeTransformer import BuildRecipeTransformer
 from gdk.common.config.GDKProject import GDKProject
@@ -170,7 +171,7 @@ class BuildCommandTest(TestCase):
         mock_clean_dir = self.mocker.patch("gdk.common.utils.clean_dir", return_value=None)
         mock_copytree = self.mocker.patch("shutil.copytree")
         mock_subprocess_run = self.mocker.patch("subprocess.run", return_value=None)
-        mock_make_archive = self.mocker.patch("shutil.make_archive")
+        mock_create_archive = self.mocker.patch.object(Zip, "create_archive")
         build_config = config()
         build_config["component"]["com.example.PythonLocalPubSub"]["build"] = {
             "build_system": "zip",
@@ -187,9 +188,8 @@ class BuildCommandTest(TestCase):
         mock_clean_dir.assert_called_with(zip_build_path)
 
         mock_copytree.assert_called_with(utils.get_current_directory(), zip_artifacts_path, ignore=ANY)
-        assert mock_make_archive.called
         zip_build_file = Path(zip_build_path).joinpath("com.example.PythonLocalPubSub").resolve()
-        mock_make_archive.assert_called_with(zip_build_file, "zip", root_dir=zip_artifacts_path)
+        mock_create_archive.assert_called_with(zip_build_file, zip_artifacts_path, {"zip_name": ""})
 
     def test_get_build_folder_by_build_system_maven(self):
         dummy_paths = {Path("/").joinpath("path1"), Path("/").joinpath(*["path1", "path2"])}
@@ -263,6 +263,84 @@ class BuildCommandTest(TestCase):
                 Path("/").joinpath(*["path1", "build", "libs"]).resolve(),
             }
 
+    def test_GIVEN_watch_WHEN_initial_build_fails_THEN_keep_watching(self):
+        mock_build = self.mocker.patch.object(BuildCommand, "build", side_effect=Exception("build failed"))
+        mock_watch = self.mocker.patch.object(BuildCommand, "watch")
+
+        BuildCommand({"watch": True}).run()
+
+        assert mock_build.called
+        assert mock_watch.called
+
+    def test_GIVEN_watch_WHEN_files_change_THEN_rebuild_until_interrupted(self):
+        self.mocker.patch.object(BuildCommand, "build")
+        mock_rebuild = self.mocker.patch.object(BuildCommand, "rebuild", side_effect=[Exception("build failed"), None])
+        mock_watcher = self.mocker.patch("gdk.commands.component.BuildCommand.FileWatcher").return_value
+        mock_watcher.wait_for_changes.side_effect = [{"main.py"}, {"src/main.py"}, KeyboardInterrupt]
+
+        BuildCommand({"watch": True}).run()
+
+        assert [c.args for c in mock_rebuild.call_args_list] == [({"main.py"},), ({"src/main.py"},)]
+        assert mock_watcher.close.called
+
+    def test_watcher_ignores_build_folders_and_files_excluded_from_zip(self):
+        mock_watcher = self.mocker.patch("gdk.commands.component.BuildCommand.FileWatcher")
+        BuildCommand({})._create_watcher()
+        is_ignored = mock_watcher.call_args.args[1]
+
+        assert is_ignored("greengrass-build")
+        assert is_ignored("zip-build")
+        assert is_ignored(".git")
+        assert is_ignored("tests")
+        assert not is_ignored("gdk-config.json")
+        assert not is_ignored("recipe.json")
+        assert not is_ignored("src/main.py")
+
+    def test_GIVEN_zip_build_WHEN_source_changes_THEN_update_zip_and_refresh_artifacts(self):
+        mock_update = self.mocker.patch.object(Zip, "update")
+        mock_transform = self.mocker.patch.object(BuildRecipeTransformer, "transform")
+        mock_refresh = self.mocker.patch.object(BuildRecipeTransformer, "refresh_artifacts")
+        mock_build = self.mocker.patch.object(BuildCommand, "build")
+        build = BuildCommand({})
+        build.component_build_system = Zip()
+        build._built = True
+
+        build.rebuild({"src/main.py"})
+
+        mock_update.assert_called_once_with(build.project_config, {"src/main.py"})
+        assert mock_refresh.called
+        assert not mock_transform.called
+        assert not mock_build.called
+
+    def test_GIVEN_recipe_changes_WHEN_rebuild_THEN_transform_recipe_without_building_sources(self):
+        mock_run_build_command = self.mocker.patch.object(BuildCommand, "run_build_command")
+        mock_transform = self.mocker.patch.object(BuildRecipeTransformer, "transform")
+        mock_refresh = self.mocker.patch.object(BuildRecipeTransformer, "refresh_artifacts")
+        self.mocker.patch.object(BuildCommand, "_get_build_folder_by_build_system", return_value={Path("target")})
+        build = BuildCommand({})
+        build.component_build_system = ComponentBuildSystem.get("maven")
+        build._built = True
+
+        build.rebuild({"recipe.json"})
+
+        assert not mock_run_build_command.called
+        mock_transform.assert_called_once_with({Path("target")})
+        assert not mock_refresh.called
+
+    def test_GIVEN_config_changes_or_untracked_changes_WHEN_rebuild_THEN_build_from_scratch(self):
+        mock_build = self.mocker.patch.object(BuildCommand, "build")
+        mock_update = self.mocker.patch.object(Zip, "update")
+        build = BuildCommand({})
+        build.component_build_system = Zip()
+        build._built = True
+
+        build.rebuild({"gdk-config.json", "src/main.py"})
+        build.rebuild(None)
+
+        assert mock_build.call_count == 2
+        assert self.mock_get_proj_config.call_count == 3
+        assert not mock_update.called
+
 
 def config():
     return {
@@ -3,7 +3,7 @@ from unittest import TestCase
 import gdk.common.exceptions.error_messages as error_messages
 import pytest
 from gdk.commands.component.InitCommand import InitCommand
-from gdk.commands.component.ListCommand import ListCommand
+from gdk.common.SoftwareCatalog import SoftwareCatalog
 from gdk.common.exceptions.CommandError import ConflictingArgumentsError
 from urllib3.exceptions import HTTPError
 
@@ -175,54 +175,38 @@ class InitCommandTest(TestCase):
         language = "language"
         formatted_template_name = f"{template}-{language}"
 
-        mock_get_component_list_from_github = self.mocker.patch.object(
-            ListCommand,
-            "get_component_list_from_github",
-            return_value={formatted_template_name: "template-url"},
-        )
+        mock_find = self.mocker.patch.object(SoftwareCatalog, "find", return_value="template-url")
         self.mocker.patch.object(InitCommand, "__init__", return_value=None)
         init = InitCommand({})
         url = init.get_download_url(formatted_template_name, "template")
         assert url == "template-url"
-        assert mock_get_component_list_from_github.called
+        mock_find.assert_called_once_with(formatted_template_name)
 
     def test_get_download_url_valid_repository(self):
         repository = "repository_name"
-        mock_get_component_list_from_github = self.mocker.patch.object(
-            ListCommand,
-            "get_component_list_from_github",
-            return_value={"repository_name": "repository-url"},
-        )
+        mock_find = self.mocker.patch.object(SoftwareCatalog, "find", return_value="repository-url")
         self.mocker.patch.object(InitCommand, "__init__", return_value=None)
         init = InitCommand({})
         url = init.get_download_url(repository, "repository")
         assert url == "repository-url"
-        assert mock_get_component_list_from_github.called
+        mock_find.assert_called_once_with(repository)
 
     def test_get_download_url_invalid_template(self):
         template = "template-language"
-        mock_get_component_list_from_github = self.mocker.patch.object(
-            ListCommand,
-            "get_component_list_from_github",
-            return_value={"repository_name": "repository-url"},
-        )
+        mock_find = self.mocker.patch.object(SoftwareCatalog, "find", return_value=None)
         self.mocker.patch.object(InitCommand, "__init__", return_value=None)
         init = InitCommand({})
         with pytest.raises(Exception) as e:
             init.get_download_url(template, "template")
         assert e.value.args[0] == "Could not find the component template 'template-language' in Greengrass Software Catalog."
-        assert mock_get_component_list_from_github.called
+        assert mock_find.called
 
     def test_get_download_url_invalid_repository(self):
         repository = "repository_name"
-        mock_get_component_list_from_github = self.mocker.patch.object(
-            ListCommand,
-            "get_component_list_from_github",
-            return_value={"template-language": "template-url"},
-        )
+        mock_find = self.mocker.patch.object(SoftwareCatalog, "find", return_value=None)
         self.mocker.patch.object(InitCommand, "__init__", return_value=None)
         init = InitCommand({})
         with pytest.raises(Exception) as e:
             init.get_download_url(repository, "repository")
         assert e.value.args[0] == "Could not find the component repository 'repository_name' in Greengrass Software Catalog."
-        assert mock_get_component_list_from_github.called
+        assert mock_find.called
@@ -1,4 +1,5 @@
 import pytest
+from pathlib import Path
 from unittest import TestCase
 
 import gdk.common.consts as consts
@@ -9,8 +10,9 @@ from urllib3.exceptions import HTTPError
 
 class ListCommandTest(TestCase):
     @pytest.fixture(autouse=True)
-    def __inject_fixtures(self, mocker):
+    def __inject_fixtures(self, mocker, tmpdir):
         self.mocker = mocker
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=Path(tmpdir))
 
     @pytest.fixture(autouse=True)
     def capsys(self, capsys):
@@ -25,7 +27,7 @@ class ListCommandTest(TestCase):
     def test_get_component_list_from_github_valid_json(self):
         res_json = {"template-name": "template-list"}
         url = "url"
-        mock_response = self.mocker.Mock(status_code=200, json=lambda: res_json)
+        mock_response = self.mocker.Mock(status_code=200, headers={}, json=lambda: res_json)
         mock_template_list = self.mocker.patch("requests.get", return_value=mock_response)
         self.mocker.patch.object(ListCommand, "__init__", return_value=None)
         list = ListCommand({})
@@ -35,7 +37,7 @@ class ListCommandTest(TestCase):
 
     def test_get_component_list_from_github_invalid_json(self):
         res_json = {"template-name": "template-list"}
-        mock_response = self.mocker.Mock(status_code=200, json=res_json)
+        mock_response = self.mocker.Mock(status_code=200, headers={}, json=res_json)
         mock_template_list = self.mocker.patch("requests.get", return_value=mock_response)
         self.mocker.patch.object(ListCommand, "__init__", return_value=None)
         list = ListCommand({})
@@ -84,9 +86,30 @@ class ListCommandTest(TestCase):
         mock_display_list = self.mocker.patch.object(ListCommand, "display_list", return_value=None)
         list = ListCommand({"repository": True})
         list.run()
-        mock_get_component_list_from_github.assert_any_call(consts.repository_list_url)
+        mock_get_component_list_from_github.assert_any_call(consts.repository_list_url, False, None)
         assert mock_display_list.call_count == 1
 
+    def test_run_template_with_search_and_refresh(self):
+        mock_get_component_list_from_github = self.mocker.patch.object(
+            ListCommand, "get_component_list_from_github", return_value={"HelloWorld-python": "url"}
+        )
+        list = ListCommand({"template": True, "search": "python", "refresh": True})
+        list.run()
+        mock_get_component_list_from_github.assert_called_once_with(consts.templates_list_url, True, "python")
+
+        [out, _err] = self.capsys.readouterr()
+        assert out == "1. HelloWorld (python)\n"
+
+    def test_get_component_list_from_github_cached_within_ttl(self):
+        res_json = {"HelloWorld-python": "url-1", "HelloWorld-java": "url-2"}
+        mock_response = self.mocker.Mock(status_code=200, headers={"ETag": '"v1"'}, json=lambda: res_json)
+        mock_template_list = self.mocker.patch("requests.get", return_value=mock_response)
+        self.mocker.patch.object(ListCommand, "__init__", return_value=None)
+        list = ListCommand({})
+        assert list.get_component_list_from_github("url") == res_json
+        assert list.get_component_list_from_github("url", search="JAVA") == {"HelloWorld-java": "url-2"}
+        mock_template_list.assert_called_once_with("url", timeout=30)
+
     def test_run_none(self):
         mock_get_component_list_from_github = self.mocker.patch.object(
             ListCommand, "get_component_list_from_github", return_value=[]
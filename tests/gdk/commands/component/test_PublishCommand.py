@@ -1,6 +1,8 @@
+import logging
+import threading
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import call, Mock
+from unittest.mock import call
 from gdk.commands.component.transformer.PublishRecipeTransformer import PublishRecipeTransformer
 
 import pytest
@@ -9,8 +11,14 @@ from gdk.aws_clients.Greengrassv2Client import Greengrassv2Client
 from gdk.aws_clients.S3Client import S3Client
 from gdk.commands.component.PublishCommand import PublishCommand
 from botocore.stub import Stubber
+from gdk.aws_clients.AccountCache import AccountCache
+from gdk.common.BuildManifest import BuildManifest
+from gdk.common.CaseInsensitive import CaseInsensitiveDict
+from gdk.common import diff_utils
+from gdk.aws_clients.ClientFactory import ClientFactory
 import boto3
 from gdk.common.config.GDKProject import GDKProject
+from gdk.common.exceptions.CommandError import ConflictingArgumentsError
 
 
 class PublishCommandTest(TestCase):
@@ -45,9 +53,7 @@ class PublishCommandTest(TestCase):
                 "nextToken": "string",
             },
         )
-        boto3_ses = Mock()
-        boto3_ses.get_partition_for_region.return_value = "aws"
-        self.mocker.patch("boto3.Session", return_value=boto3_ses)
+        self.mocker.patch.object(ClientFactory, "get_partition", return_value="aws")
 
     def test_upload_artifacts_with_no_artifacts(self):
         publish = PublishCommand({})
@@ -68,6 +74,71 @@ class PublishCommandTest(TestCase):
         publish.upload_artifacts_s3()
         assert mock_create_bucket.call_args_list == [call("test-bucket")]
 
+    def test_upload_artifacts_unchanged_since_published_version(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        publish.s3_client = S3Client("test-region")
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py"), Path("b.py")])
+        self.mocker.patch.object(S3Client, "create_bucket", return_value=None)
+        self.mocker.patch("gdk.common.utils.artifact_encoded_hash", side_effect=lambda path: f"hash-{path.name}")
+        self.mocker.patch.object(
+            PublishCommand,
+            "_get_latest_published_recipe",
+            return_value={
+                "Manifests": [
+                    {
+                        "Artifacts": [
+                            {"URI": "s3://old-bucket/com.example.HelloWorld/1.0.0/a.py", "Digest": "hash-a.py"},
+                            {"URI": "s3://old-bucket/com.example.HelloWorld/1.0.0/b.py", "Digest": "old-hash"},
+                        ]
+                    }
+                ]
+            },
+        )
+        mock_copy = self.mocker.patch.object(S3Client, "copy_artifact", return_value=None)
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact", return_value=None)
+
+        publish.upload_artifacts_s3()
+
+        assert mock_copy.call_args_list == [
+            call(
+                "s3://old-bucket/com.example.HelloWorld/1.0.0/a.py", "test-bucket", "com.example.HelloWorld/1.0.0/a.py", {}
+            )
+        ]
+        assert mock_upload.call_args_list == [call(Path("b.py"), "test-bucket", "com.example.HelloWorld/1.0.0/b.py", {})]
+
+    def test_upload_artifacts_copy_fails_THEN_upload_artifact(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        publish.s3_client = S3Client("test-region")
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py")])
+        self.mocker.patch.object(S3Client, "create_bucket", return_value=None)
+        self.mocker.patch("gdk.common.utils.artifact_encoded_hash", return_value="hash")
+        self.mocker.patch.object(
+            PublishCommand,
+            "_get_latest_published_recipe",
+            return_value={"Manifests": [{"Artifacts": [{"Uri": "s3://old-bucket/c/0.9.0/a.py", "Digest": "hash"}]}]},
+        )
+        mock_copy = self.mocker.patch.object(S3Client, "copy_artifact", side_effect=Exception("AccessDenied"))
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact", return_value=None)
+
+        publish.upload_artifacts_s3()
+
+        assert mock_copy.call_count == 1
+        assert mock_upload.call_args_list == [call(Path("a.py"), "test-bucket", "com.example.HelloWorld/1.0.0/a.py", {})]
+
+    def test_upload_artifacts_published_recipe_not_available_THEN_upload_artifacts(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        publish.s3_client = S3Client("test-region")
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py")])
+        self.mocker.patch.object(S3Client, "create_bucket", return_value=None)
+        self.mocker.patch.object(PublishCommand, "_get_latest_published_recipe", side_effect=Exception("throttled"))
+        mock_copy = self.mocker.patch.object(S3Client, "copy_artifact", return_value=None)
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact", return_value=None)
+
+        publish.upload_artifacts_s3()
+
+        assert not mock_copy.called
+        assert mock_upload.call_count == 1
+
     def test_publish_run_not_build_with_changes(self):
         mock_upload_artifacts_s3 = self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", return_value=None)
         mock_check_for_changes = self.mocker.patch.object(PublishCommand, "_check_for_changes", return_value=True)
@@ -75,10 +146,12 @@ class PublishCommandTest(TestCase):
         mock_dir_exists = self.mocker.patch("gdk.common.utils.dir_exists", return_value=False)
         mock_build = self.mocker.patch("gdk.commands.component.component.build", return_value=None)
         mock_create_gg_component = self.mocker.patch.object(Greengrassv2Client, "create_gg_component", return_value=None)
+        mock_debug = self.mocker.patch("logging.debug")
         publish = PublishCommand(
             {"bucket": None, "region": "us-west-2", "options": '{"file_upload_args":{"Metadata": {"key": "value"}}}'}
         )
         publish.run()
+        mock_debug.assert_any_call("Component version creation stats: %s", {"calls": 0, "retries": 0, "throttles": 0})
         assert mock_dir_exists.call_count == 1
         assert mock_build.call_count == 1
         assert mock_upload_artifacts_s3.call_count == 1
@@ -86,6 +159,245 @@ class PublishCommandTest(TestCase):
         assert mock_create_gg_component.call_count == 1
         assert mock_check_for_changes.call_count == 1
 
+    def test_publish_run_fails_WHEN_upload_artifacts_THEN_invalidate_account_cache(self):
+        self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", side_effect=Exception("upload failed"))
+        self.mocker.patch.object(PublishRecipeTransformer, "transform")
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        mock_invalidate = self.mocker.patch.object(AccountCache, "invalidate")
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": None})
+
+        with pytest.raises(Exception) as e:
+            publish.run()
+
+        assert "upload failed" in e.value.args[0]
+        assert mock_invalidate.call_count == 1
+
+    def test_publish_run_without_only_on_change_THEN_upload_artifacts_while_transforming_recipe(self):
+        upload_started = threading.Event()
+        order = []
+
+        def _upload():
+            upload_started.set()
+            order.append("upload")
+
+        def _transform():
+            # Blocks until the upload has started, so it fails unless both run at the same time.
+            assert upload_started.wait(timeout=5)
+            order.append("transform")
+
+        self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", side_effect=_upload)
+        self.mocker.patch.object(PublishRecipeTransformer, "transform", side_effect=_transform)
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        mock_create = self.mocker.patch.object(
+            Greengrassv2Client, "create_gg_component", side_effect=lambda _: order.append("create")
+        )
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": None})
+
+        publish.run()
+
+        assert sorted(order[:2]) == ["transform", "upload"]
+        assert order[2:] == ["create"]
+        assert mock_create.call_count == 1
+
+    def test_publish_run_transform_fails_THEN_do_not_create_component_version(self):
+        mock_upload = self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", return_value=None)
+        self.mocker.patch.object(PublishRecipeTransformer, "transform", side_effect=Exception("invalid recipe"))
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        mock_create = self.mocker.patch.object(Greengrassv2Client, "create_gg_component", return_value=None)
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": None})
+
+        with pytest.raises(Exception) as e:
+            publish.run()
+
+        assert "invalid recipe" in e.value.args[0]
+        assert mock_upload.call_count == 1
+        assert not mock_create.called
+
+    def test_publish_run_transform_fails_while_uploading_THEN_stop_uploads_and_log_their_errors(self):
+        upload_started = threading.Event()
+
+        def _upload():
+            upload_started.set()
+            # The upload runs until the publish gives up on it, and then fails.
+            assert publish._uploads_cancelled.wait(timeout=5)
+            raise Exception("upload failed")
+
+        def _transform():
+            assert upload_started.wait(timeout=5)
+            raise Exception("invalid recipe")
+
+        self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", side_effect=_upload)
+        self.mocker.patch.object(PublishRecipeTransformer, "transform", side_effect=_transform)
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        mock_create = self.mocker.patch.object(Greengrassv2Client, "create_gg_component", return_value=None)
+        mock_error = self.mocker.patch("logging.error")
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": None})
+
+        with pytest.raises(Exception) as e:
+            publish.run()
+
+        assert "invalid recipe" in e.value.args[0]
+        assert not mock_create.called
+        upload_errors = [c for c in mock_error.call_args_list if "upload the component artifacts" in c.args[0]]
+        assert [str(c.args[1]) for c in upload_errors] == ["upload failed"]
+
+    def test_uploads_cancelled_WHEN_upload_artifact_THEN_skip_it(self):
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact")
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": None})
+        publish._uploads_cancelled.set()
+
+        publish._upload_artifact(Path("a.py"), None, "bucket", {})
+
+        assert not mock_upload.called
+
+    def test_publish_run_only_on_change_artifacts_THEN_hash_each_artifact_once(self):
+        self.mocker.patch.object(PublishRecipeTransformer, "transform")
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py"), Path("b.py")])
+        mock_hash = self.mocker.patch("gdk.common.utils.artifact_encoded_hash", side_effect=lambda path: f"hash-{path.name}")
+        self.mocker.patch.object(
+            PublishCommand,
+            "_get_latest_published_recipe",
+            return_value={
+                "Manifests": [
+                    {
+                        "Artifacts": [
+                            {"URI": "s3://old-bucket/com.example.HelloWorld/0.9.0/a.py", "Digest": "hash-a.py"},
+                            {"URI": "s3://old-bucket/com.example.HelloWorld/0.9.0/b.py", "Digest": "old-hash"},
+                        ]
+                    }
+                ]
+            },
+        )
+        self.mocker.patch.object(S3Client, "create_bucket", return_value=None)
+        mock_copy = self.mocker.patch.object(S3Client, "copy_artifact", return_value=None)
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact", return_value=None)
+        mock_create = self.mocker.patch.object(Greengrassv2Client, "create_gg_component", return_value=None)
+        publish = PublishCommand({"bucket": None, "region": "us-west-2", "options": '{"only_on_change":["ARTIFACTS"]}'})
+
+        publish.run()
+
+        assert sorted(c.args[0].name for c in mock_hash.call_args_list) == ["a.py", "b.py"]
+        assert mock_copy.call_count == 1
+        assert [c.args[0] for c in mock_upload.call_args_list] == [Path("b.py")]
+        assert mock_create.call_count == 1
+
+    def test_upload_artifacts_with_digest_in_build_manifest_THEN_do_not_hash_artifact(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py")])
+        self.mocker.patch.object(S3Client, "create_bucket", return_value=None)
+        self.mocker.patch.object(BuildManifest, "get_digest", return_value="hash-a.py")
+        mock_hash = self.mocker.patch("gdk.common.utils.artifact_encoded_hash")
+        self.mocker.patch.object(
+            PublishCommand,
+            "_get_latest_published_recipe",
+            return_value={"Manifests": [{"Artifacts": [{"URI": "s3://old-bucket/c/0.9.0/a.py", "Digest": "hash-a.py"}]}]},
+        )
+        mock_copy = self.mocker.patch.object(S3Client, "copy_artifact", return_value=None)
+        mock_upload = self.mocker.patch.object(S3Client, "upload_artifact", return_value=None)
+
+        publish.upload_artifacts_s3()
+
+        assert not mock_hash.called
+        assert mock_copy.call_count == 1
+        assert not mock_upload.called
+
+    def test_get_regions_from_regions_argument(self):
+        publish = PublishCommand({})
+        assert publish._get_regions(None) == []
+        assert publish._get_regions(" us-east-1, us-west-2,,us-east-1") == ["us-east-1", "us-west-2"]
+        with pytest.raises(ValueError) as e:
+            publish._get_regions(" , ")
+        assert "Regions cannot be empty." in e.value.args[0]
+
+    def test_publish_run_with_regions_THEN_upload_once_and_create_in_each_region(self):
+        self.add_regional_config_responses()
+        mocks = self.mock_regional_publish()
+
+        publish = PublishCommand({"regions": "us-east-1,us-west-2"})
+        publish.run()
+
+        assert mocks["upload"].call_args_list == [
+            call(Path("a.py"), "default-us-east-1-123456789012", "com.example.HelloWorld/1.0.0/a.py", {})
+        ]
+        assert mocks["copy"].call_args_list == [
+            call(
+                "s3://default-us-east-1-123456789012/com.example.HelloWorld/1.0.0/a.py",
+                "default-us-west-2-123456789012",
+                "com.example.HelloWorld/1.0.0/a.py",
+                {},
+            )
+        ]
+        assert sorted(mocks["create_bucket"].call_args_list) == [
+            call("default-us-east-1-123456789012"),
+            call("default-us-west-2-123456789012"),
+        ]
+        assert sorted(Path(c.args[0]).name for c in mocks["create_component"].call_args_list) == [
+            "com.example.HelloWorld-1.0.0-us-west-2.json",
+            "com.example.HelloWorld-1.0.0.json",
+        ]
+
+    def test_publish_run_with_regions_and_region_fails_THEN_publish_other_regions_and_raise_exception(self):
+        self.add_regional_config_responses()
+        mocks = self.mock_regional_publish()
+
+        def _create_component(recipe_file):
+            if "us-west-2" in str(recipe_file):
+                raise Exception("ThrottlingException")
+
+        mocks["create_component"].side_effect = _create_component
+        publish = PublishCommand({"regions": "us-east-1,us-west-2"})
+
+        with pytest.raises(Exception) as e:
+            publish.run()
+
+        assert "Failed to publish the component 'com.example.HelloWorld' to the regions: us-west-2." in e.value.args[0]
+        assert mocks["create_component"].call_count == 2
+
+    def test_publish_run_with_regions_and_next_patch_THEN_publish_version_of_primary_region_in_each_region(self):
+        project_config = config()
+        project_config["component"]["com.example.HelloWorld"]["version"] = "NEXT_PATCH"
+        self.mock_get_proj_config.return_value = project_config
+        self.add_regional_config_responses()
+        latest_versions = {"us-east-1": "1.0.2", "us-west-2": "1.0.6"}
+        self.mocker.patch.object(
+            Greengrassv2Client,
+            "get_highest_cloud_component_version",
+            side_effect=lambda arn: latest_versions[arn.split(":")[3]],
+        )
+        mocks = self.mock_regional_publish()
+
+        publish = PublishCommand({"regions": "us-east-1,us-west-2"})
+        publish.run()
+
+        assert mocks["copy"].call_args_list[0].args[2] == "com.example.HelloWorld/1.0.3/a.py"
+        assert sorted(Path(c.args[0]).name for c in mocks["create_component"].call_args_list) == [
+            "com.example.HelloWorld-1.0.3-us-west-2.json",
+            "com.example.HelloWorld-1.0.3.json",
+        ]
+
+    def test_publish_with_regions_and_region_or_bucket_THEN_raise_conflicting_arguments_error(self):
+        command = {"gdk": "component", "component": "publish", "regions": "us-east-1,us-west-2"}
+        with pytest.raises(ConflictingArgumentsError):
+            PublishCommand(dict(command, region="us-east-1"))
+        with pytest.raises(ConflictingArgumentsError):
+            PublishCommand(dict(command, bucket="my-bucket"))
+
+    def add_regional_config_responses(self):
+        self.sts_client_stub.add_response("get_caller_identity", {"Account": "123456789012"})
+        self.gg_client_stub.add_response("list_component_versions", {"componentVersions": []})
+
+    def mock_regional_publish(self):
+        self.mocker.patch.object(PublishRecipeTransformer, "transform")
+        self.mocker.patch("gdk.common.utils.dir_exists", return_value=True)
+        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("a.py")])
+        return {
+            "upload": self.mocker.patch.object(S3Client, "upload_artifact", return_value=None),
+            "copy": self.mocker.patch.object(S3Client, "copy_artifact", return_value=None),
+            "create_bucket": self.mocker.patch.object(S3Client, "create_bucket", return_value=None),
+            "create_component": self.mocker.patch.object(Greengrassv2Client, "create_gg_component", return_value=None),
+        }
+
     def test_publish_run_not_build_without_changes_default(self):
         mock_upload_artifacts_s3 = self.mocker.patch.object(PublishCommand, "upload_artifacts_s3", return_value=None)
         mock_transform = self.mocker.patch.object(PublishRecipeTransformer, "transform")
@@ -288,6 +600,54 @@ class PublishCommandTest(TestCase):
         assert mock_diff_artifacts.call_count == 0
         assert mock_get_latest_published_recipe.call_count == 1
 
+    def test_GIVEN_publish_recipe_in_memory_WHEN_diff_recipe_THEN_compare_keys_in_any_case(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        publish.project_config.latest_published_component_version = "0.9.0"
+        publish.project_config.publish_recipe = CaseInsensitiveDict(
+            {
+                "RecipeFormatVersion": "2020-01-25",
+                "ComponentName": "com.example.HelloWorld",
+                "ComponentVersion": "1.0.0",
+                "Manifests": [{"Artifacts": [{"URI": "s3://test-bucket/com.example.HelloWorld/1.0.0/a.zip"}]}],
+            }
+        )
+        mock_read = self.mocker.patch("gdk.common.CaseInsensitive.CaseInsensitiveRecipeFile.read")
+        latest_published_recipe = {
+            "recipeFormatVersion": "2020-01-25",
+            "componentName": "com.example.HelloWorld",
+            "componentVersion": "0.9.0",
+            "manifests": [{"artifacts": [{"Uri": "s3://test-bucket/com.example.HelloWorld/0.9.0/a.zip"}]}],
+        }
+
+        assert not publish._diff_recipe(latest_published_recipe)
+
+        latest_published_recipe["manifests"][0]["artifacts"][0]["Unarchive"] = "ZIP"
+        assert publish._diff_recipe(latest_published_recipe)
+        assert not mock_read.called
+
+    def test_GIVEN_added_recipe_key_WHEN_check_recipe_structure_THEN_stop_at_first_change(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        spy_diff = self.mocker.spy(diff_utils.DiffEngine, "diff")
+        latest_published_recipe = {"componentname": "a", "componentversion": "1.0.0", "lifecycle": {}}
+        recipe = {"componentname": "a", "componentversion": "1.0.1", "lifecycle": {}, "componentdependencies": {}}
+
+        assert publish._check_recipe_structure(recipe, latest_published_recipe)
+        assert not publish._check_recipe_structure(dict(recipe, componentversion="2.0.0"), recipe)
+        assert not spy_diff.called
+
+    def test_GIVEN_debug_output_WHEN_check_recipe_structure_THEN_log_full_diff(self):
+        publish = PublishCommand({"bucket": "test-bucket"})
+        self.mocker.patch.object(logging.getLogger(), "isEnabledFor", return_value=True)
+        mock_debug = self.mocker.patch("logging.debug")
+        spy_has_changes = self.mocker.spy(diff_utils.DiffEngine, "has_changes")
+        latest_published_recipe = {"componentname": "a", "componentversion": "1.0.0", "componentdescription": "old"}
+        recipe = {"componentname": "a", "componentversion": "1.0.1", "componentdescription": "new"}
+
+        assert publish._check_recipe_structure(recipe, latest_published_recipe)
+        assert not spy_has_changes.called
+        assert "root['componentdescription']" in mock_debug.call_args.args[0]
+        assert "root['componentversion']" in mock_debug.call_args.args[0]
+
 
 def config():
     return {
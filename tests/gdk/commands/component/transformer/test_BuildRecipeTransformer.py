@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import call
@@ -5,6 +7,7 @@ from unittest.mock import call
 import pytest
 
 from gdk.commands.component.transformer.BuildRecipeTransformer import BuildRecipeTransformer
+from gdk.common.BuildManifest import BuildManifest
 from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile, CaseInsensitiveDict
 from gdk.commands.component.config.ComponentBuildConfiguration import ComponentBuildConfiguration
 from gdk.common.config.GDKProject import GDKProject
@@ -40,10 +43,12 @@ class BuildRecipeTransformerTest(TestCase):
         build_folders = [Path("zip-build").resolve()]
         mock_update = self.mocker.patch.object(BuildRecipeTransformer, "update_component_recipe_file", return_value=None)
         mock_create = self.mocker.patch.object(BuildRecipeTransformer, "create_build_recipe_file", return_value=None)
+        mock_save_manifest = self.mocker.patch.object(BuildManifest, "save", return_value=None)
         brg.transform(build_folders)
 
         assert mock_update.call_args_list == [call(self.mock_component_recipe.return_value, build_folders)]
         assert mock_create.call_args_list == [call(self.mock_component_recipe.return_value)]
+        assert mock_save_manifest.call_count == 1
 
     def test_transform_oversized_recipe(self):
         self.mocker.patch("gdk.common.utils.is_recipe_size_valid", return_value=[False, 17000])
@@ -166,8 +171,10 @@ class BuildRecipeTransformerTest(TestCase):
 
     def test_is_artifact_in_build(self):
         zip_build_path = [Path("zip-build").resolve()]
-        mock_shutil_copy = self.mocker.patch("shutil.copy")
+        mock_copy = self.mocker.patch("gdk.common.utils.copy_artifact_with_hash", return_value="digest")
+        mock_record = self.mocker.patch.object(BuildManifest, "record")
         mock_is_file = self.mocker.patch("pathlib.Path.is_file", return_value=True)
+        self.mocker.patch("pathlib.Path.stat", return_value=os.stat_result((0o100644, 0, 0, 1, 0, 0, 10, 0, 0, 0)))
         pc = ComponentBuildConfiguration({})
         brg = BuildRecipeTransformer(pc)
         artifact_uri = CaseInsensitiveDict(
@@ -175,17 +182,18 @@ class BuildRecipeTransformerTest(TestCase):
         )
         assert brg.is_artifact_in_build(artifact_uri, zip_build_path)
 
-        assert mock_shutil_copy.called
+        assert mock_copy.called
         assert mock_is_file.assert_called_once
-        mock_shutil_copy.assert_called_with(
+        mock_copy.assert_called_with(
             Path("zip-build").joinpath("hello_world.py").resolve(),
             pc.gg_build_component_artifacts_dir,
         )
+        mock_record.assert_called_with(pc.gg_build_component_artifacts_dir.joinpath("hello_world.py"), "digest")
         assert artifact_uri.to_dict() == {"uri": "s3://BUCKET_NAME/COMPONENT_NAME/COMPONENT_VERSION/hello_world.py"}
 
     def test_is_artifact_in_build_not_exists(self):
         zip_build_path = [Path("zip-build").resolve()]
-        mock_shutil_copy = self.mocker.patch("shutil.copy")
+        mock_copy = self.mocker.patch("gdk.common.utils.copy_artifact_with_hash")
         mock_is_file = self.mocker.patch("pathlib.Path.is_file", return_value=False)
         brg = BuildRecipeTransformer(ComponentBuildConfiguration({}))
         artifact_uri = CaseInsensitiveDict(
@@ -193,10 +201,32 @@ class BuildRecipeTransformerTest(TestCase):
         )
         assert not brg.is_artifact_in_build(artifact_uri, zip_build_path)
 
-        assert not mock_shutil_copy.called
+        assert not mock_copy.called
         assert mock_is_file.assert_called_once
         assert artifact_uri == {"uri": "s3://DOC-EXAMPLE-BUCKET/artifacts/com.example.HelloWorld/1.0.0/hello_world.py"}
 
+    def test_refresh_artifacts_copies_only_changed_artifacts(self):
+        mock_copy = self.mocker.patch("gdk.common.utils.copy_artifact_with_hash", return_value="digest")
+        mock_record = self.mocker.patch.object(BuildManifest, "record")
+        mock_save = self.mocker.patch.object(BuildManifest, "save")
+        brg = BuildRecipeTransformer(ComponentBuildConfiguration({}))
+        with tempfile.TemporaryDirectory() as build_folder:
+            changed = Path(build_folder).joinpath("changed.py")
+            unchanged = Path(build_folder).joinpath("unchanged.py")
+            changed.write_text("old")
+            unchanged.write_text("old")
+            for artifact_file in (changed, unchanged):
+                artifact = CaseInsensitiveDict({"URI": f"s3://bucket/{artifact_file.name}"})
+                assert brg.is_artifact_in_build(artifact, [build_folder])
+            mock_copy.reset_mock()
+            changed.write_text("changed")
+
+            brg.refresh_artifacts()
+
+        mock_copy.assert_called_once_with(changed.resolve(), brg.project_config.gg_build_component_artifacts_dir)
+        assert mock_record.call_count == 3
+        assert mock_save.called
+
     def test_find_artifacts_and_update_uri_mix_uri_in_recipe_call_counts(self):
         build_folders = [Path("zip-build").resolve()]
         recipe_mixed_uris = {
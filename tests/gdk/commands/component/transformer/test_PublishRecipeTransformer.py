@@ -1,6 +1,6 @@
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import call, Mock
+from unittest.mock import call
 
 import pytest
 
@@ -9,6 +9,7 @@ from gdk.common.CaseInsensitive import CaseInsensitiveRecipeFile, CaseInsensitiv
 from gdk.commands.component.config.ComponentPublishConfiguration import ComponentPublishConfiguration
 import boto3
 from botocore.stub import Stubber
+from gdk.aws_clients.ClientFactory import ClientFactory
 from gdk.common.config.GDKProject import GDKProject
 
 
@@ -43,9 +44,7 @@ class PublishRecipeTransformerTest(TestCase):
         self.gg_client_stub.activate()
         self.sts_client_stub.activate()
         self.sts_client_stub.add_response("get_caller_identity", {"Account": "123456789012"})
-        boto3_ses = Mock()
-        boto3_ses.get_partition_for_region.return_value = "aws"
-        self.mocker.patch("boto3.Session", return_value=boto3_ses)
+        self.mocker.patch.object(ClientFactory, "get_partition", return_value="aws")
         self.gg_client_stub.add_response(
             "list_component_versions",
             {
@@ -223,22 +222,27 @@ class PublishRecipeTransformerTest(TestCase):
         assert not mock_glob.called
 
     def test_create_publish_recipe_file_good_recipe_size(self):
-        self.mocker.patch("gdk.common.utils.is_recipe_size_valid", return_value=[True, 1000])
+        self.mocker.patch("gdk.common.utils.is_recipe_data_size_valid", return_value=[True, 1000])
         prg = PublishRecipeTransformer(ComponentPublishConfiguration({}))
         cis_recipe = CaseInsensitiveDict(fake_recipe())
         mocker_recipe_write = self.mocker.patch.object(CaseInsensitiveRecipeFile, "write")
         prg.create_publish_recipe_file(cis_recipe)
         recipe_path = Path(prg.project_config.publish_recipe_file).resolve()
-        assert mocker_recipe_write.call_args_list == [call(recipe_path, cis_recipe)]
+        data = CaseInsensitiveRecipeFile().serialize(recipe_path, cis_recipe)
+        assert mocker_recipe_write.call_args_list == [call(recipe_path, cis_recipe, data)]
 
     def test_create_publish_recipe_file_oversized_recipe(self):
-        self.mocker.patch("gdk.common.utils.is_recipe_size_valid", return_value=[False, 17000])
         prg = PublishRecipeTransformer(ComponentPublishConfiguration({}))
         cis_recipe = CaseInsensitiveDict(fake_recipe())
-        self.mocker.patch.object(CaseInsensitiveRecipeFile, "write")
+        cis_recipe.update_value("ComponentDescription", "x" * 16000)
+        mock_write = self.mocker.patch.object(CaseInsensitiveRecipeFile, "write")
+        mock_open = self.mocker.patch("builtins.open")
         with pytest.raises(Exception) as e:
             prg.create_publish_recipe_file(cis_recipe)
-        assert "is too big with a size of 17000 bytes. Component recipes must be 16 kB or smaller" in str(e)
+        size = len(CaseInsensitiveRecipeFile().serialize(prg.project_config.publish_recipe_file, cis_recipe))
+        assert f"is too big with a size of {size} bytes. Component recipes must be 16 kB or smaller" in str(e)
+        assert not mock_write.called
+        assert not mock_open.called
 
 
 def config():
@@ -129,6 +129,8 @@ def test_check_custom_build_commands_invalid(invalid_custom_build_command):
         '{"excludes": [".gitignore"], "zip_name": "my_component.zip", "extra": "foo"}',
         '{"EXCLUDES": [".gitignore"], "ZIP_NAME": "my_component.zip"}',
         '{"excludes": [], "zip_name": ""}',
+        '{"reproducible": false}',
+        '{"store": ["**/*.onnx", "**/*.gz"]}',
         "{}",
     ],
 )
@@ -149,6 +151,9 @@ def test_check_build_options_valid(valid_build_options):
         '{"excludes": [], "zip_name": 7}',
         '{"excludes": {}, "zip_name": ""}',
         '{"excludes": ["ok", 2], "zip_name": ""}',
+        '{"reproducible": "yes"}',
+        '{"store": "**/*.onnx"}',
+        '{"store": [1]}',
     ],
 )
 def test_check_build_options_invalid(invalid_build_options):
@@ -0,0 +1,32 @@
+from unittest import TestCase
+
+import pytest
+
+import gdk.common.consts as consts
+from gdk.commands.daemon.StartCommand import StartCommand
+from gdk.common.DaemonServer import DaemonServer
+
+
+class StartCommandTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.mock_server = self.mocker.patch("gdk.commands.daemon.StartCommand.DaemonServer", autospec=DaemonServer)
+
+    def test_GIVEN_no_idle_timeout_WHEN_run_THEN_serve_with_default_idle_timeout(self):
+        StartCommand({"idle_timeout": None}).run()
+
+        self.mock_server.assert_called_once_with(idle_timeout_seconds=consts.DAEMON_IDLE_TIMEOUT_SECONDS)
+        assert self.mock_server.return_value.serve.called
+
+    def test_GIVEN_idle_timeout_WHEN_run_THEN_serve_with_idle_timeout(self):
+        StartCommand({"idle_timeout": "90"}).run()
+
+        self.mock_server.assert_called_once_with(idle_timeout_seconds=90.0)
+
+    def test_GIVEN_invalid_idle_timeout_WHEN_run_THEN_raise_exception(self):
+        for idle_timeout in ("soon", "0", "-5"):
+            with pytest.raises(Exception) as e:
+                StartCommand({"idle_timeout": idle_timeout}).run()
+            assert f"the idle timeout '{idle_timeout}' is not a positive number" in e.value.args[0]
+        assert not self.mock_server.called
@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+import pytest
+
+from gdk.commands.daemon.StopCommand import StopCommand
+
+
+class StopCommandTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker, caplog):
+        self.mocker = mocker
+        self.caplog = caplog
+
+    def test_GIVEN_running_daemon_WHEN_run_THEN_stop_it(self):
+        mock_stop = self.mocker.patch("gdk.common.DaemonClient.stop", return_value=True)
+
+        StopCommand({}).run()
+
+        assert mock_stop.called
+        assert "Stopped the gdk daemon." in self.caplog.text
+
+    def test_GIVEN_no_daemon_WHEN_run_THEN_log_it(self):
+        self.mocker.patch("gdk.common.DaemonClient.stop", return_value=False)
+
+        StopCommand({}).run()
+
+        assert "No gdk daemon is running." in self.caplog.text
@@ -0,0 +1,21 @@
+from gdk.commands.daemon import daemon
+from gdk.commands.daemon.StartCommand import StartCommand
+from gdk.commands.daemon.StopCommand import StopCommand
+
+
+def test_daemon_start(mocker):
+    mock_start_command = mocker.patch.object(StartCommand, "__init__", return_value=None)
+    mock_start_command_run = mocker.patch.object(StartCommand, "run", return_value=None)
+    d_args = {"idle_timeout": None}
+    daemon.start(d_args)
+    mock_start_command.assert_called_with(d_args)
+    assert mock_start_command_run.call_count == 1
+
+
+def test_daemon_stop(mocker):
+    mock_stop_command = mocker.patch.object(StopCommand, "__init__", return_value=None)
+    mock_stop_command_run = mocker.patch.object(StopCommand, "run", return_value=None)
+    d_args = {}
+    daemon.stop(d_args)
+    mock_stop_command.assert_called_with(d_args)
+    assert mock_stop_command_run.call_count == 1
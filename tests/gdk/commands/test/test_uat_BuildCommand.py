@@ -5,6 +5,7 @@ from gdk.commands.test.BuildCommand import BuildCommand
 from pathlib import Path
 from unittest import mock
 import platform
+from gdk.common.BuildManifest import BuildManifest
 from gdk.common.CaseInsensitive import CaseInsensitiveDict, CaseInsensitiveRecipeFile
 import os
 import gdk.common.consts as consts
@@ -132,12 +133,15 @@ class BuildCommandUnitTest(TestCase):
                             .absolute()
                             .joinpath("greengrass-build/artifacts/abc/1.0.0/somefile.json")
                             .resolve()
-                            .as_uri()
+                            .as_uri(),
+                            "Digest": "hash",
+                            "Algorithm": "SHA-256",
                         }
                     ]
                 }
             ],
         }
+        self.mocker.patch("gdk.common.utils.artifact_encoded_hash", return_value="hash")
         mock_read = self.mocker.patch(
             "gdk.common.CaseInsensitive.CaseInsensitiveRecipeFile.read",
             return_value=CaseInsensitiveDict(test_recipe),
@@ -148,6 +152,25 @@ class BuildCommandUnitTest(TestCase):
         assert mock_read.call_args_list == [call(Path(".").joinpath("recipe.yaml"))]
         assert spy_write.call_args_list == [call(ANY, Path("e2e_test_recipe.yaml"), updated_recipe)]
 
+    def test_GIVEN_digest_in_build_manifest_WHEN_create_test_recipe_THEN_add_digest_of_local_artifact(self):
+        self.mocker.patch("pathlib.Path.exists", return_value=True)
+        mock_get_digest = self.mocker.patch.object(BuildManifest, "get_digest", return_value="digest")
+        build_cmd = BuildCommand({})
+        build_cmd.should_create_e2e_test_recipe = True
+        test_recipe = {"componentVersion": "2.2.2", "manifests": [{"artifacts": [{"Uri": "s3://somefile.json"}]}]}
+        self.mocker.patch(
+            "gdk.common.CaseInsensitive.CaseInsensitiveRecipeFile.read",
+            return_value=CaseInsensitiveDict(test_recipe),
+        )
+        mock_write = self.mocker.patch.object(CaseInsensitiveRecipeFile, "write")
+
+        build_cmd.create_e2e_test_recipe_file(Path("recipe.yaml"), Path("e2e_test_recipe.yaml"))
+
+        artifact_path = Path().absolute().joinpath("greengrass-build/artifacts/abc/1.0.0/somefile.json").resolve()
+        assert mock_get_digest.call_args_list == [call(artifact_path)]
+        artifact = mock_write.call_args.args[1].to_dict()["manifests"][0]["artifacts"][0]
+        assert artifact == {"Uri": artifact_path.as_uri(), "Digest": "digest", "Algorithm": "SHA-256"}
+
     def test_create_e2e_test_recipe_from_should_not_create_e2e_test_recipe(self):
         self.mocker.patch("pathlib.Path.exists", return_value=True)
 
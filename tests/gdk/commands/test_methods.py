@@ -35,3 +35,15 @@ def test_gdk_config_update(mocker):
     mock_config_update = mocker.patch("gdk.commands.config.config.update", return_value=None)
     methods._gdk_config_update({})
     assert mock_config_update.call_count == 1
+
+
+def test_gdk_daemon_start(mocker):
+    mock_daemon_start = mocker.patch("gdk.commands.daemon.daemon.start", return_value=None)
+    methods._gdk_daemon_start({})
+    assert mock_daemon_start.call_count == 1
+
+
+def test_gdk_daemon_stop(mocker):
+    mock_daemon_stop = mocker.patch("gdk.commands.daemon.daemon.stop", return_value=None)
+    methods._gdk_daemon_stop({})
+    assert mock_daemon_stop.call_count == 1
@@ -0,0 +1,54 @@
+import os
+from unittest import TestCase, mock
+
+import pytest
+
+from gdk.common.BuildManifest import BuildManifest
+
+
+class BuildManifestTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, tmp_path):
+        self.gg_build_dir = tmp_path.joinpath("greengrass-build")
+        self.artifact = self.gg_build_dir.joinpath("artifacts", "abc", "1.0.0", "hello.py")
+        self.artifact.parent.mkdir(parents=True)
+        self.artifact.write_text("print('hello')")
+
+    def test_GIVEN_recorded_digest_WHEN_saved_and_loaded_THEN_return_digest(self):
+        manifest = BuildManifest(self.gg_build_dir)
+        manifest.record(self.artifact, "digest")
+        manifest.save()
+
+        assert BuildManifest(self.gg_build_dir).get_digest(self.artifact) == "digest"
+        assert manifest.manifest_file.read_text().count("artifacts/abc/1.0.0/hello.py") == 1
+
+    def test_GIVEN_artifact_changed_after_build_WHEN_get_digest_THEN_return_none(self):
+        manifest = BuildManifest(self.gg_build_dir)
+        manifest.record(self.artifact, "digest")
+        manifest.save()
+        self.artifact.write_text("print('changed')")
+        os.utime(self.artifact, ns=(0, 0))
+
+        assert BuildManifest(self.gg_build_dir).get_digest(self.artifact) is None
+
+    def test_GIVEN_no_manifest_or_unreadable_manifest_WHEN_get_digest_THEN_return_none(self):
+        assert BuildManifest(self.gg_build_dir).get_digest(self.artifact) is None
+
+        self.gg_build_dir.joinpath("build-manifest.json").write_text("not json")
+        manifest = BuildManifest(self.gg_build_dir)
+        assert manifest.get_digest(self.artifact) is None
+        manifest.record(self.artifact, "digest")
+        manifest.save()
+        assert BuildManifest(self.gg_build_dir).get_digest(self.artifact) == "digest"
+
+    def test_GIVEN_recorded_and_unrecorded_artifacts_WHEN_get_digests_THEN_hash_only_unrecorded_artifacts(self):
+        other_artifact = self.artifact.with_name("other.py")
+        other_artifact.write_text("print('other')")
+        manifest = BuildManifest(self.gg_build_dir)
+        manifest.record(self.artifact, "digest")
+
+        with mock.patch("gdk.common.utils.hash_artifacts", return_value={other_artifact: "other-digest"}) as mock_hash:
+            digests = manifest.get_digests([self.artifact, other_artifact])
+
+        assert digests == {self.artifact: "digest", other_artifact: "other-digest"}
+        assert mock_hash.call_args.args[0] == [other_artifact]
@@ -93,6 +93,56 @@ class CaseInsensitiveRecipeFileTest(TestCase):
                 CaseInsensitiveRecipeFile().write(tmp_path, contents)
             assert "Recipe file must be in json or yaml format" in e.value.args[0]
 
+    def test_GIVEN_unchanged_recipe_WHEN_read_again_THEN_return_copy_of_cached_recipe(self):
+        yaml_file = Path(".").joinpath("tests/gdk/static/project_utils").joinpath("valid_component_recipe.yaml").resolve()
+        spy_load = self.mocker.spy(yaml, "load")
+
+        first = CaseInsensitiveRecipeFile().read(yaml_file)
+        first.update_value("ComponentVersion", "9.9.9")
+        second = CaseInsensitiveRecipeFile().read(yaml_file)
+
+        assert spy_load.call_count == 1
+        assert second["componentversion"] != "9.9.9"
+        assert second.to_dict() is not first.to_dict()
+
+    def test_GIVEN_written_recipe_WHEN_read_THEN_use_cache_until_file_changes(self):
+        spy_load = self.mocker.spy(yaml, "load")
+        with tempfile.TemporaryDirectory() as newDir:
+            tmp_path = Path(newDir).joinpath("recipe.yaml").resolve()
+            recipe = CaseInsensitiveDict({"ComponentName": "a", "ComponentVersion": "1.0.0"})
+            CaseInsensitiveRecipeFile().write(tmp_path, recipe)
+
+            assert CaseInsensitiveRecipeFile().read(tmp_path)["componentversion"] == "1.0.0"
+            assert not spy_load.called
+
+            tmp_path.write_text("ComponentName: a\nComponentVersion: 2.0.0\n")
+            assert CaseInsensitiveRecipeFile().read(tmp_path)["componentversion"] == "2.0.0"
+            assert spy_load.call_count == 1
+
+    def test_GIVEN_libyaml_WHEN_read_and_write_yaml_THEN_use_c_loader_and_dumper(self):
+        if not hasattr(yaml, "CSafeLoader"):
+            pytest.skip("PyYAML is built without libyaml.")
+        spy_load = self.mocker.spy(yaml, "load")
+        spy_dump = self.mocker.spy(yaml, "dump")
+        yaml_file = Path(".").joinpath("tests/gdk/static/project_utils").joinpath("valid_component_recipe.yaml").resolve()
+        with tempfile.TemporaryDirectory() as newDir:
+            CaseInsensitiveRecipeFile().write(Path(newDir).joinpath("valid.yaml"), CaseInsensitiveRecipeFile().read(yaml_file))
+
+        assert spy_load.call_args.kwargs["Loader"] is yaml.CSafeLoader
+        assert spy_dump.call_args.kwargs["Dumper"] is yaml.CSafeDumper
+
+    def test_GIVEN_failed_write_WHEN_write_THEN_keep_existing_recipe_file(self):
+        with tempfile.TemporaryDirectory() as newDir:
+            tmp_path = Path(newDir).joinpath("recipe.json").resolve()
+            tmp_path.write_text('{"ComponentVersion": "1.0.0"}')
+            self.mocker.patch("os.replace", side_effect=OSError("disk full"))
+
+            with pytest.raises(OSError):
+                CaseInsensitiveRecipeFile().write(tmp_path, CaseInsensitiveDict({"ComponentVersion": "2.0.0"}))
+
+            assert json.loads(tmp_path.read_text()) == {"ComponentVersion": "1.0.0"}
+            assert [p.name for p in Path(newDir).iterdir()] == ["recipe.json"]
+
 
 class CaseInsensitiveDictTest(TestCase):
     @pytest.fixture(autouse=True)
@@ -129,3 +179,75 @@ class CaseInsensitiveDictTest(TestCase):
             "key2": [{"key21": "updated-value21"}, {"key22": "value22"}],
             "key3": {"key31": {"key311": "key312"}},
         }
+
+    def test_GIVEN_nested_recipe_WHEN_converted_THEN_wrap_children_lazily_without_copying(self):
+        dictionary = {"Manifests": [{"Artifacts": [{"URI": "s3://a"}]}], "Lifecycle": {"Run": "python3 a.py"}}
+        cis = CaseInsensitiveDict(dictionary)
+
+        assert cis._children == {}
+        assert cis.to_dict() is dictionary
+        assert cis["manifests"] is cis["MANIFESTS"]
+        assert cis["manifests"][0].to_dict() is dictionary["Manifests"][0]
+        assert list(cis._children) == ["manifests"]
+
+        cis["manifests"][0]["artifacts"][0].update_value("uri", "s3://b")
+        assert dictionary["Manifests"][0]["Artifacts"][0] == {"URI": "s3://b"}
+
+    def test_GIVEN_key_in_other_case_WHEN_set_item_THEN_replace_key_in_place(self):
+        cis = CaseInsensitiveDict({"first": 1, "Second": 2, "third": 3})
+
+        cis["SECOND"] = {"nested": True}
+        del cis["THIRD"]
+
+        assert list(cis.to_dict().items()) == [("first", 1), ("SECOND", {"nested": True})]
+        assert cis["second"]["NESTED"] is True
+        assert "third" not in cis
+        assert cis == {"FIRST": 1, "second": {"nested": True}}
+
+    def test_GIVEN_nested_keys_in_other_case_WHEN_compared_THEN_equal(self):
+        cis = CaseInsensitiveDict({"A": {"B": 1}, "List": [{"C": 2}]})
+
+        assert cis == CaseInsensitiveDict({"a": {"b": 1}, "list": [{"c": 2}]})
+        assert cis == {"a": {"b": 1}, "LIST": [{"c": 2}]}
+        assert cis == {"a": CaseInsensitiveDict({"b": 1}), "list": [{"C": 2}]}
+        assert cis != CaseInsensitiveDict({"a": {"b": 2}, "list": [{"c": 2}]})
+        assert cis != {"a": {"b": 1}}
+
+    def test_GIVEN_views_WHEN_set_as_values_THEN_store_plain_data(self):
+        cis = CaseInsensitiveDict({"Manifests": []})
+        artifact = CaseInsensitiveDict({"URI": "s3://a"})
+
+        cis.update_value("manifests", [CaseInsensitiveDict({"Artifacts": [artifact]}), "other"])
+
+        assert cis.to_dict() == {"Manifests": [{"Artifacts": [{"URI": "s3://a"}]}, "other"]}
+        assert type(cis.to_dict()["Manifests"][0]) is dict
+        assert cis["manifests"][0]["artifacts"][0]["uri"] == "s3://a"
+
+    def test_GIVEN_list_view_WHEN_items_added_THEN_update_underlying_list(self):
+        dictionary = {"Manifests": [{"Artifacts": [{"URI": "s3://a"}]}]}
+        cis = CaseInsensitiveDict(dictionary)
+
+        artifacts = cis["manifests"][0]["artifacts"]
+        artifacts.append(CaseInsensitiveDict({"URI": "s3://b"}))
+        artifacts.insert(0, {"Uri": "docker:image"})
+
+        assert dictionary["Manifests"][0]["Artifacts"] == [{"Uri": "docker:image"}, {"URI": "s3://a"}, {"URI": "s3://b"}]
+        assert [artifact["uri"] for artifact in artifacts] == ["docker:image", "s3://a", "s3://b"]
+        assert artifacts[1] is artifacts[1]
+        assert artifacts == [{"uri": "docker:image"}, {"uri": "s3://a"}, {"uri": "s3://b"}]
+
+    def test_GIVEN_recipe_WHEN_normalized_THEN_share_lowercase_copy_until_updated(self):
+        dictionary = {"ComponentName": "a", "Manifests": [{"Artifacts": [{"URI": "s3://a"}]}]}
+        cis = CaseInsensitiveDict(dictionary)
+
+        normalized = cis.normalized()
+        assert normalized == {"componentname": "a", "manifests": [{"artifacts": [{"uri": "s3://a"}]}]}
+        assert cis.normalized() is normalized
+
+        cis["manifests"][0]["artifacts"][0].update_value("Uri", "s3://b")
+        assert cis.normalized()["manifests"][0]["artifacts"][0]["uri"] == "s3://b"
+        assert normalized["manifests"][0]["artifacts"][0]["uri"] == "s3://a"
+        assert dictionary["Manifests"][0]["Artifacts"][0] == {"URI": "s3://b"}
+
+        cis["manifests"][0]["artifacts"].append({"URI": "s3://c"})
+        assert len(cis.normalized()["manifests"][0]["artifacts"]) == 2
@@ -0,0 +1,107 @@
+import io
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from gdk.common import DaemonClient
+
+requires_unix_sockets = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported")
+
+
+class DaemonClientTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = Path(self.temp_dir.name).joinpath("daemon.sock")
+        yield
+        self.temp_dir.cleanup()
+
+    def _serve_once(self, *responses):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        server.listen()
+        requests = []
+
+        def _serve():
+            with server:
+                connection, _ = server.accept()
+                with connection:
+                    requests.append(next(DaemonClient.read_messages(connection)))
+                    for response in responses:
+                        DaemonClient.send_message(connection, response)
+
+        thread = threading.Thread(target=_serve)
+        thread.start()
+        return thread, requests
+
+    def test_can_forward(self):
+        assert DaemonClient.can_forward(["component", "build"])
+        assert DaemonClient.can_forward(["component", "publish", "-d"])
+        assert DaemonClient.can_forward(["component", "list", "--template"])
+        assert not DaemonClient.can_forward(["component", "build", "--watch"])
+        assert not DaemonClient.can_forward(["component", "init", "-n", "HelloWorld"])
+        assert not DaemonClient.can_forward(["config", "update", "--component"])
+        assert not DaemonClient.can_forward(["daemon", "start"])
+        assert not DaemonClient.can_forward([])
+
+    def test_GIVEN_no_daemon_WHEN_forward_or_stop_THEN_run_locally(self):
+        assert DaemonClient.forward(["component", "build"], self.socket_path) is None
+        assert not DaemonClient.stop(self.socket_path)
+
+    @requires_unix_sockets
+    def test_GIVEN_daemon_WHEN_forward_THEN_stream_output_and_return_exit_code(self):
+        thread, requests = self._serve_once(
+            {"stream": "stdout", "data": "out\n"}, {"stream": "stderr", "data": "log\n"}, {"exit_code": 2}
+        )
+        stdout = self.mocker.patch("sys.stdout", new=io.StringIO())
+        stderr = self.mocker.patch("sys.stderr", new=io.StringIO())
+
+        assert DaemonClient.forward(["component", "build", "-d"], self.socket_path) == 2
+
+        thread.join()
+        assert stdout.getvalue() == "out\n"
+        assert stderr.getvalue() == "log\n"
+        assert requests[0]["argv"] == ["component", "build", "-d"]
+        assert Path(requests[0]["cwd"]) == Path.cwd()
+        assert "PATH" in requests[0]["env"]
+
+    @requires_unix_sockets
+    def test_GIVEN_daemon_of_other_version_WHEN_forward_THEN_run_locally(self):
+        thread, _ = self._serve_once({"refused": "The gdk daemon runs gdk version 0.0.1."})
+
+        assert DaemonClient.forward(["component", "build"], self.socket_path) is None
+        thread.join()
+
+    @requires_unix_sockets
+    def test_GIVEN_daemon_WHEN_stop_THEN_request_stop(self):
+        thread, requests = self._serve_once({"exit_code": 0})
+
+        assert DaemonClient.stop(self.socket_path)
+        thread.join()
+        assert requests == [{"stop": True}]
+
+    def test_GIVEN_command_runs_in_daemon_WHEN_main_THEN_exit_with_its_exit_code(self):
+        self.mocker.patch("sys.argv", ["gdk", "component", "build"])
+        mock_forward = self.mocker.patch("gdk.common.DaemonClient.forward", return_value=3)
+        mock_cli_main = self.mocker.patch("gdk.CLIParser.main")
+
+        with pytest.raises(SystemExit) as e:
+            DaemonClient.main()
+
+        assert e.value.code == 3
+        mock_forward.assert_called_once_with(["component", "build"])
+        assert not mock_cli_main.called
+
+    def test_GIVEN_no_daemon_WHEN_main_THEN_run_command_locally(self):
+        self.mocker.patch("sys.argv", ["gdk", "component", "build"])
+        self.mocker.patch("gdk.common.DaemonClient.forward", return_value=None)
+        mock_cli_main = self.mocker.patch("gdk.CLIParser.main")
+
+        DaemonClient.main()
+
+        assert mock_cli_main.called
@@ -0,0 +1,180 @@
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+import gdk._version as version
+from gdk.common import DaemonClient
+from gdk.common.DaemonServer import DaemonServer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported")
+
+
+class DaemonServerTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.mock_version_check = self.mocker.patch("gdk.common.utils.cli_version_check")
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = Path(self.temp_dir.name).joinpath("daemon.sock")
+        self.server_thread = None
+        yield
+        if self.server_thread is not None:
+            DaemonClient.stop(self.socket_path)
+            self.server_thread.join()
+        self.temp_dir.cleanup()
+
+    def _start_server(self, idle_timeout_seconds=30):
+        server = DaemonServer(self.socket_path, idle_timeout_seconds=idle_timeout_seconds)
+        self.server_thread = threading.Thread(target=server.serve)
+        self.server_thread.start()
+        # A connection without a request is dropped by the server.
+        connection = DaemonClient.connect(self.socket_path)
+        while connection is None:
+            time.sleep(0.01)
+            connection = DaemonClient.connect(self.socket_path)
+        connection.close()
+        return server
+
+    def _send(self, request):
+        with DaemonClient.connect(self.socket_path) as connection:
+            DaemonClient.send_message(connection, request)
+            return list(DaemonClient.read_messages(connection))
+
+    def _request(self, argv, cwd=None, env=None):
+        return {"version": version.__version__, "argv": argv, "cwd": cwd or os.getcwd(), "env": env or dict(os.environ)}
+
+    def test_GIVEN_command_WHEN_run_in_daemon_THEN_run_in_client_context_and_stream_output(self):
+        seen = {}
+
+        def _main(check_version):
+            seen.update(
+                check_version=check_version, cwd=os.getcwd(), argv=sys.argv, env=os.environ.get("GDK_DAEMON_TEST")
+            )
+            logging.getLogger().setLevel(logging.DEBUG)
+            os.write(1, "output of gdk ✓\n".encode("utf-8"))
+            subprocess.run([sys.executable, "-c", "import sys; sys.stderr.write('output of a build tool')"], check=True)
+            sys.exit(3)
+
+        self.mocker.patch("gdk.CLIParser.main", side_effect=_main)
+        self._start_server()
+        cwd = os.getcwd()
+        level = logging.getLogger().level
+
+        messages = self._send(
+            self._request(["component", "build"], self.temp_dir.name, {**os.environ, "GDK_DAEMON_TEST": "client"})
+        )
+
+        assert messages[-1] == {"exit_code": 3}
+        output = {stream: "".join(m["data"] for m in messages if m.get("stream") == stream) for stream in ("stdout", "stderr")}
+        assert output == {"stdout": "output of gdk ✓\n", "stderr": "output of a build tool"}
+        assert seen == {
+            "check_version": False,
+            "cwd": os.path.realpath(self.temp_dir.name),
+            "argv": ["gdk", "component", "build"],
+            "env": "client",
+        }
+        assert os.getcwd() == cwd
+        assert "GDK_DAEMON_TEST" not in os.environ
+        assert logging.getLogger().level == level
+        assert self.mock_version_check.call_count == 1
+
+    def test_GIVEN_client_of_other_version_WHEN_request_THEN_refuse_it(self):
+        mock_main = self.mocker.patch("gdk.CLIParser.main")
+        self._start_server()
+
+        messages = self._send({**self._request(["component", "build"]), "version": "0.0.1"})
+
+        assert list(messages[0]) == ["refused"]
+        assert not mock_main.called
+
+    def test_GIVEN_build_in_watch_mode_WHEN_request_THEN_refuse_it(self):
+        mock_main = self.mocker.patch("gdk.CLIParser.main")
+        self._start_server()
+
+        for argv in (["component", "build", "--wat"], ["component", "build", "-dw"]):
+            messages = self._send(self._request(argv))
+            assert list(messages[0]) == ["refused"]
+        assert not mock_main.called
+
+    def test_GIVEN_invalid_arguments_WHEN_request_THEN_run_command_to_report_them(self):
+        mock_main = self.mocker.patch("gdk.CLIParser.main")
+        self._start_server()
+
+        messages = self._send(self._request(["component", "build", "--unknown-option"]))
+
+        assert messages == [{"exit_code": 0}]
+        assert mock_main.called
+
+    def test_GIVEN_malformed_request_WHEN_request_THEN_refuse_it_and_keep_serving(self):
+        mock_main = self.mocker.patch("gdk.CLIParser.main")
+        self._start_server()
+        request = self._request(["component", "build"])
+
+        for malformed_request in (
+            {key: value for key, value in request.items() if key != "argv"},
+            {**request, "argv": "component build"},
+            {**request, "cwd": None},
+            {**request, "env": {"GDK_DAEMON_TEST": 1}},
+            ["component", "build"],
+        ):
+            messages = self._send(malformed_request)
+            assert list(messages[0]) == ["refused"]
+        assert not mock_main.called
+
+        assert self._send(request) == [{"exit_code": 0}]
+        assert mock_main.called
+
+    def test_GIVEN_stop_request_WHEN_serve_THEN_stop_and_remove_socket(self):
+        self._start_server()
+
+        assert DaemonClient.stop(self.socket_path)
+
+        self.server_thread.join()
+        self.server_thread = None
+        assert not self.socket_path.exists()
+
+    def test_GIVEN_no_commands_WHEN_idle_timeout_passes_THEN_stop(self):
+        DaemonServer(self.socket_path, idle_timeout_seconds=0.1).serve()
+
+        assert not self.socket_path.exists()
+
+    def test_GIVEN_running_daemon_WHEN_serve_THEN_raise_exception(self):
+        self._start_server()
+
+        with pytest.raises(Exception) as e:
+            DaemonServer(self.socket_path).serve()
+
+        assert "another gdk daemon is already listening" in e.value.args[0]
+
+    def test_GIVEN_stale_socket_WHEN_serve_THEN_replace_it(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(self.socket_path))
+        stale.close()
+
+        self._start_server()
+
+        assert DaemonClient.stop(self.socket_path)
+
+    def test_GIVEN_credentials_change_WHEN_refresh_state_THEN_create_new_clients(self):
+        mock_clear_clients = self.mocker.patch("gdk.aws_clients.ClientFactory.ClientFactory.clear")
+        mock_clear_versions = self.mocker.patch("gdk.aws_clients.ComponentVersionResolver.ComponentVersionResolver.clear")
+        server = DaemonServer(self.socket_path)
+
+        self.mocker.patch.dict(os.environ, {"AWS_PROFILE": "dev"})
+        server._refresh_state()
+        server._refresh_state()
+        assert mock_clear_clients.call_count == 1
+
+        self.mocker.patch.dict(os.environ, {"AWS_PROFILE": "prod"})
+        server._refresh_state()
+        assert mock_clear_clients.call_count == 2
+        assert mock_clear_versions.call_count == 3
@@ -0,0 +1,89 @@
+import threading
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from gdk.common.DownloadCache import DownloadCache
+
+
+class DownloadCacheTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker, tmpdir):
+        self.mocker = mocker
+        self.tmpdir = Path(tmpdir)
+        self.cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        self.url = "https://some-host/releases/greengrass-latest.zip?version=1"
+
+    def test_given_default_cache_dir_when_init_then_use_downloads_dir_under_gdk_user_dir(self):
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=self.tmpdir.joinpath(".gdk"))
+        assert DownloadCache().cache_dir == self.tmpdir.joinpath(".gdk", "downloads")
+
+    def test_given_url_when_get_entry_path_then_return_file_named_after_url_in_entry_dir(self):
+        entry = self.cache.get_entry_path(self.url)
+        assert entry.name == "greengrass-latest.zip"
+        assert entry.parent.parent == self.tmpdir.joinpath("cache")
+        assert entry.parent.exists()
+        assert entry != self.cache.get_entry_path("https://other-host/releases/greengrass-latest.zip")
+
+    def test_given_no_cached_file_when_get_conditional_headers_then_return_empty_headers(self):
+        self.cache.save_validators(self.url, {"ETag": '"some-etag"'})
+        assert self.cache.get_conditional_headers(self.url) == {}
+
+    def test_given_cached_file_with_validators_when_get_conditional_headers_then_return_conditional_headers(self):
+        self.cache.get_entry_path(self.url).write_bytes(b"content")
+        self.cache.save_validators(self.url, {"ETag": '"some-etag"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert self.cache.get_conditional_headers(self.url) == {
+            "If-None-Match": '"some-etag"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+    def test_given_cached_file_with_corrupt_metadata_when_get_conditional_headers_then_return_empty_headers(self):
+        entry = self.cache.get_entry_path(self.url)
+        entry.write_bytes(b"content")
+        entry.parent.joinpath(".metadata.json").write_text("{not json")
+        assert self.cache.get_conditional_headers(self.url) == {}
+
+    def test_given_cached_file_when_place_then_hard_link_it_to_destination(self):
+        entry = self.cache.get_entry_path(self.url)
+        entry.write_bytes(b"content")
+        destination = self.tmpdir.joinpath("greengrass-build", "greengrass-nucleus-latest.zip")
+        destination.parent.mkdir()
+        destination.write_bytes(b"old-content")
+
+        self.cache.place(self.url, destination)
+
+        assert destination.samefile(entry)
+        assert destination.read_bytes() == b"content"
+        assert list(destination.parent.iterdir()) == [destination]
+
+    def test_given_hard_link_not_possible_when_place_then_copy_it_to_destination(self):
+        self.mocker.patch("os.link", side_effect=OSError("Invalid cross-device link"))
+        entry = self.cache.get_entry_path(self.url)
+        entry.write_bytes(b"content")
+        destination = self.tmpdir.joinpath("greengrass-nucleus-latest.zip")
+
+        self.cache.place(self.url, destination)
+
+        assert not destination.samefile(entry)
+        assert destination.read_bytes() == b"content"
+
+    def test_given_entry_locked_when_lock_then_wait_until_it_is_released(self):
+        acquired = threading.Event()
+
+        def lock_entry():
+            with DownloadCache(self.tmpdir.joinpath("cache")).lock(self.url):
+                acquired.set()
+
+        with self.cache.lock(self.url):
+            waiter = threading.Thread(target=lock_entry)
+            waiter.start()
+            assert not acquired.wait(0.2)
+        waiter.join(5)
+
+        assert acquired.is_set()
+        assert self.cache.get_entry_path(self.url).parent.joinpath(".lock").exists()
+
+    def test_given_validators_when_save_validators_then_leave_no_temporary_file(self):
+        self.cache.save_validators(self.url, {"ETag": '"some-etag"'})
+        assert [f.name for f in self.cache.get_entry_path(self.url).parent.iterdir()] == [".metadata.json"]
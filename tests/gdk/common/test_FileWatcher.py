@@ -0,0 +1,84 @@
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from gdk.common.FileWatcher import FileWatcher, _InotifyBackend, _PollingBackend
+
+
+def is_ignored(path):
+    return path.startswith("build") or path.endswith(".tmp")
+
+
+class FileWatcherTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker):
+        self.mocker = mocker
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.root.joinpath("src").mkdir()
+        self.root.joinpath("build").mkdir()
+        self.root.joinpath("src", "main.py").write_text("print('hello')")
+        yield
+        self.temp_dir.cleanup()
+
+    def _assert_reports_changes(self, watcher):
+        try:
+            self.root.joinpath("src", "main.py").write_text("print('changed')")
+            self.root.joinpath("src", "main.py.tmp").write_text("ignored")
+            self.root.joinpath("build", "out.zip").write_text("ignored")
+            self.root.joinpath("lib").mkdir()
+            self.root.joinpath("lib", "util.py").write_text("util")
+
+            changes = watcher.wait_for_changes()
+
+            assert {"src/main.py", "lib/util.py"} <= changes
+            assert not any(is_ignored(path) for path in changes)
+
+            self.root.joinpath("src", "main.py").unlink()
+            assert "src/main.py" in watcher.wait_for_changes()
+        finally:
+            watcher.close()
+
+    def test_GIVEN_polling_WHEN_files_change_THEN_report_changed_paths_not_ignored(self):
+        self.mocker.patch.object(_InotifyBackend, "is_supported", return_value=False)
+        watcher = FileWatcher(self.root, is_ignored, debounce_seconds=0.05, poll_interval_seconds=0.05)
+
+        assert isinstance(watcher._backend, _PollingBackend)
+        self._assert_reports_changes(watcher)
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is only available on Linux")
+    def test_GIVEN_inotify_WHEN_files_change_THEN_report_changed_paths_not_ignored(self):
+        watcher = FileWatcher(self.root, is_ignored, debounce_seconds=0.05, poll_interval_seconds=0.05)
+
+        assert isinstance(watcher._backend, _InotifyBackend)
+        self._assert_reports_changes(watcher)
+
+    def test_GIVEN_inotify_fails_WHEN_create_watcher_THEN_poll_the_tree(self):
+        self.mocker.patch.object(_InotifyBackend, "is_supported", return_value=True)
+        self.mocker.patch.object(_InotifyBackend, "__init__", side_effect=OSError(28, "No space left on device"))
+
+        watcher = FileWatcher(self.root, is_ignored)
+
+        assert isinstance(watcher._backend, _PollingBackend)
+
+    def test_GIVEN_burst_of_changes_WHEN_wait_for_changes_THEN_debounce_into_one_set(self):
+        backend = self.mocker.Mock()
+        backend.read.side_effect = [set(), {"a.py"}, {"b.py"}, {"a.py", "c.py"}, set()]
+        watcher = FileWatcher(self.root, is_ignored)
+        watcher._backend = backend
+
+        assert watcher.wait_for_changes() == {"a.py", "b.py", "c.py"}
+        assert [c.args[0] for c in backend.read.call_args_list] == [watcher.poll_interval_seconds] * 2 + [
+            watcher.debounce_seconds
+        ] * 3
+
+    def test_GIVEN_overflow_WHEN_wait_for_changes_THEN_return_none(self):
+        backend = self.mocker.Mock()
+        backend.read.side_effect = [{"a.py"}, None]
+        watcher = FileWatcher(self.root, is_ignored)
+        watcher._backend = backend
+
+        assert watcher.wait_for_changes() is None
@@ -4,6 +4,7 @@ import pytest
 
 import gdk.common.consts as consts
 import gdk.common.utils as utils
+from gdk.common.CaseInsensitive import CaseInsensitiveDict
 from gdk.common.RecipeValidator import RecipeValidator
 
 
@@ -49,3 +50,24 @@ class RecipeValidatorTest(TestCase):
         with pytest.raises(Exception) as e:
             validator.validate_recipe(invalid_recipe_object)
         assert "ValidationError" in str(e)
+
+    def test_GIVEN_case_insensitive_recipe_WHEN_validate_recipe_THEN_validate_its_normalized_form(self):
+        recipe = CaseInsensitiveDict(
+            {
+                "RecipeFormatVersion": "2020-01-25",
+                "ComponentName": "com.example.hello",
+                "ComponentVersion": "1.0.0",
+                "Manifests": [{"Lifecycle": {"run": "echo Hello"}}],
+            }
+        )
+        spy_keys_to_lower = self.mocker.spy(RecipeValidator, "_keys_to_lower")
+        schema = utils.get_static_file_path(consts.recipe_schema_file)
+        validator = RecipeValidator(schema)
+
+        validator.validate_recipe(recipe)
+
+        assert not spy_keys_to_lower.called
+        recipe.update_value("RecipeFormatVersion", "202-01-25")
+        with pytest.raises(Exception) as e:
+            validator.validate_recipe(recipe)
+        assert "ValidationError" in str(e)
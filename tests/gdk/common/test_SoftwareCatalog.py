@@ -0,0 +1,128 @@
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+import requests
+from urllib3.exceptions import HTTPError
+
+import gdk.common.consts as consts
+from gdk.common.SoftwareCatalog import SoftwareCatalog
+
+
+class SoftwareCatalogTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def __inject_fixtures(self, mocker, tmpdir):
+        self.mocker = mocker
+        self.cache_dir = Path(tmpdir).joinpath("catalog")
+        self.mock_time = self.mocker.patch("time.time", return_value=1000.0)
+        self.components = {"HelloWorld-python": "python-url", "HelloWorld-java": "java-url"}
+
+    def _response(self, status_code=200, components=None, etag='"v1"'):
+        return self.mocker.Mock(
+            status_code=status_code, headers={"ETag": etag} if etag else {}, json=lambda: components or self.components
+        )
+
+    def test_given_default_cache_dir_when_init_then_use_catalog_dir_under_gdk_user_dir(self):
+        self.mocker.patch("gdk.common.utils.get_gdk_user_dir", return_value=Path("/home/.gdk"))
+        assert SoftwareCatalog("url").cache_dir == Path("/home/.gdk/catalog")
+
+    def test_given_no_cached_index_when_get_components_then_fetch_and_cache_index(self):
+        mock_get = self.mocker.patch("requests.get", return_value=self._response())
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+
+        mock_get.assert_called_once_with("url", timeout=30)
+
+    def test_given_stale_cached_index_when_get_components_then_revalidate_with_etag(self):
+        self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+        self.mock_time.return_value = 1000.0 + consts.CATALOG_CACHE_TTL_SECONDS
+        mock_get = self.mocker.patch("requests.get", return_value=self._response(status_code=304))
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+        mock_get.assert_called_once_with("url", timeout=30, headers={"If-None-Match": '"v1"'})
+
+        # The revalidated index is fresh again.
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+        assert mock_get.call_count == 1
+
+    def test_given_fresh_cached_index_when_get_components_with_refresh_then_fetch_index(self):
+        self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+        updated_components = {"HelloWorld-python": "new-url"}
+        mock_get = self.mocker.patch("requests.get", return_value=self._response(components=updated_components))
+
+        assert SoftwareCatalog("url", refresh=True, cache_dir=self.cache_dir).get_components() == updated_components
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == updated_components
+        mock_get.assert_called_once_with("url", timeout=30)
+
+    def test_given_stale_cached_index_and_no_network_when_get_components_then_use_cached_index(self):
+        self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+        self.mock_time.return_value = 1000.0 + consts.CATALOG_CACHE_TTL_SECONDS
+        self.mocker.patch("requests.get", side_effect=requests.exceptions.ConnectionError("No network"))
+
+        assert SoftwareCatalog("url", refresh=True, cache_dir=self.cache_dir).get_components() == self.components
+
+    def test_given_no_cached_index_and_no_network_when_get_components_then_raise_exception(self):
+        self.mocker.patch("requests.get", side_effect=requests.exceptions.ConnectionError("No network"))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+
+    def test_given_error_response_when_get_components_then_raise_exception(self):
+        mock_response = self.mocker.Mock(status_code=500, raise_for_status=self.mocker.Mock(side_effect=HTTPError("error")))
+        self.mocker.patch("requests.get", return_value=mock_response)
+        with pytest.raises(HTTPError):
+            SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+        assert not self.cache_dir.exists()
+
+    def test_given_corrupt_cached_index_when_get_components_then_fetch_index(self):
+        self.cache_dir.mkdir()
+        SoftwareCatalog("url", cache_dir=self.cache_dir)._index_file().write_text("{not json")
+        mock_get = self.mocker.patch("requests.get", return_value=self._response())
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+        mock_get.assert_called_once_with("url", timeout=30)
+
+    def test_given_cached_index_when_saving_index_fails_then_keep_cached_index(self):
+        self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+
+        def _dump(obj, f):
+            f.write('{"url": "url", "components": {')
+            raise OSError("No space left on device")
+
+        self.mocker.patch("requests.get", return_value=self._response(components={"HelloWorld-python": "new-url"}))
+        mock_dump = self.mocker.patch("json.dump", side_effect=_dump)
+        with pytest.raises(OSError):
+            SoftwareCatalog("url", refresh=True, cache_dir=self.cache_dir).get_components()
+        self.mocker.stop(mock_dump)
+        mock_get = self.mocker.patch("requests.get")
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).get_components() == self.components
+        assert not mock_get.called
+
+    def test_given_cached_index_when_search_then_return_matching_components_without_fetching(self):
+        mock_get = self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).search("PYTHON") == {"HelloWorld-python": "python-url"}
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).search("rust") == {}
+        assert mock_get.call_count == 1
+
+    def test_given_component_not_in_cached_index_when_find_then_refresh_index(self):
+        self.mocker.patch("requests.get", return_value=self._response())
+        SoftwareCatalog("url", cache_dir=self.cache_dir).get_components()
+        updated_components = {"HelloWorld-rust": "rust-url", **self.components}
+        mock_get = self.mocker.patch("requests.get", return_value=self._response(components=updated_components))
+
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).find("HelloWorld-python") == "python-url"
+        assert not mock_get.called
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).find("HelloWorld-rust") == "rust-url"
+        mock_get.assert_called_once_with("url", timeout=30)
+
+    def test_given_component_not_in_fetched_index_when_find_then_return_none(self):
+        mock_get = self.mocker.patch("requests.get", return_value=self._response())
+        assert SoftwareCatalog("url", cache_dir=self.cache_dir).find("HelloWorld-rust") is None
+        assert mock_get.call_count == 1
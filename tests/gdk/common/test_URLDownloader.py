@@ -1,70 +1,395 @@
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import mock_open, patch, call, Mock
+from unittest.mock import call
+import zipfile
+import io
 import pytest
 from gdk.common.URLDownloader import URLDownloader
+from gdk.common.DownloadCache import DownloadCache
+from gdk.common.consts import DOWNLOAD_CHUNK_SIZE_BYTES
 from urllib3.exceptions import HTTPError
+import hashlib
+import requests
 
 
 class URLDownloaderTest(TestCase):
     @pytest.fixture(autouse=True)
-    def __inject_fixtures(self, mocker):
+    def __inject_fixtures(self, mocker, tmpdir):
         self.mocker = mocker
+        self.tmpdir = Path(tmpdir)
+
+    def _mock_response(self, chunks, status_code=200, headers=None):
+        return self.mocker.Mock(
+            status_code=status_code, headers=headers or {}, iter_content=self.mocker.Mock(return_value=chunks)
+        )
+
+    def _zip_bytes(self, files):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zfile:
+            for name, content in files.items():
+                zfile.writestr(name, content)
+        return buffer.getvalue()
 
     def test_given_URLDownloader_with_dest_when_download_url_then_download_file_to_dest(self):
-        mock_response = self.mocker.Mock(status_code=200, content="some-content".encode())
+        mock_response = self._mock_response([b"some-", b"", b"content"])
         mock_request = self.mocker.patch("requests.get", return_value=mock_response)
-        with patch("builtins.open", mock_open()) as mock_file:
-            URLDownloader("some-url").download(Path("some-path"))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download(destination)
+
         mock_request.assert_called_once_with("some-url", stream=True, timeout=30)
-        assert mock_file.call_args_list == [call(Path("some-path"), "wb")]
-        assert mock_file.return_value.write.call_args_list == [call(b"some-content")]
+        mock_response.iter_content.assert_called_once_with(chunk_size=DOWNLOAD_CHUNK_SIZE_BYTES)
+        assert mock_response.close.called
+        assert destination.read_bytes() == b"some-content"
+        assert not self.tmpdir.joinpath("some-path.part").exists()
 
     def test_given_URLDownloader_with_dest_when_exception_during_download_then_raise_exception(self):
         mock_response = self.mocker.Mock(
             status_code=404, raise_for_status=self.mocker.Mock(side_effect=HTTPError("Not found"))
         )
         mock_request = self.mocker.patch("requests.get", return_value=mock_response)
+        destination = self.tmpdir.joinpath("some-path")
         with pytest.raises(Exception) as e:
-            with patch("builtins.open", mock_open()) as mock_file:
-                URLDownloader("some-url").download(Path("some-path"))
+            URLDownloader("some-url").download(destination)
         assert "Not found" in e.value.args[0]
         mock_request.assert_called_once_with("some-url", stream=True, timeout=30)
-        assert not mock_file.called
+        assert list(self.tmpdir.iterdir()) == []
+
+    def test_given_connection_drops_mid_stream_when_download_then_dest_is_not_created(self):
+        def interrupted_stream(chunk_size):
+            yield b"partial"
+            raise ConnectionError("Connection reset")
 
-    @patch("zipfile.ZipFile")
-    def test_given_dest_exists_when_download_and_extract_then_dowload_and_extract_file(self, mock_zip):
-        mock_response = self.mocker.Mock(status_code=200, content="some.zip".encode())
+        mock_response = self.mocker.Mock(status_code=200, headers={}, iter_content=interrupted_stream)
+        self.mocker.patch("requests.get", return_value=mock_response)
+        destination = self.tmpdir.joinpath("some-path")
+        destination.write_bytes(b"old-content")
+
+        with pytest.raises(ConnectionError):
+            URLDownloader("some-url").download(destination)
+
+        assert destination.read_bytes() == b"old-content"
+        assert self.tmpdir.joinpath("some-path.part").read_bytes() == b"partial"
+        assert mock_response.close.called
+
+    def test_given_partial_file_when_download_then_resume_from_the_end_of_partial_file(self):
+        mock_response = self._mock_response([b"-content"], 206, {"Content-Range": "bytes 4-11/12"})
         mock_request = self.mocker.patch("requests.get", return_value=mock_response)
-        self.mocker.patch("pathlib.Path.exists", return_value=True)
-        self.mocker.patch("pathlib.Path.iterdir", return_value=[Path("dummy-folder1")])
+        self.tmpdir.joinpath("some-path.part").write_bytes(b"some")
+        self.tmpdir.joinpath("some-path.part.validator").write_text('"etag"')
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download(destination)
+
+        mock_request.assert_called_once_with(
+            "some-url", stream=True, timeout=30, headers={"Range": "bytes=4-", "If-Range": '"etag"'}
+        )
+        assert destination.read_bytes() == b"some-content"
+        assert [f.name for f in self.tmpdir.iterdir()] == ["some-path"]
+
+    def test_given_interrupted_download_when_download_again_then_resume_with_validator_of_first_response(self):
+        def interrupted_stream(chunk_size):
+            yield b"some"
+            raise ConnectionError("Connection reset")
+
+        first_response = self.mocker.Mock(
+            status_code=200, headers={"ETag": '"etag"', "Content-Length": "12"}, iter_content=interrupted_stream
+        )
+        second_response = self._mock_response([b"-content"], 206, {"Content-Range": "bytes 4-11/12"})
+        mock_request = self.mocker.patch("requests.get", side_effect=[first_response, second_response])
+        destination = self.tmpdir.joinpath("some-path")
+
+        with pytest.raises(ConnectionError):
+            URLDownloader("some-url").download(destination)
+        URLDownloader("some-url").download(destination)
+
+        assert mock_request.call_args_list[1] == call(
+            "some-url", stream=True, timeout=30, headers={"Range": "bytes=4-", "If-Range": '"etag"'}
+        )
+        assert destination.read_bytes() == b"some-content"
+
+    def test_given_partial_file_without_validator_when_download_then_download_whole_file(self):
+        mock_request = self.mocker.patch("requests.get", return_value=self._mock_response([b"some-content"]))
+        self.tmpdir.joinpath("some-path.part").write_bytes(b"some")
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download(destination)
+
+        mock_request.assert_called_once_with("some-url", stream=True, timeout=30)
+        assert destination.read_bytes() == b"some-content"
+
+    def test_given_partial_file_and_remote_file_changed_when_download_then_download_whole_file(self):
+        mock_response = self._mock_response([b"some-content"], 200, {"Content-Length": "12", "ETag": '"new-etag"'})
+        self.mocker.patch("requests.get", return_value=mock_response)
+        self.tmpdir.joinpath("some-path.part").write_bytes(b"stale")
+        self.tmpdir.joinpath("some-path.part.validator").write_text('"old-etag"')
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download(destination)
+
+        assert destination.read_bytes() == b"some-content"
+        assert [f.name for f in self.tmpdir.iterdir()] == ["some-path"]
+
+    def test_given_partial_file_and_range_not_satisfiable_when_download_then_download_whole_file(self):
+        not_satisfiable = requests.Response()
+        not_satisfiable.status_code = 416
+        mock_request = self.mocker.patch(
+            "requests.get", side_effect=[not_satisfiable, self._mock_response([b"some-content"])]
+        )
+        self.tmpdir.joinpath("some-path.part").write_bytes(b"some-content-that-is-too-long")
+        self.tmpdir.joinpath("some-path.part.validator").write_text("Wed, 21 Oct 2015 07:28:00 GMT")
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download(destination)
+
+        assert mock_request.call_args_list == [
+            call(
+                "some-url",
+                stream=True,
+                timeout=30,
+                headers={"Range": "bytes=29-", "If-Range": "Wed, 21 Oct 2015 07:28:00 GMT"},
+            ),
+            call("some-url", stream=True, timeout=30),
+        ]
+        assert destination.read_bytes() == b"some-content"
+
+    def test_given_fewer_bytes_than_content_length_when_download_then_raise_exception_and_keep_partial_file(self):
+        self.mocker.patch("requests.get", return_value=self._mock_response([b"some"], 200, {"Content-Length": "12"}))
+        destination = self.tmpdir.joinpath("some-path")
+
+        with pytest.raises(Exception) as e:
+            URLDownloader("some-url").download(destination)
+
+        assert "Expected 12 bytes but received 4 bytes" in e.value.args[0]
+        assert not destination.exists()
+        assert self.tmpdir.joinpath("some-path.part").read_bytes() == b"some"
+
+    def test_given_checksum_when_download_then_verify_checksum(self):
+        self.mocker.patch("requests.get", return_value=self._mock_response([b"some-content"]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url", sha256=hashlib.sha256(b"some-content").hexdigest().upper()).download(destination)
+
+        assert destination.read_bytes() == b"some-content"
+
+    def test_given_checksum_mismatch_when_download_then_raise_exception_and_remove_partial_file(self):
+        self.mocker.patch("requests.get", return_value=self._mock_response([b"some-content"]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        with pytest.raises(Exception) as e:
+            URLDownloader("some-url", sha256=hashlib.sha256(b"other").hexdigest()).download(destination)
+
+        assert "does not match the expected checksum" in e.value.args[0]
+        assert list(self.tmpdir.iterdir()) == []
+
+    def test_given_parallel_ranges_and_server_accepts_ranges_when_download_then_download_ranges(self):
+        self.mocker.patch("gdk.common.URLDownloader.DOWNLOAD_MIN_RANGE_SIZE_BYTES", 2)
+        content = b"some-content"
+        head_response = self.mocker.Mock(headers={"Accept-Ranges": "bytes", "Content-Length": str(len(content))})
+        mock_head = self.mocker.patch("requests.head", return_value=head_response)
+
+        def ranged_get(url, stream, timeout, headers):
+            first_byte, last_byte = (int(b) for b in headers["Range"][len("bytes="):].split("-"))
+            return self._mock_response([content[first_byte:last_byte + 1]], 206)
+
+        mock_request = self.mocker.patch("requests.get", side_effect=ranged_get)
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url", parallel_ranges=3).download(destination)
+
+        mock_head.assert_called_once_with("some-url", allow_redirects=True, timeout=30)
+        assert sorted(c.kwargs["headers"]["Range"] for c in mock_request.call_args_list) == [
+            "bytes=0-3",
+            "bytes=4-7",
+            "bytes=8-11",
+        ]
+        assert destination.read_bytes() == content
+        assert [f.name for f in self.tmpdir.iterdir()] == ["some-path"]
+
+    def test_given_segments_of_changed_remote_file_when_download_ranges_then_discard_segments(self):
+        self.mocker.patch("gdk.common.URLDownloader.DOWNLOAD_MIN_RANGE_SIZE_BYTES", 2)
+        content = b"some-content"
+        head_headers = {"Accept-Ranges": "bytes", "Content-Length": str(len(content)), "ETag": '"new-etag"'}
+        self.mocker.patch("requests.head", return_value=self.mocker.Mock(headers=head_headers))
+
+        def ranged_get(url, stream, timeout, headers):
+            assert headers["If-Range"] == '"new-etag"'
+            first_byte, last_byte = (int(b) for b in headers["Range"][len("bytes="):].split("-"))
+            return self._mock_response([content[first_byte:last_byte + 1]], 206)
 
-        mock_za = Mock()
-        mock_za.return_value.namelist.return_value = ["one"]
-        mock_za.return_value.extractall.return_value = None
-        mock_zip.return_value.__enter__ = mock_za
+        mock_request = self.mocker.patch("requests.get", side_effect=ranged_get)
+        self.tmpdir.joinpath("some-path.part0").write_bytes(b"old-")
+        self.tmpdir.joinpath("some-path.part1").write_bytes(b"co")
+        self.tmpdir.joinpath("some-path.part.validator").write_text('"old-etag"')
+        destination = self.tmpdir.joinpath("some-path")
 
-        mock_move = self.mocker.patch("shutil.move", return_value=None)
-        URLDownloader("some-url").download_and_extract(Path("some-path"))
+        URLDownloader("some-url", parallel_ranges=3).download(destination)
+
+        assert sorted(c.kwargs["headers"]["Range"] for c in mock_request.call_args_list) == [
+            "bytes=0-3",
+            "bytes=4-7",
+            "bytes=8-11",
+        ]
+        assert destination.read_bytes() == content
+        assert [f.name for f in self.tmpdir.iterdir()] == ["some-path"]
+
+    def test_given_remote_file_changes_during_ranged_download_when_download_then_raise_exception_and_discard_segment(self):
+        self.mocker.patch("gdk.common.URLDownloader.DOWNLOAD_MIN_RANGE_SIZE_BYTES", 2)
+        head_headers = {"Accept-Ranges": "bytes", "Content-Length": "12", "ETag": '"etag"'}
+        self.mocker.patch("requests.head", return_value=self.mocker.Mock(headers=head_headers))
+        self.mocker.patch("requests.get", return_value=self._mock_response([b"other-content"], 200))
+        self.tmpdir.joinpath("some-path.part0").write_bytes(b"so")
+        self.tmpdir.joinpath("some-path.part.validator").write_text('"etag"')
+        destination = self.tmpdir.joinpath("some-path")
+
+        with pytest.raises(Exception) as e:
+            URLDownloader("some-url", parallel_ranges=3).download(destination)
+
+        assert "did not return the requested range" in e.value.args[0]
+        assert not self.tmpdir.joinpath("some-path.part0").exists()
+        assert not destination.exists()
+
+    def test_given_parallel_ranges_and_server_does_not_accept_ranges_when_download_then_download_in_one_request(self):
+        self.mocker.patch("requests.head", return_value=self.mocker.Mock(headers={"Content-Length": "12"}))
+        mock_request = self.mocker.patch("requests.get", return_value=self._mock_response([b"some-content"]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url", parallel_ranges=3).download(destination)
+
+        mock_request.assert_called_once_with("some-url", stream=True, timeout=30)
+        assert destination.read_bytes() == b"some-content"
+
+    def test_given_dest_exists_when_download_and_extract_then_dowload_and_extract_file(self):
+        content = self._zip_bytes({"one/": "", "one/file.txt": "text", "one/dir/nested.txt": "nested"})
+        mock_request = self.mocker.patch("requests.get", return_value=self._mock_response([content[:10], content[10:]]))
+        destination = self.tmpdir.joinpath("some-path")
+        destination.mkdir()
+
+        URLDownloader("some-url").download_and_extract(destination)
 
         assert mock_request.call_args_list == [call("some-url", stream=True, timeout=30)]
-        assert mock_move.call_args_list == [call("dummy-folder1", Path("some-path"))]
+        assert destination.joinpath("file.txt").read_text() == "text"
+        assert destination.joinpath("dir", "nested.txt").read_text() == "nested"
+
+    def test_given_dest_not_exists_when_download_and_extract_then_create_dest_and_dowload_and_extract_file(self):
+        content = self._zip_bytes({"one/": "", "one/file.txt": "text"})
+        mock_request = self.mocker.patch("requests.get", return_value=self._mock_response([content]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download_and_extract(destination)
 
-    @patch("zipfile.ZipFile")
-    def test_given_dest_not_exists_when_download_and_extract_then_create_dest_and_dowload_and_extract_file(self, mock_zip):
-        mock_response = self.mocker.Mock(status_code=200, content="some.zip".encode())
-        mock_request = self.mocker.patch("requests.get", return_value=mock_response)
-        self.mocker.patch("pathlib.Path.exists", return_value=False)
-        self.mocker.patch("pathlib.Path.iterdir", return_value=["dummy-folder1"])
-        mock_create_dir = self.mocker.patch("pathlib.Path.mkdir", return_value=None)
-        mock_za = Mock()
-        mock_za.return_value.namelist.return_value = ["one"]
-        mock_za.return_value.extractall.return_value = None
-        mock_zip.return_value.__enter__ = mock_za
-
-        mock_move = self.mocker.patch("shutil.move", return_value=None)
-        URLDownloader("some-url").download_and_extract(Path("some-path"))
-
-        assert mock_create_dir.call_count == 1
         assert mock_request.call_args_list == [call("some-url", stream=True, timeout=30)]
-        assert mock_move.call_args_list == [call("dummy-folder1", Path("some-path"))]
+        assert [f.name for f in destination.iterdir()] == ["file.txt"]
+
+    def test_given_cache_without_entry_when_download_then_download_into_cache_and_link_to_dest(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        mock_response = self._mock_response([b"some-content"], 200, {"ETag": '"etag"', "Content-Length": "12"})
+        mock_request = self.mocker.patch("requests.get", return_value=mock_response)
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", cache=cache).download(destination)
+
+        mock_request.assert_called_once_with("https://host/some.zip", stream=True, timeout=30)
+        assert destination.read_bytes() == b"some-content"
+        assert destination.samefile(cache.get_entry_path("https://host/some.zip"))
+        assert cache.get_conditional_headers("https://host/some.zip") == {"If-None-Match": '"etag"'}
+
+    def test_given_cache_entry_not_modified_when_download_then_link_cached_file_to_dest(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        cache.get_entry_path("https://host/some.zip").write_bytes(b"cached-content")
+        cache.save_validators("https://host/some.zip", {"ETag": '"etag"'})
+        mock_response = self._mock_response([], 304)
+        mock_request = self.mocker.patch("requests.get", return_value=mock_response)
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", cache=cache).download(destination)
+
+        mock_request.assert_called_once_with(
+            "https://host/some.zip", stream=True, timeout=30, headers={"If-None-Match": '"etag"'}
+        )
+        assert mock_response.close.called
+        assert destination.read_bytes() == b"cached-content"
+
+    def test_given_cache_entry_modified_when_download_then_download_into_cache_again(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        cache.get_entry_path("https://host/some.zip").write_bytes(b"cached-content")
+        cache.save_validators("https://host/some.zip", {"ETag": '"old-etag"'})
+        mock_request = self.mocker.patch(
+            "requests.get", return_value=self._mock_response([b"new-content"], 200, {"ETag": '"new-etag"'})
+        )
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", parallel_ranges=3, cache=cache).download(destination)
+
+        mock_request.assert_called_once_with(
+            "https://host/some.zip", stream=True, timeout=30, headers={"If-None-Match": '"old-etag"'}
+        )
+        assert destination.read_bytes() == b"new-content"
+        assert cache.get_conditional_headers("https://host/some.zip") == {"If-None-Match": '"new-etag"'}
+
+    def test_given_cache_entry_and_no_network_when_download_then_use_cached_file(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        cache.get_entry_path("https://host/some.zip").write_bytes(b"cached-content")
+        cache.save_validators("https://host/some.zip", {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        self.mocker.patch("requests.get", side_effect=requests.exceptions.ConnectionError("No network"))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", cache=cache).download(destination)
+
+        assert destination.read_bytes() == b"cached-content"
+
+    def test_given_cache_entry_and_server_error_when_download_then_use_cached_file(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        cache.get_entry_path("https://host/some.zip").write_bytes(b"cached-content")
+        cache.save_validators("https://host/some.zip", {"ETag": '"etag"'})
+        mock_response = self._mock_response([b"error"], 503)
+        mock_request = self.mocker.patch("requests.get", return_value=mock_response)
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", cache=cache).download(destination)
+
+        assert mock_request.call_count == 1
+        assert mock_response.close.called
+        assert destination.read_bytes() == b"cached-content"
+
+    def test_given_cache_when_download_and_extract_then_extract_from_cached_file(self):
+        cache = DownloadCache(self.tmpdir.joinpath("cache"))
+        content = self._zip_bytes({"one/": "", "one/file.txt": "text"})
+        self.mocker.patch("requests.get", return_value=self._mock_response([content]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("https://host/some.zip", cache=cache).download_and_extract(destination)
+
+        assert destination.joinpath("file.txt").read_text() == "text"
+        assert cache.get_entry_path("https://host/some.zip").read_bytes() == content
+
+    def test_given_filters_when_download_and_extract_then_extract_only_selected_entries(self):
+        content = self._zip_bytes(
+            {
+                "one/": "",
+                "one/pom.xml": "maven",
+                "one/build.gradle": "gradle",
+                "one/src/": "",
+                "one/src/Main.java": "java",
+                "one/src/README.md": "docs",
+                "other/file.txt": "outside",
+            }
+        )
+        self.mocker.patch("requests.get", return_value=self._mock_response([content]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        URLDownloader("some-url").download_and_extract(destination, include=["src*", "*.xml"], exclude=["*.md"])
+
+        extracted = sorted(str(f.relative_to(destination).as_posix()) for f in destination.rglob("*"))
+        assert extracted == ["pom.xml", "src", "src/Main.java"]
+
+    def test_given_entry_outside_top_level_folder_when_download_and_extract_then_raise_exception(self):
+        content = self._zip_bytes({"one/": "", "one/../../escaped.txt": "text"})
+        self.mocker.patch("requests.get", return_value=self._mock_response([content]))
+        destination = self.tmpdir.joinpath("some-path")
+
+        with pytest.raises(Exception) as e:
+            URLDownloader("some-url").download_and_extract(destination)
+
+        assert "contains an entry outside its folder: one/../../escaped.txt" in e.value.args[0]
+        assert not self.tmpdir.parent.joinpath("escaped.txt").exists()
@@ -1,5 +1,8 @@
+import re
+
 import pytest
-from gdk.common.diff_utils import deep_diff
+from gdk.common.diff_utils import DiffEngine, PathMatcher, deep_diff, has_changes
+
 
 def test_simple_dict_comparison():
     old = {"a": 1, "b": 2}
@@ -10,6 +13,7 @@ def test_simple_dict_comparison():
     assert result["dictionary_item_removed"] == ["root['a']"]
     assert result["values_changed"]["root['b']"] == {"old_value": 2, "new_value": 3}
 
+
 def test_nested_dict_comparison():
     old = {"a": {"x": 1, "y": 2}, "b": 3}
     new = {"a": {"x": 1, "y": 5}, "b": 3}
@@ -19,6 +23,7 @@ def test_nested_dict_comparison():
     assert not result["dictionary_item_removed"]
     assert result["values_changed"]["root['a']['y']"] == {"old_value": 2, "new_value": 5}
 
+
 def test_list_comparison():
     old = [1, 2, 3]
     new = [1, 4, 3, 5]
@@ -27,6 +32,7 @@ def test_list_comparison():
     assert result["dictionary_item_added"] == ["root['3']"]
     assert result["values_changed"]["root['1']"] == {"old_value": 2, "new_value": 4}
 
+
 def test_list_of_dicts_comparison():
     old = [{"name": "John", "age": 30}, {"name": "Jane", "data": {"x": 1}}]
     new = [{"name": "John", "age": 31}, {"name": "Jane", "data": {"x": 2}}]
@@ -37,6 +43,7 @@ def test_list_of_dicts_comparison():
     assert result["values_changed"]["root['0']['age']"] == {"old_value": 30, "new_value": 31}
     assert result["values_changed"]["root['1']['data']['x']"] == {"old_value": 1, "new_value": 2}
 
+
 def test_empty_diff():
     old = {"a": 1, "b": [1, 2, {"x": 3}]}
     new = {"a": 1, "b": [1, 2, {"x": 3}]}
@@ -46,6 +53,7 @@ def test_empty_diff():
     assert not result["dictionary_item_removed"]
     assert not result["values_changed"]
 
+
 def test_completely_different_structures():
     old = {"a": [1, 2, 3]}
     new = {"b": {"x": 1}}
@@ -54,6 +62,7 @@ def test_completely_different_structures():
     assert result["dictionary_item_added"] == ["root['b']"]
     assert result["dictionary_item_removed"] == ["root['a']"]
 
+
 def test_exclude_paths():
     old = {"a": {"x": 1, "y": 2}, "b": {"z": 3}}
     new = {"a": {"x": 2, "y": 2}, "b": {"z": 4}}
@@ -63,6 +72,7 @@ def test_exclude_paths():
     assert not result["dictionary_item_removed"]
     assert list(result["values_changed"].keys()) == ["root['b']['z']"]
 
+
 def test_exclude_regex_paths():
     old = {"a": [{"x": 1}, {"x": 2}], "b": {"z": 3}}
     new = {"a": [{"x": 2}, {"x": 3}], "b": {"z": 4}}
@@ -72,6 +82,7 @@ def test_exclude_regex_paths():
     assert not result["dictionary_item_removed"]
     assert list(result["values_changed"].keys()) == ["root['b']['z']"]
 
+
 def test_recipe_like_structure_all_excluded():
     old = {
         "ComponentVersion": "1.0.0",
@@ -99,6 +110,7 @@ def test_recipe_like_structure_all_excluded():
     assert not result["dictionary_item_removed"]
     assert not result["values_changed"]
 
+
 def test_recipe_like_structure():
     old = {
         "ComponentVersion": "1.0.0",
@@ -124,6 +136,7 @@ def test_recipe_like_structure():
     assert result["values_changed"]["root['Manifests']['0']['Artifacts']['0']['Digest']"] == {"old_value": 'abc', "new_value": 'def'}
     assert result["values_changed"]["root['Manifests']['1']['Artifacts']['0']['URI']"] == {"old_value": 's3://bucket/v1/other.zip', "new_value": 's3://bucket/v2/other.zip'}
 
+
 def test_recipe_like_structure_artifacts_no_change():
     old = {
         'RecipeFormatVersion': '2020-01-25', 
@@ -183,6 +196,7 @@ def test_recipe_like_structure_artifacts_no_change():
     assert not result["dictionary_item_removed"]
     assert not result["values_changed"]
 
+
 def test_recipe_like_structure_artifacts_with_change():
     old = {
         'RecipeFormatVersion': '2020-01-25', 
@@ -259,4 +273,56 @@ def test_recipe_like_structure_artifacts_with_change():
     assert not result["dictionary_item_added"]
     assert not result["values_changed"]
     assert not result["dictionary_item_removed"]
-    assert len(result["excluded_dictionary_item_removed"]) == 5
\ No newline at end of file
+    assert len(result["excluded_dictionary_item_removed"]) == 5
+
+
+def test_has_changes_agrees_with_deep_diff():
+    exclusions = {"exclude_paths": ["root['version']"], "exclude_regex_paths": [r"^root\['manifests'\]\[.+\]\['artifacts'\]"]}
+    old = {"version": "1.0.0", "manifests": [{"artifacts": [{"uri": "a"}], "platform": {"os": "linux"}}]}
+    unchanged = {"version": "1.0.1", "manifests": [{"artifacts": [{"uri": "b"}], "platform": {"os": "linux"}}]}
+    added = {"version": "1.0.0", "manifests": [{"artifacts": [], "platform": {"os": "linux", "arch": "amd64"}}]}
+    changed = {"version": "1.0.0", "manifests": [{"artifacts": [{"uri": "a"}], "platform": {"os": "windows"}}]}
+
+    assert not has_changes(old, unchanged, **exclusions)
+    assert not deep_diff(old, unchanged, **exclusions)["values_changed"]
+    assert has_changes(old, added, **exclusions)
+    assert deep_diff(old, added, **exclusions)["dictionary_item_added"] == ["root['manifests']['0']['platform']['arch']"]
+    assert has_changes(old, changed, **exclusions)
+    assert has_changes({"a": [1, 2]}, {"a": {"0": 1}})
+
+
+def test_has_changes_skips_identical_subtrees(mocker):
+    shared = {"x": [{"y": 1}, {"z": 2}]}
+    old = {"a": dict(shared), "b": 1}
+    new = {"a": dict(shared), "b": 2}
+    engine = DiffEngine()
+    spy_has_changes = mocker.spy(engine, "_has_changes")
+
+    assert engine.has_changes(old, new)
+    assert not [c for c in spy_has_changes.call_args_list if c.args[2].startswith("root['a'][")]
+
+
+def test_has_changes_stops_at_first_change(mocker):
+    old = {f"key{i}": {"value": i} for i in range(300)}
+    new = {f"key{i}": {"value": i + 1} for i in range(300)}
+    engine = DiffEngine()
+    spy_has_changes = mocker.spy(engine, "_has_changes")
+    spy_diff = mocker.spy(engine, "_diff")
+
+    assert engine.has_changes(old, new)
+    # The root, the first differing key and its differing value.
+    assert spy_has_changes.call_count == 3
+    assert len(engine.diff(old, new)["values_changed"]) == 300
+    assert spy_diff.call_count == 1 + 300 * 2
+
+
+def test_path_matcher_compiles_patterns_once(mocker):
+    spy_compile = mocker.spy(re, "compile")
+    matcher = PathMatcher(["root['a']"], [r"^root\['b'\]", r"^root\['c'\]\['d'\]"])
+
+    assert matcher.match("root['a']")
+    assert not matcher.match("root['a']['x']")
+    assert matcher.match("root['b']['x']")
+    assert matcher.match("root['c']['d']")
+    assert not matcher.match("root['c']")
+    assert spy_compile.call_count == 1
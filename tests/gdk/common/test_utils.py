@@ -1,6 +1,7 @@
 import logging
 from pathlib import Path
 
+import jsonschema
 import pytest
 from urllib3.exceptions import HTTPError
 
@@ -197,3 +198,81 @@ def test_invalid_recipe_size(mocker):
     is_valid_size, file_size = utils.is_recipe_size_valid('large_recipe.yaml')
     assert not is_valid_size
     assert file_size == 17000
+
+
+def test_recipe_data_size():
+    assert utils.is_recipe_data_size_valid(b"x" * 16000) == (True, 16000)
+    assert utils.is_recipe_data_size_valid(b"x" * 16001) == (False, 16001)
+
+
+def test_copy_artifact_with_hash(tmp_path):
+    source = tmp_path.joinpath("source")
+    source.mkdir()
+    artifact = source.joinpath("artifact.bin")
+    artifact.write_bytes(b"artifact content" * 100000)
+    artifact.chmod(0o755)
+    target = tmp_path.joinpath("target")
+    target.mkdir()
+
+    digest = utils.copy_artifact_with_hash(artifact, target)
+
+    copied = target.joinpath("artifact.bin")
+    assert copied.read_bytes() == artifact.read_bytes()
+    assert copied.stat().st_mode == artifact.stat().st_mode
+    assert digest == utils.artifact_encoded_hash(artifact)
+
+
+def test_hash_artifacts_concurrently(mocker, tmp_path):
+    mocker.patch("os.cpu_count", return_value=4)
+    spy_executor = mocker.spy(utils, "ThreadPoolExecutor")
+    artifacts = []
+    for index in range(6):
+        artifact = tmp_path.joinpath(f"artifact-{index}.bin")
+        artifact.write_bytes(bytes([index]) * (index * 1024 * 1024 + 1))
+        artifacts.append(artifact)
+
+    digests = utils.hash_artifacts(artifacts + artifacts[:2])
+
+    assert digests == {artifact: utils.artifact_encoded_hash(artifact) for artifact in artifacts}
+    assert spy_executor.call_args.kwargs == {"max_workers": 4}
+
+
+def test_hash_artifacts_with_single_artifact_THEN_hash_without_threads(mocker, tmp_path):
+    spy_executor = mocker.spy(utils, "ThreadPoolExecutor")
+    artifact = tmp_path.joinpath("artifact.bin")
+    artifact.write_bytes(b"")
+
+    assert utils.hash_artifacts([artifact]) == {artifact: "47DEQpj8HBSa+/TImW+5JCeuQeRkm5NMpJWZG3hSuFU="}
+    assert utils.hash_artifacts([]) == {}
+    assert not spy_executor.called
+
+
+def test_compile_glob():
+    assert utils.compile_glob("**/*.gz").match("a/b/c.tar.gz")
+    assert utils.compile_glob("**/*.gz").match("c.gz")
+    assert not utils.compile_glob("*.gz").match("a/c.gz")
+    assert utils.compile_glob("models/**").match("models/a/b.bin")
+    assert not utils.compile_glob("model?.bin").match("model/.bin")
+    assert not utils.compile_glob("*.onnx").match("model.onnx.txt")
+
+
+def test_get_schema_validator_is_cached_until_schema_changes(tmp_path):
+    schema_file = tmp_path.joinpath("schema.json")
+    schema_file.write_text('{"type": "object", "required": ["name"]}')
+
+    validator = utils.get_schema_validator(schema_file)
+    assert utils.get_schema_validator(schema_file) is validator
+
+    schema_file.write_text('{"type": "object", "required": ["name", "version"]}')
+    assert utils.get_schema_validator(schema_file) is not validator
+    with pytest.raises(jsonschema.exceptions.ValidationError) as e:
+        utils.validate_with_schema({"name": "a"}, schema_file)
+    assert "'version' is a required property" in e.value.message
+
+
+def test_get_schema_validator_invalid_schema(tmp_path):
+    schema_file = tmp_path.joinpath("schema.json")
+    schema_file.write_text('{"type": 12}')
+
+    with pytest.raises(jsonschema.exceptions.SchemaError):
+        utils.get_schema_validator(schema_file)
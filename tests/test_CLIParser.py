@@ -106,3 +106,13 @@ def test_main_exception(mocker):
     mock_cli_parser.assert_any_call()
     mock_run_command.assert_any_call(args_namespace)
     assert mock_validate_cli_version.called
+
+
+def test_main_without_version_check(mocker):
+    args_namespace = argparse.Namespace(component="build", build=None, **{"gdk": "component"})
+    mocker.patch("gdk.CLIParser.cli_parser.parse_args", return_value=args_namespace)
+    mock_run_command = mocker.patch("gdk.common.parse_args_actions.run_command", return_value=None)
+    mock_validate_cli_version = mocker.patch("gdk.common.utils.cli_version_check", return_value=None)
+    cli_parser.main(check_version=False)
+    mock_run_command.assert_any_call(args_namespace)
+    assert not mock_validate_cli_version.called